@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Local catalog snapshot for the Movie & TV MCP Server
+SQLite store of title details and resumable ingest jobs, shared by the server and ingest.py
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+class CatalogStore:
+    """
+    SQLite snapshot of TMDb title details, filled by ingest.py.
+
+    Each title is stored once per kind as normalized columns (text, numbers,
+    genres and credits in their own tables, for local filtering) plus the
+    compressed raw details response used to answer details tools. Ingest
+    jobs keep their ID queue in the same database, so an interrupted run
+    resumes from the IDs that are still pending.
+
+    The server calls it from worker threads, so the connection is shared
+    across threads and opened under a lock.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS titles (
+            kind TEXT NOT NULL, id INTEGER NOT NULL, title TEXT, original_title TEXT,
+            overview TEXT, release_date TEXT, original_language TEXT,
+            popularity REAL, vote_average REAL, vote_count INTEGER, runtime INTEGER,
+            poster_path TEXT, data BLOB NOT NULL, fetched_at REAL NOT NULL,
+            stale INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (kind, id)
+        );
+        CREATE TABLE IF NOT EXISTS title_genres (
+            kind TEXT NOT NULL, title_id INTEGER NOT NULL, genre_id INTEGER NOT NULL,
+            PRIMARY KEY (kind, title_id, genre_id)
+        );
+        CREATE TABLE IF NOT EXISTS credits (
+            kind TEXT NOT NULL, title_id INTEGER NOT NULL, person_id INTEGER NOT NULL,
+            name TEXT, role TEXT NOT NULL, character TEXT, job TEXT, department TEXT, ordering INTEGER
+        );
+        CREATE INDEX IF NOT EXISTS credits_by_title ON credits (kind, title_id);
+        CREATE INDEX IF NOT EXISTS credits_by_person ON credits (person_id);
+        CREATE INDEX IF NOT EXISTS titles_by_fetched ON titles (fetched_at);
+        CREATE TABLE IF NOT EXISTS ingest_jobs (
+            job_id TEXT PRIMARY KEY, kind TEXT NOT NULL, source TEXT NOT NULL,
+            next_page INTEGER NOT NULL DEFAULT 1, sweep_done INTEGER NOT NULL DEFAULT 0,
+            created_at REAL NOT NULL, updated_at REAL NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS ingest_queue (
+            job_id TEXT NOT NULL, id INTEGER NOT NULL, status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0, error TEXT,
+            PRIMARY KEY (job_id, id)
+        );
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @property
+    def db(self) -> sqlite3.Connection:
+        with self._lock:
+            if self._db is None:
+                directory = os.path.dirname(os.path.abspath(self.path))
+                os.makedirs(directory, exist_ok=True)
+                db = sqlite3.connect(self.path, check_same_thread=False)
+                db.execute("PRAGMA journal_mode=WAL")
+                db.execute("PRAGMA synchronous=NORMAL")
+                db.executescript(self.SCHEMA)
+                self._db = db
+            return self._db
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def upsert_title(self, kind: str, data: Dict, fetched_at: Optional[float] = None) -> None:
+        """Store or replace one details response, in a single transaction"""
+        title_id = data["id"]
+        record = {k: v for k, v in data.items() if k != "success"}
+        credits = data.get("credits") or {}
+        with self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO titles VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)",
+                (kind, title_id, data.get("title") or data.get("name"),
+                 data.get("original_title") or data.get("original_name"), data.get("overview"),
+                 data.get("release_date") or data.get("first_air_date"), data.get("original_language"),
+                 data.get("popularity"), data.get("vote_average"), data.get("vote_count"),
+                 data.get("runtime") or (data.get("episode_run_time") or [None])[0], data.get("poster_path"),
+                 zlib.compress(json.dumps(record, separators=(",", ":")).encode()),
+                 fetched_at or time.time()))
+            self.db.execute("DELETE FROM title_genres WHERE kind = ? AND title_id = ?", (kind, title_id))
+            self.db.executemany("INSERT OR IGNORE INTO title_genres VALUES (?, ?, ?)",
+                                [(kind, title_id, g["id"]) for g in data.get("genres", []) if g.get("id") is not None])
+            self.db.execute("DELETE FROM credits WHERE kind = ? AND title_id = ?", (kind, title_id))
+            self.db.executemany(
+                "INSERT INTO credits VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(kind, title_id, c.get("id"), c.get("name"), "cast", c.get("character"), None, None, c.get("order"))
+                 for c in credits.get("cast") or [] if c.get("id") is not None] +
+                [(kind, title_id, c.get("id"), c.get("name"), "crew", None, c.get("job"), c.get("department"), None)
+                 for c in credits.get("crew") or [] if c.get("id") is not None])
+
+    def get_title(self, kind: str, title_id: int) -> Optional[Dict]:
+        """Details response of a current (not stale) snapshot row, or None"""
+        row = self.db.execute("SELECT data, fetched_at FROM titles WHERE kind = ? AND id = ? AND stale = 0",
+                              (kind, title_id)).fetchone()
+        if row is None:
+            return None
+        data = json.loads(zlib.decompress(row[0]))
+        data["success"] = True
+        data["snapshot_fetched_at"] = datetime.fromtimestamp(row[1], timezone.utc).isoformat()
+        return data
+
+    def mark_stale(self, kind: str, ids) -> int:
+        """Flag changed titles (or titles crediting changed people) so they are fetched live again"""
+        ids = list(ids)
+        if not ids or not os.path.exists(self.path):
+            return 0
+        changed = 0
+        with self.db:
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                marks = ",".join("?" * len(chunk))
+                if kind == "person":
+                    cursor = self.db.execute(
+                        f"UPDATE titles SET stale = 1 WHERE stale = 0 AND (kind, id) IN "
+                        f"(SELECT kind, title_id FROM credits WHERE person_id IN ({marks}))", chunk)
+                else:
+                    cursor = self.db.execute(
+                        f"UPDATE titles SET stale = 1 WHERE stale = 0 AND kind = ? AND id IN ({marks})",
+                        [kind] + chunk)
+                changed += cursor.rowcount
+        return changed
+
+    def mark_stale_before(self, kind: str, cutoff: float) -> int:
+        """
+        Flag titles fetched before `cutoff` (epoch seconds), for when the change
+        list cannot reach back that far; for "person", every title with credits
+        """
+        if not os.path.exists(self.path):
+            return 0
+        with self.db:
+            if kind == "person":
+                cursor = self.db.execute(
+                    "UPDATE titles SET stale = 1 WHERE stale = 0 AND fetched_at < ? AND (kind, id) IN "
+                    "(SELECT DISTINCT kind, title_id FROM credits)", (cutoff,))
+            else:
+                cursor = self.db.execute(
+                    "UPDATE titles SET stale = 1 WHERE stale = 0 AND kind = ? AND fetched_at < ?", (kind, cutoff))
+        return cursor.rowcount
+
+    # Ingest jobs
+    def ensure_job(self, job_id: str, kind: str, source: Dict) -> Dict:
+        """Create a job, or return the existing one; its source must not change between runs"""
+        now = time.time()
+        with self.db:
+            self.db.execute("INSERT OR IGNORE INTO ingest_jobs VALUES (?, ?, ?, 1, 0, ?, ?)",
+                            (job_id, kind, json.dumps(source, sort_keys=True), now, now))
+        return self.job(job_id)
+
+    def job(self, job_id: str) -> Optional[Dict]:
+        row = self.db.execute("SELECT kind, source, next_page, sweep_done FROM ingest_jobs WHERE job_id = ?",
+                              (job_id,)).fetchone()
+        if row is None:
+            return None
+        counts = dict(self.db.execute("SELECT status, COUNT(*) FROM ingest_queue WHERE job_id = ? GROUP BY status",
+                                      (job_id,)).fetchall())
+        return {"job_id": job_id, "kind": row[0], "source": json.loads(row[1]), "next_page": row[2],
+                "sweep_done": bool(row[3]), "queue": counts}
+
+    def enqueue(self, job_id: str, ids, next_page: Optional[int] = None, sweep_done: bool = False) -> None:
+        """Add IDs to a job's queue, recording sweep progress in the same transaction"""
+        with self.db:
+            self.db.executemany("INSERT OR IGNORE INTO ingest_queue (job_id, id) VALUES (?, ?)",
+                                [(job_id, i) for i in ids])
+            if next_page is not None:
+                self.db.execute("UPDATE ingest_jobs SET next_page = ?, sweep_done = ?, updated_at = ? WHERE job_id = ?",
+                                (next_page, int(sweep_done), time.time(), job_id))
+
+    def pending(self, job_id: str, limit: int) -> List[int]:
+        rows = self.db.execute("SELECT id FROM ingest_queue WHERE job_id = ? AND status = 'pending' ORDER BY id LIMIT ?",
+                               (job_id, limit)).fetchall()
+        return [r[0] for r in rows]
+
+    def finish(self, job_id: str, title_id: int, status: str, error: Optional[str] = None) -> None:
+        with self.db:
+            self.db.execute("UPDATE ingest_queue SET status = ?, attempts = attempts + 1, error = ? "
+                            "WHERE job_id = ? AND id = ?", (status, error, job_id, title_id))
+
+    def retry(self, job_id: str, statuses: tuple = ("failed",)) -> int:
+        """Put failed IDs back in the queue"""
+        marks = ",".join("?" * len(statuses))
+        with self.db:
+            return self.db.execute(f"UPDATE ingest_queue SET status = 'pending' WHERE job_id = ? AND status IN ({marks})",
+                                   (job_id,) + tuple(statuses)).rowcount
+
+    def stale_ids(self, kind: str) -> List[int]:
+        return [r[0] for r in self.db.execute("SELECT id FROM titles WHERE kind = ? AND stale = 1", (kind,))]
+
+    def stats(self) -> Dict:
+        if not os.path.exists(self.path):
+            return {"path": os.path.abspath(self.path), "titles": {}}
+        rows = self.db.execute("SELECT kind, COUNT(*), SUM(stale) FROM titles GROUP BY kind").fetchall()
+        return {
+            "path": os.path.abspath(self.path),
+            "titles": {kind: {"total": total, "stale": stale or 0} for kind, total, stale in rows}
+        }
@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the TMDb API
+Serves deterministic synthetic data for load testing and offline development
+"""
+
+import argparse
+import asyncio
+import functools
+import hashlib
+import random
+import struct
+import threading
+import time
+import zlib
+from collections import Counter
+from datetime import datetime, timezone
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+MOVIE_GENRES = [
+    {"id": 28, "name": "Action"}, {"id": 12, "name": "Adventure"}, {"id": 16, "name": "Animation"},
+    {"id": 35, "name": "Comedy"}, {"id": 80, "name": "Crime"}, {"id": 18, "name": "Drama"},
+    {"id": 14, "name": "Fantasy"}, {"id": 27, "name": "Horror"}, {"id": 878, "name": "Science Fiction"},
+    {"id": 53, "name": "Thriller"}
+]
+TV_GENRES = [
+    {"id": 10759, "name": "Action & Adventure"}, {"id": 16, "name": "Animation"}, {"id": 35, "name": "Comedy"},
+    {"id": 80, "name": "Crime"}, {"id": 18, "name": "Drama"}, {"id": 10765, "name": "Sci-Fi & Fantasy"}
+]
+CREW_JOBS = ["Director", "Screenplay", "Writer", "Story", "Producer", "Executive Producer",
+             "Director of Photography", "Editor", "Original Music Composer", "Casting",
+             "Production Design", "Costume Design", "Grip", "Gaffer", "Sound Designer"]
+PROVIDERS = [
+    {"provider_id": 8, "provider_name": "Netflix", "display_priority": 1},
+    {"provider_id": 9, "provider_name": "Amazon Prime Video", "display_priority": 2},
+    {"provider_id": 337, "provider_name": "Disney Plus", "display_priority": 3},
+    {"provider_id": 2, "provider_name": "Apple TV", "display_priority": 4},
+    {"provider_id": 3, "provider_name": "Google Play Movies", "display_priority": 5}
+]
+REGIONS = ["US", "GB", "DE", "FR", "CA", "AU"]
+WORDS = ["heist", "train", "space", "detective", "love", "war", "robot", "island", "family",
+         "storm", "city", "ghost", "king", "river", "secret", "chase", "dream", "winter"]
+PAGE_SIZE = 20
+TOTAL_PAGES = 25
+
+def _rng(*parts) -> random.Random:
+    """Deterministic random generator for a request"""
+    seed = hashlib.sha1(":".join(str(p) for p in parts).encode()).hexdigest()
+    return random.Random(int(seed[:16], 16))
+
+def _overview(rng: random.Random) -> str:
+    return "A story about " + " ".join(rng.choice(WORDS) for _ in range(12)) + "."
+
+def movie_row(movie_id: int) -> dict:
+    rng = _rng("movie", movie_id)
+    year = rng.randint(1970, 2024)
+    return {
+        "id": movie_id,
+        "title": f"Movie {movie_id}",
+        "original_title": f"Movie {movie_id}",
+        "overview": _overview(rng),
+        "release_date": f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "vote_average": round(rng.uniform(3, 9), 1),
+        "vote_count": rng.randint(0, 30000),
+        "popularity": round(rng.uniform(1, 500), 3),
+        "adult": False,
+        "genre_ids": [g["id"] for g in rng.sample(MOVIE_GENRES, 2)],
+        "poster_path": f"/poster{movie_id}.jpg",
+        "backdrop_path": f"/backdrop{movie_id}.jpg",
+        "media_type": "movie"
+    }
+
+def tv_row(tv_id: int) -> dict:
+    rng = _rng("tv", tv_id)
+    year = rng.randint(1990, 2024)
+    return {
+        "id": tv_id,
+        "name": f"Show {tv_id}",
+        "original_name": f"Show {tv_id}",
+        "overview": _overview(rng),
+        "first_air_date": f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "vote_average": round(rng.uniform(3, 9), 1),
+        "vote_count": rng.randint(0, 20000),
+        "popularity": round(rng.uniform(1, 500), 3),
+        "origin_country": ["US"],
+        "genre_ids": [g["id"] for g in rng.sample(TV_GENRES, 2)],
+        "poster_path": f"/tvposter{tv_id}.jpg",
+        "backdrop_path": f"/tvbackdrop{tv_id}.jpg",
+        "media_type": "tv"
+    }
+
+def person_row(person_id: int) -> dict:
+    rng = _rng("person", person_id)
+    return {
+        "id": person_id,
+        "name": f"Person {person_id}",
+        "original_name": f"Person {person_id}",
+        "known_for_department": rng.choice(["Acting", "Directing", "Writing"]),
+        "popularity": round(rng.uniform(1, 100), 3),
+        "gender": rng.randint(0, 2),
+        "adult": False,
+        "profile_path": f"/profile{person_id}.jpg",
+        "known_for": [movie_row(rng.randint(1, 100000)) for _ in range(2)],
+        "media_type": "person"
+    }
+
+def credits(kind: str, item_id: int, cast_size: int = 40, crew_size: int = 300) -> dict:
+    rng = _rng("credits", kind, item_id)
+    cast = [{"id": 10000 + rng.randint(0, 5000), "name": f"Actor {i}", "character": f"Character {i}",
+             "order": i, "profile_path": f"/actor{i}.jpg"} for i in range(cast_size)]
+    crew = [{"id": 20000 + rng.randint(0, 5000), "name": f"Crew {i}", "job": rng.choice(CREW_JOBS),
+             "department": "Crew", "profile_path": None} for i in range(crew_size)]
+    return {"cast": cast, "crew": crew}
+
+def watch_providers(kind: str, item_id: int) -> dict:
+    rng = _rng("providers", kind, item_id)
+    results = {}
+    for region in rng.sample(REGIONS, rng.randint(1, len(REGIONS))):
+        results[region] = {
+            "link": f"https://www.themoviedb.org/{kind}/{item_id}/watch?locale={region}",
+            "flatrate": rng.sample(PROVIDERS[:3], rng.randint(0, 2)),
+            "rent": rng.sample(PROVIDERS[3:], rng.randint(0, 2)),
+            "buy": rng.sample(PROVIDERS[3:], rng.randint(0, 2))
+        }
+    return {"id": item_id, "results": results}
+
+# Locales with translations; Spanish has no tagline, so callers see a fallback
+TRANSLATIONS = [("de", "DE", "German"), ("fr", "FR", "French"), ("es", "ES", "Spanish"),
+                ("pt", "BR", "Portuguese"), ("pt", "PT", "Portuguese")]
+
+def translations(kind: str, item_id: int) -> dict:
+    title_field = "title" if kind == "movie" else "name"
+    label = "Movie" if kind == "movie" else "Show"
+    entries = []
+    for code, region, english_name in TRANSLATIONS:
+        data = {title_field: f"{label} {item_id} ({code}-{region})",
+                "overview": f"Overview of {item_id} in {english_name} ({region}).",
+                "tagline": "" if code == "es" else f"Tagline {code}-{region}", "homepage": ""}
+        entries.append({"iso_639_1": code, "iso_3166_1": region, "name": english_name,
+                        "english_name": english_name, "data": data})
+    return {"id": item_id, "translations": entries}
+
+def png_image(width: int, height: int, seed: str) -> bytes:
+    """Solid-colour PNG, so image tooling can be exercised without a real CDN"""
+    rng = _rng("image", seed)
+    pixel = bytes([rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255)])
+    raw = b"".join(b"\x00" + pixel * width for _ in range(height))
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(raw)) + chunk(b"IEND", b"")
+
+def page_of(kind: str, seed: str, page: int) -> dict:
+    rng = _rng("page", kind, seed, page)
+    if kind == "multi":
+        # /search/multi mixes titles and people, roughly 2:2:1
+        def row(item_id: int) -> dict:
+            return rng.choice([movie_row, movie_row, tv_row, tv_row, person_row])(item_id)
+    else:
+        row = movie_row if kind == "movie" else tv_row
+    return {
+        "page": page,
+        "total_pages": TOTAL_PAGES,
+        "total_results": TOTAL_PAGES * PAGE_SIZE,
+        "results": [row(rng.randint(1, 100000)) for _ in range(PAGE_SIZE)]
+    }
+
+@functools.lru_cache(maxsize=256)
+def _sorted_listing(kind: str, seed: str, sort_by: str) -> list:
+    """Every row of a listing, ordered by sort_by the way TMDb orders discover results"""
+    rng = _rng("listing", kind, seed)
+    row = movie_row if kind == "movie" else tv_row
+    # A small ID space so listings with different filters overlap, as real ones do
+    rows = {item_id: row(item_id) for item_id in (rng.randint(1, 5000) for _ in range(TOTAL_PAGES * PAGE_SIZE))}
+    field, _, direction = sort_by.partition(".")
+    field = {"primary_release_date": "release_date"}.get(field, field)
+    return sorted(rows.values(), key=lambda r: (r.get(field) is not None, r.get(field) or 0),
+                  reverse=direction != "asc")
+
+def sorted_page(kind: str, seed: str, sort_by: str, page: int) -> dict:
+    listing = _sorted_listing(kind, seed, sort_by)
+    total_pages = -(-len(listing) // PAGE_SIZE)
+    return {
+        "page": page,
+        "total_pages": total_pages,
+        "total_results": len(listing),
+        "results": listing[(page - 1) * PAGE_SIZE:page * PAGE_SIZE]
+    }
+
+class FakeTMDb:
+    """Starlette app with configurable latency and 429 injection, counting every request"""
+
+    def __init__(self, latency_ms: float = 0, jitter_ms: float = 0, rate_429: float = 0, seed: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_429 = rate_429
+        self.random = random.Random(seed)
+        self.requests = Counter()
+        self.throttled = 0
+        # kind -> {id: date changed}; fed by mark_changed() and served by the change lists
+        self.changes = {"movie": {}, "tv": {}, "person": {}}
+        self.app = Starlette(routes=[
+            Route("/3/genre/{kind}/list", self.genres),
+            Route("/3/search/{kind}", self.search),
+            Route("/3/discover/{kind}", self.discover),
+            Route("/3/trending/{kind}/{window}", self.trending),
+            Route("/3/watch/providers/{kind}", self.provider_list),
+            Route("/3/{kind}/changes", self.change_list),
+            Route("/3/{kind}/{item_id:int}/watch/providers", self.title_providers),
+            Route("/3/{kind}/{item_id:int}/translations", self.title_translations),
+            Route("/3/movie/{item_id:int}", self.movie_details),
+            Route("/3/tv/{item_id:int}", self.tv_details),
+            Route("/t/p/{size}/{file}", self.image),
+            Route("/__stats", self.stats),
+        ])
+        self.app.add_middleware(_FakeBehaviour, fake=self)
+
+    def total_requests(self) -> int:
+        return sum(self.requests.values())
+
+    def mark_changed(self, kind: str, ids, day: str = None) -> None:
+        """Report these IDs in the kind's change list from the given date (default: today, UTC)"""
+        day = day or datetime.now(timezone.utc).date().isoformat()
+        for item_id in ids:
+            self.changes[kind][item_id] = day
+
+    async def genres(self, request: Request) -> JSONResponse:
+        kind = request.path_params["kind"]
+        genres = MOVIE_GENRES if kind == "movie" else TV_GENRES
+        language = request.query_params.get("language", "en-US")
+        if not language.startswith("en"):
+            genres = [{"id": g["id"], "name": f"{g['name']} [{language}]"} for g in genres]
+        return JSONResponse({"genres": genres})
+
+    async def search(self, request: Request) -> JSONResponse:
+        kind = request.path_params["kind"]
+        page = int(request.query_params.get("page", 1))
+        return JSONResponse(page_of(kind, "search:" + request.query_params.get("query", ""), page))
+
+    async def discover(self, request: Request) -> JSONResponse:
+        kind = request.path_params["kind"]
+        page = int(request.query_params.get("page", 1))
+        filters = sorted((k, v) for k, v in request.query_params.items() if k not in ("api_key", "page", "sort_by"))
+        sort_by = request.query_params.get("sort_by", "popularity.desc")
+        return JSONResponse(sorted_page(kind, f"discover:{filters}", sort_by, page))
+
+    async def trending(self, request: Request) -> JSONResponse:
+        kind = request.path_params["kind"]
+        bucket = int(time.time() // 3600)
+        return JSONResponse(page_of(kind, f"trending:{request.path_params['window']}:{bucket}", 1))
+
+    async def movie_details(self, request: Request) -> JSONResponse:
+        movie_id = request.path_params["item_id"]
+        data = movie_row(movie_id)
+        rng = _rng("movie-details", movie_id)
+        data.update({
+            "tagline": "Every story has a beginning.",
+            "runtime": rng.randint(80, 180),
+            "status": "Released",
+            "budget": rng.randint(1, 300) * 1000000,
+            "revenue": rng.randint(1, 2000) * 1000000,
+            "imdb_id": f"tt{movie_id:07d}",
+            "genres": [g for g in MOVIE_GENRES if g["id"] in data["genre_ids"]],
+            "production_companies": [{"id": 1, "name": "Fake Pictures", "origin_country": "US"}],
+            "production_countries": [{"iso_3166_1": "US", "name": "United States of America"}],
+            "spoken_languages": [{"iso_639_1": "en", "english_name": "English"}]
+        })
+        if "credits" in request.query_params.get("append_to_response", ""):
+            data["credits"] = credits("movie", movie_id)
+        if "translations" in request.query_params.get("append_to_response", ""):
+            data["translations"] = translations("movie", movie_id)
+        return JSONResponse(data)
+
+    async def tv_details(self, request: Request) -> JSONResponse:
+        tv_id = request.path_params["item_id"]
+        data = tv_row(tv_id)
+        rng = _rng("tv-details", tv_id)
+        season_count = rng.randint(1, 30)
+        data.update({
+            "tagline": "",
+            "last_air_date": "2024-01-01",
+            "status": "Returning Series",
+            "type": "Scripted",
+            "number_of_seasons": season_count,
+            "number_of_episodes": season_count * 10,
+            "episode_run_time": [45],
+            "in_production": True,
+            "original_language": "en",
+            "genres": [g for g in TV_GENRES if g["id"] in data["genre_ids"]],
+            "networks": [{"id": 49, "name": "Fake Network", "origin_country": "US"}],
+            "production_companies": [{"id": 1, "name": "Fake Pictures"}],
+            "created_by": [{"id": 30000, "name": "Creator", "profile_path": None}],
+            "seasons": [{"id": tv_id * 100 + n, "season_number": n, "name": f"Season {n}",
+                         "overview": _overview(rng), "episode_count": 10, "air_date": "2020-01-01",
+                         "poster_path": f"/season{n}.jpg"} for n in range(1, season_count + 1)]
+        })
+        if "credits" in request.query_params.get("append_to_response", ""):
+            data["credits"] = credits("tv", tv_id, crew_size=60)
+        if "translations" in request.query_params.get("append_to_response", ""):
+            data["translations"] = translations("tv", tv_id)
+        return JSONResponse(data)
+
+    async def change_list(self, request: Request) -> JSONResponse:
+        kind = request.path_params["kind"]
+        if kind not in self.changes:
+            return JSONResponse({"success": False, "status_message": "Not found"}, status_code=404)
+        start = request.query_params.get("start_date", "")
+        page = int(request.query_params.get("page", 1))
+        ids = sorted(i for i, day in self.changes[kind].items() if day >= start)
+        page_size = 100
+        return JSONResponse({
+            "page": page,
+            "total_pages": max(1, -(-len(ids) // page_size)),
+            "total_results": len(ids),
+            "results": [{"id": i, "adult": False} for i in ids[(page - 1) * page_size:page * page_size]]
+        })
+
+    async def provider_list(self, request: Request) -> JSONResponse:
+        return JSONResponse({"results": PROVIDERS})
+
+    async def title_providers(self, request: Request) -> JSONResponse:
+        return JSONResponse(watch_providers(request.path_params["kind"], request.path_params["item_id"]))
+
+    async def title_translations(self, request: Request) -> JSONResponse:
+        return JSONResponse(translations(request.path_params["kind"], request.path_params["item_id"]))
+
+    async def image(self, request: Request) -> Response:
+        size = request.path_params["size"]
+        if size == "original":
+            width = 2000
+        else:
+            width = int(size[1:]) if size[1:].isdigit() else 500
+            if size.startswith("h"):
+                width = width * 2 // 3
+        height = width * 3 // 2
+        return Response(png_image(width, height, request.path_params["file"]), media_type="image/png")
+
+    async def stats(self, request: Request) -> JSONResponse:
+        return JSONResponse({
+            "total_requests": self.total_requests(),
+            "throttled": self.throttled,
+            "by_path": dict(self.requests)
+        })
+
+class _FakeBehaviour:
+    """ASGI middleware applying latency, 429 injection and request counting"""
+
+    def __init__(self, app, fake: FakeTMDb):
+        self.app = app
+        self.fake = fake
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith("/__"):
+            await self.app(scope, receive, send)
+            return
+
+        self.fake.requests[scope["path"]] += 1
+        delay = self.fake.latency_ms + self.fake.random.uniform(0, self.fake.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        if self.fake.rate_429 and self.fake.random.random() < self.fake.rate_429:
+            self.fake.throttled += 1
+            response = JSONResponse({"status_code": 25, "status_message": "Your request count is over the allowed limit."},
+                                    status_code=429)
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
+
+class FakeTMDbServer:
+    """Run a FakeTMDb app with uvicorn on a background thread"""
+
+    def __init__(self, fake: FakeTMDb, host: str = "127.0.0.1", port: int = 8765):
+        self.fake = fake
+        self.host = host
+        self.port = port
+        self.server = uvicorn.Server(uvicorn.Config(fake.app, host=host, port=port, log_level="warning"))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/3"
+
+    def start(self) -> "FakeTMDbServer":
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def stop(self) -> None:
+        self.server.should_exit = True
+        self.thread.join(timeout=5)
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local fake TMDb API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Latency added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Random extra latency up to this value")
+    parser.add_argument("--rate-429", type=float, default=0, help="Fraction of requests answered with 429")
+    args = parser.parse_args()
+
+    fake = FakeTMDb(args.latency_ms, args.jitter_ms, args.rate_429)
+    print(f"Fake TMDb listening on http://{args.host}:{args.port}/3")
+    print(f"Point the server at it with TMDB_BASE_URL=http://{args.host}:{args.port}/3")
+    print(f"and TMDB_IMAGE_BASE_URL=http://{args.host}:{args.port}/t/p/")
+    uvicorn.run(fake.app, host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
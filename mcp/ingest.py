@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Bulk catalog ingester for the Movie & TV MCP Server
+Fetches title details within TMDb's rate limit into a resumable SQLite snapshot
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import sys
+import time
+
+from catalog import CatalogStore
+
+# Details are stored with every locale's text so the snapshot serves all languages
+DETAILS_APPEND_EXTRA = ",translations"
+MAX_ATTEMPTS = 3
+QUEUE_BATCH = 200
+
+def ids_from_file(path: str) -> list:
+    """Read TMDb IDs from an export (.ndjson / .ndjson.gz rows with an "id") or a plain list, one per line"""
+    opener = gzip.open if path.endswith(".gz") else open
+    ids = []
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                item_id = json.loads(line).get("id")
+            else:
+                item_id = int(line.split(",")[0])
+            if item_id is not None:
+                ids.append(int(item_id))
+    return ids
+
+def default_job_id(kind: str, source: dict) -> str:
+    if source["type"] == "stale":
+        # Every refresh is a new job, since titles go stale again after being refetched
+        return f"{kind}-stale-{int(time.time())}"
+    fingerprint = json.dumps(source, sort_keys=True)
+    return f"{kind}-{source['type']}-{hashlib.sha1(fingerprint.encode()).hexdigest()[:12]}"
+
+async def sweep_discover(server, catalog, job: dict, max_pages: int) -> None:
+    """Enqueue IDs from discover pages, checkpointing the next page after each one"""
+    source = job["source"]
+    kind = job["kind"]
+    params = {"sort_by": source.get("sort_by", "popularity.desc")}
+    date_field = "primary_release_date" if kind == "movie" else "first_air_date"
+    if source.get("genre_id"):
+        params["with_genres"] = source["genre_id"]
+    if source.get("year_from"):
+        params[f"{date_field}.gte"] = f"{source['year_from']}-01-01"
+    if source.get("year_to"):
+        params[f"{date_field}.lte"] = f"{source['year_to']}-12-31"
+
+    start = job["next_page"]
+    # Pages past the job's own limit would be fetched ahead and then thrown away
+    end = min(start + max_pages - 1, source.get("pages") or server.TMDB_MAX_PAGES, server.TMDB_MAX_PAGES)
+    pages = server.iter_result_pages(f"/discover/{kind}", params, start, end)
+    try:
+        async for page, result in pages:
+            if not result.get("success"):
+                print(f"Discover page {page} failed: {result.get('error')}", file=sys.stderr)
+                return
+            last_page = min(result.get("total_pages") or 0, server.TMDB_MAX_PAGES, source.get("pages") or server.TMDB_MAX_PAGES)
+            ids = [item["id"] for item in result.get("results", []) if item.get("id") is not None]
+            catalog.enqueue(job["job_id"], ids, next_page=page + 1, sweep_done=page >= last_page)
+            if page >= last_page:
+                return
+    finally:
+        await pages.aclose()
+
+async def fetch_titles(server, catalog, job: dict, concurrency: int, limit: int, progress) -> dict:
+    """Fetch pending IDs concurrently, storing each title and its queue status together"""
+    kind = job["kind"]
+    append = (server.MOVIE_DETAILS_APPEND if kind == "movie" else server.TV_DETAILS_APPEND) + DETAILS_APPEND_EXTRA
+    counts = {"done": 0, "missing": 0, "failed": 0, "retried": 0}
+    semaphore = asyncio.Semaphore(concurrency)
+    attempts = {}
+
+    async def fetch(title_id: int) -> None:
+        async with semaphore:
+            result = await server.make_tmdb_request(f"/{kind}/{title_id}",
+                                                    {"append_to_response": append, "language": server.DEFAULT_LANGUAGE},
+                                                    wait_for_budget=True)
+        if result.get("success") and not result.get("stale"):
+            catalog.upsert_title(kind, result)
+            catalog.finish(job["job_id"], title_id, "done")
+            counts["done"] += 1
+        elif result.get("not_found"):
+            catalog.finish(job["job_id"], title_id, "missing", result.get("error"))
+            counts["missing"] += 1
+        else:
+            attempts[title_id] = attempts.get(title_id, 0) + 1
+            if attempts[title_id] >= MAX_ATTEMPTS:
+                catalog.finish(job["job_id"], title_id, "failed", result.get("error"))
+                counts["failed"] += 1
+            else:
+                counts["retried"] += 1
+                # Back off while the circuit is open or TMDb throttles
+                await asyncio.sleep(result.get("retry_after_seconds") or 1)
+        progress(counts)
+
+    def handled() -> int:
+        return counts["done"] + counts["missing"] + counts["failed"]
+
+    while limit is None or handled() < limit:
+        size = QUEUE_BATCH if limit is None else min(QUEUE_BATCH, limit - handled())
+        batch = catalog.pending(job["job_id"], size)
+        if not batch:
+            break
+        await asyncio.gather(*(fetch(title_id) for title_id in batch))
+    return counts
+
+async def run_ingest(args) -> dict:
+    import movie_server as server
+
+    catalog = CatalogStore(args.db)
+    if args.ids_file:
+        source = {"type": "file", "path": os.path.abspath(args.ids_file)}
+    elif args.refresh_stale:
+        source = {"type": "stale"}
+    else:
+        source = {"type": "discover", "genre_id": args.genre_id, "year_from": args.year_from,
+                  "year_to": args.year_to, "sort_by": args.sort_by, "pages": args.pages}
+
+    job_id = args.job_id or default_job_id(args.kind, source)
+    job = catalog.ensure_job(job_id, args.kind, source)
+    if job["kind"] != args.kind or job["source"] != source:
+        raise SystemExit(f"Job '{job_id}' exists with different settings; choose another --job-id")
+
+    if args.retry_failed:
+        print(f"Re-queued {catalog.retry(job_id)} failed IDs")
+
+    started = time.monotonic()
+    if source["type"] == "file" and not job["sweep_done"]:
+        catalog.enqueue(job_id, ids_from_file(args.ids_file), next_page=1, sweep_done=True)
+    elif source["type"] == "stale":
+        catalog.enqueue(job_id, catalog.stale_ids(args.kind))
+    elif source["type"] == "discover" and not job["sweep_done"]:
+        await sweep_discover(server, catalog, job, args.max_pages)
+
+    def progress(counts: dict) -> None:
+        handled = counts["done"] + counts["missing"] + counts["failed"]
+        if args.verbose and handled and handled % 50 == 0:
+            elapsed = time.monotonic() - started
+            print(f"  {handled} titles in {elapsed:.0f}s ({handled / elapsed:.1f}/s)", file=sys.stderr)
+
+    try:
+        counts = await fetch_titles(server, catalog, job, args.concurrency, args.limit, progress)
+    finally:
+        await server._plot_index.drain()
+        await server.http_client.aclose()
+
+    summary = catalog.job(job_id)
+    summary["this_run"] = dict(counts, elapsed_s=round(time.monotonic() - started, 2),
+                               upstream_requests=server._http_metrics["requests"])
+    summary["catalog"] = catalog.stats()
+    catalog.close()
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest TMDb title details into a local SQLite snapshot")
+    parser.add_argument("kind", choices=["movie", "tv"])
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--ids-file", help="Export file (.ndjson[.gz]) or text file of IDs")
+    source.add_argument("--refresh-stale", action="store_true", help="Refetch titles marked stale by change sync")
+    parser.add_argument("--genre-id", type=int, help="Discover sweep: genre filter")
+    parser.add_argument("--year-from", type=int, help="Discover sweep: first year")
+    parser.add_argument("--year-to", type=int, help="Discover sweep: last year")
+    parser.add_argument("--sort-by", default="popularity.desc", help="Discover sweep: sort order")
+    parser.add_argument("--pages", type=int, help="Discover sweep: total pages to cover (default: all, at most 500)")
+    parser.add_argument("--max-pages", type=int, default=100, help="Discover pages to read in this run")
+    parser.add_argument("--job-id", help="Name of the job to create or resume (default: derived from the source)")
+    parser.add_argument("--db", default=os.getenv("CATALOG_DB", "catalog.db"), help="SQLite snapshot path")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent detail requests")
+    parser.add_argument("--limit", type=int, help="Stop after this many titles in this run")
+    parser.add_argument("--retry-failed", action="store_true", help="Queue IDs that failed in earlier runs again")
+    parser.add_argument("--fake", action="store_true", help="Ingest from a local fake TMDb instead of the real API")
+    parser.add_argument("--fake-port", type=int, default=8766)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    fake_server = None
+    if args.fake:
+        from fake_tmdb import FakeTMDb, FakeTMDbServer
+        fake_server = FakeTMDbServer(FakeTMDb(), port=args.fake_port).start()
+        os.environ["TMDB_BASE_URL"] = fake_server.base_url
+        os.environ["TMDB_TRANSPORT"] = "live"
+        os.environ.setdefault("TMDB_API_KEY", "ingest")
+
+    try:
+        summary = asyncio.run(run_ingest(args))
+    finally:
+        if fake_server is not None:
+            fake_server.stop()
+
+    print(json.dumps(summary, indent=2))
+    queue = summary["queue"]
+    return 1 if queue.get("failed") else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+End-to-end load generator for the Movie & TV MCP Server
+Drives the server over MCP like many concurrent agents against a local fake TMDb
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from fastmcp import Client
+from fastmcp.client.transports import PythonStdioTransport, StreamableHttpTransport
+
+from fake_tmdb import FakeTMDb, FakeTMDbServer
+
+RESULTS_VERSION = 1
+QUERIES = ["matrix", "dune", "heist", "star", "love", "night", "war", "ghost", "city", "king"]
+
+def _payload(result) -> dict:
+    """Decode the JSON text a tool returned"""
+    try:
+        return json.loads(result.content[0].text)
+    except (AttributeError, IndexError, TypeError, ValueError):
+        return {}
+
+def _first_id(payload: dict):
+    results = payload.get("results") or []
+    return results[0]["id"] if results else None
+
+async def movie_lookup(call, rng: random.Random) -> None:
+    """search_movies -> get_movie_details -> get_trending"""
+    payload = await call("search_movies", {"query": rng.choice(QUERIES)})
+    movie_id = _first_id(payload)
+    if movie_id is not None:
+        await call("get_movie_details", {"movie_id": movie_id})
+    await call("get_trending", {"media_type": "movie", "time_window": rng.choice(["day", "week"])})
+
+async def tv_lookup(call, rng: random.Random) -> None:
+    """search_tv_shows -> get_tv_show_details"""
+    payload = await call("search_tv_shows", {"query": rng.choice(QUERIES)})
+    tv_id = _first_id(payload)
+    if tv_id is not None:
+        await call("get_tv_show_details", {"tv_id": tv_id})
+
+async def browse(call, rng: random.Random) -> None:
+    """get_trending -> discover_content"""
+    await call("get_trending", {"media_type": rng.choice(["movie", "tv"]), "time_window": "week"})
+    await call("discover_content", {"content_type": "movie", "genre_id": rng.choice([28, 35, 18, 878]),
+                                    "year": rng.randint(2000, 2024)})
+
+SCENARIOS = [
+    (movie_lookup, 0.5),
+    (tv_lookup, 0.3),
+    (browse, 0.2),
+]
+
+def percentile(ordered: list, percent: float) -> float:
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, int(round(len(ordered) * percent / 100 + 0.5)) - 1))
+    return ordered[index]
+
+class LoadRun:
+    """Collects per-tool latencies, errors and server RSS samples"""
+
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+        self.rss_samples = []
+        self.started = time.monotonic()
+
+    def record(self, tool: str, seconds: float, ok: bool) -> None:
+        self.latencies.setdefault(tool, []).append(seconds)
+        if not ok:
+            self.errors[tool] = self.errors.get(tool, 0) + 1
+
+    def tool_summary(self) -> dict:
+        summary = {}
+        for tool, samples in sorted(self.latencies.items()):
+            ordered = sorted(samples)
+            summary[tool] = {
+                "calls": len(ordered),
+                "errors": self.errors.get(tool, 0),
+                "mean_ms": round(sum(ordered) / len(ordered) * 1000, 2),
+                "p50_ms": round(percentile(ordered, 50) * 1000, 2),
+                "p95_ms": round(percentile(ordered, 95) * 1000, 2),
+                "p99_ms": round(percentile(ordered, 99) * 1000, 2)
+            }
+        return summary
+
+async def read_metrics(client: Client) -> dict:
+    contents = await client.read_resource("metrics://http")
+    return json.loads(contents[0].text)
+
+async def run_agent(agent_id: int, client: Client, run: LoadRun, deadline: float, think_ms: float, seed: int) -> None:
+    rng = random.Random(seed * 100003 + agent_id)
+    scenarios, weights = zip(*SCENARIOS)
+
+    async def call(tool: str, arguments: dict) -> dict:
+        start = time.monotonic()
+        try:
+            result = await client.call_tool(tool, arguments, raise_on_error=False)
+        except Exception:
+            run.record(tool, time.monotonic() - start, False)
+            return {}
+        payload = _payload(result)
+        run.record(tool, time.monotonic() - start, not result.is_error and payload.get("success", False))
+        return payload
+
+    while time.monotonic() < deadline:
+        scenario = rng.choices(scenarios, weights)[0]
+        await scenario(call, rng)
+        if think_ms:
+            await asyncio.sleep(rng.uniform(0, think_ms) / 1000)
+
+async def sample_rss(clients: list, run: LoadRun, interval: float, stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        elapsed = round(time.monotonic() - run.started, 2)
+        for index, client in enumerate(clients):
+            try:
+                metrics = await read_metrics(client)
+                run.rss_samples.append({"t": elapsed, "server": index,
+                                        "rss_bytes": metrics.get("process", {}).get("rss_bytes")})
+            except Exception:
+                pass
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+
+async def upstream_requests(clients: list) -> int:
+    total = 0
+    for client in clients:
+        total += (await read_metrics(client)).get("requests", 0)
+    return total
+
+def build_clients(args, base_url: str) -> list:
+    if args.url:
+        return [Client(StreamableHttpTransport(args.url)) for _ in range(args.servers)]
+
+    env = dict(os.environ)
+    env.update({
+        "TMDB_BASE_URL": base_url,
+        "TMDB_API_KEY": os.getenv("TMDB_API_KEY") or "loadtest",
+        "TMDB_TRANSPORT": "live"
+    })
+    server_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "movie_server.py")
+    return [Client(PythonStdioTransport(server_script, env=env, cwd=os.path.dirname(server_script),
+                                        log_file=Path(args.server_log)))
+            for _ in range(args.servers)]
+
+async def run_load(args) -> dict:
+    fake_server = None
+    base_url = args.tmdb_base_url
+    if not args.url and not base_url:
+        fake = FakeTMDb(args.fake_latency_ms, args.fake_jitter_ms, args.fake_429_rate, args.seed)
+        fake_server = FakeTMDbServer(fake, port=args.fake_port).start()
+        base_url = fake_server.base_url
+
+    clients = build_clients(args, base_url)
+    run = LoadRun()
+    try:
+        for client in clients:
+            await client.__aenter__()
+
+        upstream_before = await upstream_requests(clients)
+        run.started = time.monotonic()
+        deadline = run.started + args.duration
+        stop = asyncio.Event()
+        sampler = asyncio.ensure_future(sample_rss(clients, run, args.rss_interval, stop))
+
+        await asyncio.gather(*(
+            run_agent(i, clients[i % len(clients)], run, deadline, args.think_ms, args.seed)
+            for i in range(args.agents)
+        ))
+        elapsed = time.monotonic() - run.started
+
+        stop.set()
+        await sampler
+        upstream_calls = await upstream_requests(clients) - upstream_before
+    finally:
+        for client in clients:
+            try:
+                await client.__aexit__(None, None, None)
+            except Exception:
+                pass
+        if fake_server is not None:
+            fake_server.stop()
+
+    tools = run.tool_summary()
+    tool_calls = sum(t["calls"] for t in tools.values())
+    rss_values = [s["rss_bytes"] for s in run.rss_samples if s["rss_bytes"]]
+
+    return {
+        "version": RESULTS_VERSION,
+        "label": args.label,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "config": {
+            "agents": args.agents,
+            "servers": args.servers,
+            "duration_s": args.duration,
+            "think_ms": args.think_ms,
+            "transport": "http" if args.url else "stdio",
+            "fake_latency_ms": args.fake_latency_ms,
+            "fake_jitter_ms": args.fake_jitter_ms,
+            "fake_429_rate": args.fake_429_rate,
+            "seed": args.seed
+        },
+        "summary": {
+            "tool_calls": tool_calls,
+            "errors": sum(t["errors"] for t in tools.values()),
+            "elapsed_s": round(elapsed, 2),
+            "throughput_calls_per_s": round(tool_calls / elapsed, 2) if elapsed else 0.0,
+            "upstream_calls": upstream_calls,
+            "upstream_calls_per_tool_call": round(upstream_calls / tool_calls, 3) if tool_calls else 0.0,
+            "peak_rss_bytes": max(rss_values) if rss_values else None
+        },
+        "tools": tools,
+        "rss_samples": run.rss_samples
+    }
+
+def print_report(results: dict, baseline: dict = None) -> None:
+    summary = results["summary"]
+    print(f"Tool calls: {summary['tool_calls']} ({summary['errors']} errors) in {summary['elapsed_s']}s")
+    print(f"Throughput: {summary['throughput_calls_per_s']} calls/s")
+    print(f"Upstream calls per tool call: {summary['upstream_calls_per_tool_call']}")
+    if summary["peak_rss_bytes"]:
+        print(f"Peak RSS: {summary['peak_rss_bytes'] / 1048576:.1f} MiB")
+    print()
+    print(f"{'tool':<22}{'calls':>8}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for tool, stats in results["tools"].items():
+        line = f"{tool:<22}{stats['calls']:>8}{stats['errors']:>8}{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['p99_ms']:>10}"
+        previous = (baseline or {}).get("tools", {}).get(tool)
+        if previous and previous["p95_ms"]:
+            change = (stats["p95_ms"] - previous["p95_ms"]) / previous["p95_ms"] * 100
+            line += f"   p95 {change:+.1f}% vs baseline"
+        print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Movie & TV MCP Server")
+    parser.add_argument("--agents", type=int, default=50, help="Concurrent simulated agents")
+    parser.add_argument("--servers", type=int, default=1, help="Server processes (stdio) or sessions (http)")
+    parser.add_argument("--duration", type=float, default=30, help="Test duration in seconds")
+    parser.add_argument("--think-ms", type=float, default=0, help="Random pause between agent scenarios")
+    parser.add_argument("--url", help="Streamable HTTP URL of an already running server instead of stdio")
+    parser.add_argument("--tmdb-base-url", help="Use this TMDb base URL instead of starting the local fake")
+    parser.add_argument("--fake-port", type=int, default=8765)
+    parser.add_argument("--fake-latency-ms", type=float, default=50)
+    parser.add_argument("--fake-jitter-ms", type=float, default=50)
+    parser.add_argument("--fake-429-rate", type=float, default=0)
+    parser.add_argument("--server-log", default=os.devnull, help="File receiving server stderr (stdio only)")
+    parser.add_argument("--rss-interval", type=float, default=1.0, help="Seconds between RSS samples")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--label", default="", help="Free-form label stored with the results")
+    parser.add_argument("--output", help="Write results JSON to this file")
+    parser.add_argument("--compare", help="Baseline results JSON to compare p95 latencies against")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_load(args))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(results, baseline)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    return 0 if results["summary"]["tool_calls"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,20 +1,67 @@
 from fastmcp import FastMCP, Context
+from fastmcp.utilities.types import Image
 import httpx
 import os
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Union
 import asyncio
+import base64
+import contextvars
+import functools
+import gzip
+import hashlib
+import heapq
+import inspect
+import io
 import json
+import mmap
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+import zlib
+from collections import Counter, OrderedDict, deque
+from contextlib import asynccontextmanager, contextmanager
+from datetime import date, datetime, timedelta, timezone
 from dotenv import load_dotenv
 
+# Pillow is optional; without it thumbnails come from TMDb's smallest image size
+try:
+    from PIL import Image as PILImage
+except ImportError:
+    PILImage = None
+
+from catalog import CatalogStore
+from plot_index import PlotIndex
+
 # Load environment variables from .env file
 load_dotenv()
 
+@asynccontextmanager
+async def server_lifespan(server):
+    """Run the change-sync worker alongside the server when it is enabled"""
+    worker = None
+    if CHANGE_SYNC_INTERVAL > 0 and API_KEY:
+        worker = asyncio.ensure_future(run_change_sync(CHANGE_SYNC_INTERVAL))
+    try:
+        yield {}
+    finally:
+        # Titles still queued for the plot index are written before exiting
+        await _plot_index.drain()
+        if worker is not None:
+            worker.cancel()
+            try:
+                await worker
+            except asyncio.CancelledError:
+                pass
+
 # Initialize the MCP server
-mcp = FastMCP("MovieTVMCP")
+mcp = FastMCP("MovieTVMCP", lifespan=server_lifespan)
 
 # TMDb API configuration
-TMDB_BASE_URL = "https://api.themoviedb.org/3"
-TMDB_IMAGE_BASE_URL = "https://image.tmdb.org/t/p/"
+TMDB_BASE_URL = os.getenv("TMDB_BASE_URL", "https://api.themoviedb.org/3")
+TMDB_IMAGE_BASE_URL = os.getenv("TMDB_IMAGE_BASE_URL", "https://image.tmdb.org/t/p/")
 API_KEY = os.getenv("TMDB_API_KEY")
 READ_ACCESS_TOKEN = os.getenv("TMDB_READ_ACCESS_TOKEN")
 INCLUDE_ADULT = os.getenv("INCLUDE_ADULT", "false").lower() == "true"
@@ -24,83 +71,1111 @@ API_TIMEOUT = int(os.getenv("API_TIMEOUT", "10"))
 # Debug configuration
 DEBUG = os.getenv("DEBUG", "false").lower() == "true"
 
+# Profiling: sample the next N tool calls and write collapsed stacks
+PROFILE_SAMPLE_CALLS = int(os.getenv("PROFILE_SAMPLE_CALLS", "0"))
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "1"))
+
+# TMDb rate limit (requests per window)
+RATE_LIMIT_REQUESTS = 40
+RATE_LIMIT_WINDOW = 10.0
+
+# Hedged request configuration (opt-in)
+HEDGE_REQUESTS = os.getenv("HEDGE_REQUESTS", "false").lower() == "true"
+HEDGE_MAX_PERCENT = float(os.getenv("HEDGE_MAX_PERCENT", "5"))
+HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", "95"))
+HEDGE_DEFAULT_DELAY_MS = int(os.getenv("HEDGE_DEFAULT_DELAY_MS", "1000"))
+HEDGE_MIN_DELAY_MS = int(os.getenv("HEDGE_MIN_DELAY_MS", "50"))
+HEDGE_MIN_SAMPLES = 20
+
+# Circuit breaker configuration
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_SECONDS = float(os.getenv("CIRCUIT_RESET_SECONDS", "30"))
+
+# Last-known-good responses kept for degraded mode
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "2000"))
+
+# Movie and TV details (and their translations) are served from cache for this
+# long (0 disables); with change sync enabled, changed titles are invalidated
+# early so long TTLs are safe
+DETAILS_CACHE_TTL = float(os.getenv("DETAILS_CACHE_TTL", "3600"))
+
+# Change sync: poll TMDb's change lists and invalidate or refresh changed entries
+CHANGE_SYNC_INTERVAL = float(os.getenv("CHANGE_SYNC_INTERVAL", "0"))
+CHANGE_SYNC_MODE = os.getenv("CHANGE_SYNC_MODE", "invalidate").lower()
+CHANGE_SYNC_STATE = os.getenv("CHANGE_SYNC_STATE", "change_sync.json")
+CHANGE_SYNC_KINDS = ("movie", "tv", "person")
+# TMDb only answers change queries spanning at most 14 days
+CHANGE_FEED_MAX_DAYS = 14
+
+# Concurrent upstream requests per fan-out tool call
+FANOUT_CONCURRENCY = int(os.getenv("FANOUT_CONCURRENCY", "8"))
+
+# Watch providers change rarely, so their payloads are cached for a long time
+WATCH_PROVIDERS_TTL = float(os.getenv("WATCH_PROVIDERS_TTL", "86400"))
+# Provider entries get their own LRU budget so list traffic cannot evict them before the TTL
+WATCH_PROVIDERS_CACHE_MAX_ENTRIES = int(os.getenv("WATCH_PROVIDERS_CACHE_MAX_ENTRIES", "2000"))
+WATCH_PROVIDERS_MAX_IDS = 50
+WATCH_MONETIZATION_TYPES = ("flatrate", "free", "ads", "rent", "buy")
+
+# Batch search limits
+BATCH_SEARCH_MAX_QUERIES = 10
+
+# Unified search limits
+SEARCH_ALL_MAX_PAGES = 5
+
+# Versions of polled lists kept for delta responses
+LIST_SNAPSHOT_MAX_LISTS = int(os.getenv("LIST_SNAPSHOT_MAX_LISTS", "500"))
+LIST_SNAPSHOT_VERSIONS = 8
+
+# Merged discover limits
+DISCOVER_MAX_STREAMS = 30
+DISCOVER_MAX_LIMIT = 100
+
+# Local image cache
+IMAGE_CACHE_DIR = os.getenv("IMAGE_CACHE_DIR", "image_cache")
+IMAGE_CACHE_MAX_BYTES = int(os.getenv("IMAGE_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+THUMBNAIL_SIZE = int(os.getenv("THUMBNAIL_SIZE", "185"))
+# Size downloaded once per image and used as the thumbnail source
+IMAGE_SOURCE_SIZES = {"poster": "w500", "backdrop": "w780", "profile": "h632"}
+# Closest TMDb rendition when Pillow is not installed
+IMAGE_FALLBACK_SIZES = {"poster": "w185", "backdrop": "w300", "profile": "w185"}
+
+# Bulk export configuration
+EXPORT_DIR = os.getenv("EXPORT_DIR", "exports")
+EXPORT_CONCURRENCY = int(os.getenv("EXPORT_CONCURRENCY", "4"))
+TMDB_MAX_PAGES = 500
+
+# Local catalog snapshot filled by ingest.py
+CATALOG_DB = os.getenv("CATALOG_DB", "catalog.db")
+CATALOG_SERVE = os.getenv("CATALOG_SERVE", "false").lower() == "true"
+
+# Local plot search index over cached and ingested overviews
+PLOT_INDEX_ENABLED = os.getenv("PLOT_INDEX_ENABLED", "false").lower() == "true"
+PLOT_INDEX_DIR = os.getenv("PLOT_INDEX_DIR", "plot_index")
+PLOT_SEARCH_MAX_LIMIT = 50
+
+# Tracing
+class Trace:
+    """Timed spans recorded while handling one tool call"""
+
+    def __init__(self, tool: str):
+        self.tool = tool
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.started = time.perf_counter()
+        self.spans: List[Dict] = []
+
+    def add(self, name: str, start: float, end: float) -> None:
+        self.spans.append({
+            "name": name,
+            "start_ms": round((start - self.started) * 1000, 3),
+            "duration_ms": round((end - start) * 1000, 3)
+        })
+
+    def last_end(self) -> float:
+        """perf_counter value at which the latest recorded span finished"""
+        if not self.spans:
+            return self.started
+        return self.started + max(s["start_ms"] + s["duration_ms"] for s in self.spans) / 1000
+
+    def summary(self) -> Dict:
+        return {
+            "trace_id": self.trace_id,
+            "tool": self.tool,
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 3),
+            "spans": self.spans
+        }
+
+_current_trace: contextvars.ContextVar = contextvars.ContextVar("current_trace", default=None)
+
+@contextmanager
+def span(name: str):
+    """Record a span on the current trace; a no-op when no trace is active"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, start, time.perf_counter())
+
+def respond(payload: Dict) -> str:
+    """
+    Serialize a tool response.
+
+    When a trace is active, the time since the last span is recorded as
+    "format" and the serialization itself as "serialize". With DEBUG on the
+    payload gets a `debug` field with the trace, which costs a second dump.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        return json.dumps(payload, indent=2)
+
+    trace.add("format", trace.last_end(), time.perf_counter())
+    with span("serialize"):
+        text = json.dumps(payload, indent=2)
+
+    if DEBUG:
+        payload["debug"] = trace.summary()
+        text = json.dumps(payload, indent=2)
+    return text
+
+class SamplingProfiler:
+    """Wall-clock sampling profiler for one thread, producing collapsed stacks"""
+
+    def __init__(self, thread_id: int, interval_ms: float):
+        self.thread_id = thread_id
+        self.interval = interval_ms / 1000
+        self.counts = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.counts[";".join(reversed(stack))] += 1
+
+    def start(self) -> "SamplingProfiler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, path: str) -> None:
+        """Write `frame;frame;frame count` lines, ready for flamegraph.pl or speedscope"""
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.counts.most_common():
+                f.write(f"{stack} {count}\n")
+
+_profile_state = {"remaining": PROFILE_SAMPLE_CALLS, "written": []}
+
+def traced(fn):
+    """
+    Wrap a tool so each call gets a trace and, while armed, a profile.
+
+    Tracing only happens with DEBUG on or a profile pending, so the wrapper
+    costs one branch otherwise.
+    """
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        profile = _profile_state["remaining"] > 0
+        if not DEBUG and not profile:
+            return await fn(*args, **kwargs)
+
+        trace = Trace(fn.__name__)
+        token = _current_trace.set(trace)
+        profiler = None
+        if profile:
+            _profile_state["remaining"] -= 1
+            profiler = SamplingProfiler(threading.get_ident(), PROFILE_INTERVAL_MS).start()
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            _current_trace.reset(token)
+            if profiler is not None:
+                profiler.stop()
+                os.makedirs(PROFILE_DIR, exist_ok=True)
+                path = os.path.join(PROFILE_DIR, f"{fn.__name__}-{trace.trace_id}.collapsed")
+                profiler.write(path)
+                _profile_state["written"].append(path)
+                del _profile_state["written"][:-50]
+
+    return wrapper
+
+# Deadlines
+_deadline: contextvars.ContextVar = contextvars.ContextVar("deadline", default=None)
+
+def deadline_remaining() -> Optional[float]:
+    """Seconds left before the current call's deadline, or None without one"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+def _argument_reader(fn, name: str):
+    """Read a named argument of a tool call, whether it was passed by keyword or by position"""
+    signature = inspect.signature(fn)
+
+    def read(args: tuple, kwargs: Dict):
+        try:
+            return signature.bind_partial(*args, **kwargs).arguments.get(name)
+        except TypeError:
+            # Invalid calls fail in the tool itself with the usual message
+            return None
+
+    return read
+
+def with_deadline(fn):
+    """
+    Apply a tool's `deadline_ms` argument to every upstream request it makes.
+
+    make_tmdb_request bounds each request by the remaining time and answers
+    with a deadline error (or cached data) once it has run out, so fan-out
+    tools can return whatever finished in time.
+    """
+    read_deadline = _argument_reader(fn, "deadline_ms")
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        deadline_ms = read_deadline(args, kwargs)
+        if deadline_ms is None:
+            return await fn(*args, **kwargs)
+
+        deadline = time.monotonic() + max(0, deadline_ms) / 1000
+        current = _deadline.get()
+        token = _deadline.set(deadline if current is None else min(current, deadline))
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            _deadline.reset(token)
+
+    return wrapper
+
+# Languages
+_language: contextvars.ContextVar = contextvars.ContextVar("language", default=None)
+_LANGUAGE_PATTERN = re.compile(r"^[a-z]{2}(-[A-Z]{2})?$")
+
+def current_language() -> str:
+    """Language of the current tool call, DEFAULT_LANGUAGE outside a call or without one"""
+    return _language.get() or DEFAULT_LANGUAGE
+
+def with_language(fn):
+    """
+    Apply a tool's `language` argument to every upstream request it makes.
+
+    make_tmdb_request sends the current language unless a request pins one,
+    which the details tools do to share language-independent data across locales.
+    """
+    read_language = _argument_reader(fn, "language")
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        language = read_language(args, kwargs)
+        if language is None:
+            return await fn(*args, **kwargs)
+
+        if not _LANGUAGE_PATTERN.match(language):
+            return respond({
+                "success": False,
+                "error": "Invalid language. Use an ISO 639-1 code with an optional region, e.g. 'de' or 'pt-BR'."
+            })
+
+        token = _language.set(language)
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            _language.reset(token)
+
+    return wrapper
+
+# Transport mode: "live" (default), "record" or "replay"
+TMDB_TRANSPORT = os.getenv("TMDB_TRANSPORT", "live").lower()
+TMDB_CASSETTE = os.getenv("TMDB_CASSETTE", "cassettes/tmdb.jsonl.gz")
+REPLAY_LATENCY_MS = float(os.getenv("REPLAY_LATENCY_MS", "0"))
+REPLAY_LATENCY_JITTER_MS = float(os.getenv("REPLAY_LATENCY_JITTER_MS", "0"))
+REPLAY_ERROR_RATE = float(os.getenv("REPLAY_ERROR_RATE", "0"))
+REPLAY_SEED = os.getenv("REPLAY_SEED")
+
+if TMDB_TRANSPORT == "replay" and not API_KEY:
+    # Cassettes never contain the key, so any placeholder works offline
+    API_KEY = "replay"
+
+def cassette_key(request: httpx.Request) -> str:
+    """Identify a request by method, path and query, ignoring the API key"""
+    params = sorted((k, v) for k, v in request.url.params.multi_items() if k != "api_key")
+    query = "&".join(f"{k}={v}" for k, v in params)
+    return f"{request.method} {request.url.path}?{query}"
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Pass requests through to TMDb and append each exchange to a cassette"""
+
+    def __init__(self, path: str, transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.path = path
+        self.transport = transport or httpx.AsyncHTTPTransport()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.transport.handle_async_request(request)
+        try:
+            body = await response.aread()
+        finally:
+            await response.aclose()
+        entry = {
+            "key": cassette_key(request),
+            "status": response.status_code,
+            "content_type": response.headers.get("content-type", "application/json")
+        }
+        # JSON and text stay readable in the cassette; images and other binary bodies are base64
+        text = None
+        if entry["content_type"].startswith(("application/json", "text/")):
+            try:
+                text = body.decode("utf-8")
+            except UnicodeDecodeError:
+                pass
+        if text is None:
+            entry["body"] = base64.b64encode(body).decode("ascii")
+            entry["encoding"] = "base64"
+        else:
+            entry["body"] = text
+        # Each entry is its own gzip member, so the cassette stays appendable
+        with open(self.path, "ab") as f:
+            f.write(gzip.compress((json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8")))
+        return httpx.Response(response.status_code, headers={"content-type": entry["content_type"]},
+                              content=body, request=request)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    Serve recorded exchanges from a cassette without touching the network.
+
+    Latency and 503 errors can be injected to exercise timeouts, hedging and
+    the circuit breaker. Requests missing from the cassette get a 404.
+    """
+
+    def __init__(self, path: str, latency_ms: float = 0, jitter_ms: float = 0,
+                 error_rate: float = 0, seed: Optional[str] = None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.entries: Dict[str, Dict] = {}
+        if os.path.exists(path):
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.entries[entry["key"]] = entry
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        delay = self.latency_ms + self.random.uniform(0, self.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        if self.error_rate and self.random.random() < self.error_rate:
+            return httpx.Response(503, json={"status_message": "Injected replay error"}, request=request)
+
+        entry = self.entries.get(cassette_key(request))
+        if entry is None:
+            return httpx.Response(404, json={"status_message": "Request not found in cassette"}, request=request)
+
+        if entry.get("encoding") == "base64":
+            body = base64.b64decode(entry["body"])
+        else:
+            body = entry["body"].encode("utf-8")
+        return httpx.Response(entry["status"], headers={"content-type": entry["content_type"]},
+                              content=body, request=request)
+
+def build_transport() -> Optional[httpx.AsyncBaseTransport]:
+    """Create the transport for TMDB_TRANSPORT, or None for the default network transport"""
+    if TMDB_TRANSPORT == "record":
+        return RecordingTransport(TMDB_CASSETTE)
+    if TMDB_TRANSPORT == "replay":
+        return ReplayTransport(TMDB_CASSETTE, REPLAY_LATENCY_MS, REPLAY_LATENCY_JITTER_MS,
+                               REPLAY_ERROR_RATE, REPLAY_SEED)
+    return None
+
 # HTTP client with timeout
-http_client = httpx.AsyncClient(timeout=API_TIMEOUT)
+http_client = httpx.AsyncClient(timeout=API_TIMEOUT, transport=build_transport())
 
-# Genre cache
+# Genre caches per language; _genre_cache holds DEFAULT_LANGUAGE names
 _genre_cache = {"movies": [], "tv": []}
+_genre_caches = {DEFAULT_LANGUAGE: _genre_cache}
+
+class RequestWindow:
+    """Sliding-window counter of upstream requests for the TMDb rate budget"""
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self._timestamps = deque()
+
+    def _trim(self, now: float) -> None:
+        while self._timestamps and now - self._timestamps[0] >= self.window:
+            self._timestamps.popleft()
+
+    def count(self) -> int:
+        """Number of requests sent within the current window"""
+        self._trim(time.monotonic())
+        return len(self._timestamps)
+
+    def has_capacity(self) -> bool:
+        """Whether one more request fits in the current window"""
+        return self.count() < self.limit
+
+    def record(self) -> None:
+        """Record a request that is being sent now"""
+        self._timestamps.append(time.monotonic())
+
+    async def wait_for_capacity(self) -> None:
+        """Sleep until one more request fits in the current window"""
+        while not self.has_capacity():
+            await asyncio.sleep(max(0.01, self.window - (time.monotonic() - self._timestamps[0])))
+
+class LatencyTracker:
+    """Rolling latency samples per endpoint template"""
+
+    def __init__(self, max_samples: int = 200):
+        self.max_samples = max_samples
+        self._samples: Dict[str, deque] = {}
+
+    def observe(self, template: str, seconds: float) -> None:
+        samples = self._samples.get(template)
+        if samples is None:
+            samples = self._samples[template] = deque(maxlen=self.max_samples)
+        samples.append(seconds)
+
+    def percentile(self, template: str, percent: float) -> Optional[float]:
+        """Return the given latency percentile in seconds, or None without enough samples"""
+        samples = self._samples.get(template)
+        if not samples or len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(len(ordered) * percent / 100))
+        return ordered[index]
+
+    def summary(self) -> Dict[str, Dict]:
+        result = {}
+        for template, samples in self._samples.items():
+            ordered = sorted(samples)
+            result[template] = {
+                "samples": len(ordered),
+                "p50_ms": round(ordered[len(ordered) // 2] * 1000, 1),
+                "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 1)
+            }
+        return result
+
+_request_window = RequestWindow(RATE_LIMIT_REQUESTS, RATE_LIMIT_WINDOW)
+_latency_tracker = LatencyTracker()
+_http_metrics = {
+    "requests": 0,
+    "hedges": 0,
+    "hedge_wins": 0,
+    "hedges_skipped_budget": 0,
+    "hedges_skipped_cap": 0,
+    "cancelled": 0,
+    "deadline_exceeded": 0
+}
+
+def current_rss_bytes() -> Optional[int]:
+    """Resident set size of this process, or None where it cannot be read"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+def endpoint_template(endpoint: str) -> str:
+    """Collapse numeric IDs so /movie/603 and /movie/550 share statistics"""
+    return re.sub(r"/\d+", "/{id}", endpoint)
+
+def _hedge_delay(template: str) -> float:
+    """Seconds to wait on the primary request before sending a hedge"""
+    observed = _latency_tracker.percentile(template, HEDGE_PERCENTILE)
+    if observed is None:
+        return HEDGE_DEFAULT_DELAY_MS / 1000
+    return max(observed, HEDGE_MIN_DELAY_MS / 1000)
+
+def _may_hedge() -> bool:
+    """Check the hedge cap and the TMDb rate budget before sending a duplicate"""
+    if (_http_metrics["hedges"] + 1) * 100 > _http_metrics["requests"] * HEDGE_MAX_PERCENT:
+        _http_metrics["hedges_skipped_cap"] += 1
+        return False
+    if not _request_window.has_capacity():
+        _http_metrics["hedges_skipped_budget"] += 1
+        return False
+    return True
+
+async def _send_get(endpoint: str, url: str, params: Dict) -> httpx.Response:
+    """
+    Send a GET to TMDb, hedging slow requests when HEDGE_REQUESTS is enabled.
 
-async def make_tmdb_request(endpoint: str, params: Dict = None) -> Dict:
-    """Make a request to TMDb API with error handling"""
-    if not API_KEY:
+    A hedge is a single duplicate request fired once the primary has been
+    outstanding longer than the endpoint's observed latency percentile. The
+    first response wins and the other request is cancelled.
+    """
+    template = endpoint_template(endpoint)
+    _http_metrics["requests"] += 1
+    _request_window.record()
+    start = time.monotonic()
+
+    if not HEDGE_REQUESTS:
+        response = await http_client.get(url, params=params)
+        _latency_tracker.observe(template, time.monotonic() - start)
+        return response
+
+    primary = asyncio.ensure_future(http_client.get(url, params=params))
+    pending = {primary}
+    try:
+        done, _ = await asyncio.wait(pending, timeout=_hedge_delay(template))
+        if done or not _may_hedge():
+            response = await primary
+            _latency_tracker.observe(template, time.monotonic() - start)
+            return response
+
+        hedge = asyncio.ensure_future(http_client.get(url, params=params))
+        _http_metrics["hedges"] += 1
+        _request_window.record()
+        pending.add(hedge)
+
+        error = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.cancelled():
+                    # A cancelled request has neither a result nor an exception to read
+                    continue
+                if task.exception() is None:
+                    if task is hedge:
+                        _http_metrics["hedge_wins"] += 1
+                    _latency_tracker.observe(template, time.monotonic() - start)
+                    return task.result()
+                if error is None or task is primary:
+                    error = task.exception()
+        raise error or asyncio.CancelledError()
+    finally:
+        for task in pending:
+            task.cancel()
+
+# Compact cache records
+# Lists of these entities repeat across thousands of titles, so each distinct
+# entity is stored once in a shared table and records keep only its key.
+# Table entries are [key, entity, record count] and are dropped with their last record.
+SHARED_ENTITY_FIELDS = ("genres", "networks", "production_companies")
+COMPACT_MIN_COLD_BYTES = 256
+_shared_tables: Dict[str, Dict] = {field: {} for field in SHARED_ENTITY_FIELDS}
+
+def _intern_value(value):
+    """Intern short strings (dates, statuses, language codes) so duplicates share memory"""
+    if isinstance(value, str) and len(value) <= 32:
+        return sys.intern(value)
+    return value
+
+def _share_entity(field: str, item: Dict) -> tuple:
+    """Return the shared-table key for an entity, adding the entity if new"""
+    key = tuple(sorted(item.items()))
+    table = _shared_tables[field]
+    entry = table.get(key)
+    if entry is None:
+        # Keep the key object itself so every record references the same tuple
+        entry = table[key] = [key, {sys.intern(k): _intern_value(v) for k, v in item.items()}, 0]
+    entry[2] += 1
+    return entry[0]
+
+def _release_entity(field: str, key: tuple) -> None:
+    """Drop one record's reference to a shared entity, removing the entity with its last reference"""
+    table = _shared_tables[field]
+    entry = table.get(key)
+    if entry is not None:
+        entry[2] -= 1
+        if entry[2] <= 0:
+            del table[key]
+
+def _is_shareable(value) -> bool:
+    return isinstance(value, list) and all(
+        isinstance(item, dict) and "id" in item
+        and all(not isinstance(v, (dict, list)) for v in item.values())
+        for item in value)
+
+def deep_sizeof(obj, seen: Optional[set] = None) -> int:
+    """Approximate memory footprint of a JSON-like object tree in bytes"""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(deep_sizeof(v, seen) for v in obj)
+    return size
+
+class CompactRecord:
+    """
+    Cached TMDb response in compact form.
+
+    hot: top-level scalar fields with interned keys and short values
+    refs: shared-entity fields (genres, networks, ...) as tuples of table keys
+    cold: every other nested section as JSON, zlib-compressed when large,
+    decoded only when the record is read
+
+    Sizes are bookkeeping estimates that avoid walking the payload: raw_bytes
+    is the upstream body size when known, compact_bytes the encoded cold
+    section plus the flat hot fields.
+    """
+
+    __slots__ = ("hot", "refs", "cold", "compressed", "raw_bytes", "compact_bytes")
+
+    def __init__(self, data: Dict, raw_bytes: Optional[int] = None):
+        hot = {}
+        refs = {}
+        cold = {}
+        for key, value in data.items():
+            if isinstance(value, (dict, list)):
+                if key in _shared_tables and _is_shareable(value):
+                    refs[sys.intern(key)] = tuple(_share_entity(key, item) for item in value)
+                else:
+                    cold[key] = value
+            else:
+                hot[sys.intern(key)] = _intern_value(value)
+
+        self.hot = hot
+        self.refs = refs or None
+        encoded_bytes = 0
+        if cold:
+            encoded = json.dumps(cold, separators=(",", ":")).encode("utf-8")
+            encoded_bytes = len(encoded)
+            self.compressed = encoded_bytes >= COMPACT_MIN_COLD_BYTES
+            # Level 1 keeps compression cheap on the request path
+            self.cold = zlib.compress(encoded, 1) if self.compressed else encoded
+        else:
+            self.compressed = False
+            self.cold = None
+        hot_bytes = sys.getsizeof(hot) + sum(sys.getsizeof(v) for v in hot.values())
+        # Without the upstream body size, the JSON size of the record stands in for it
+        self.raw_bytes = raw_bytes if raw_bytes is not None else encoded_bytes + hot_bytes
+        # Shared tables are reported separately; only count the reference tuples here
+        self.compact_bytes = (sys.getsizeof(self) + hot_bytes + (len(self.cold) if self.cold else 0)
+                              + sum(sys.getsizeof(ids) for ids in refs.values()))
+
+    def to_dict(self) -> Dict:
+        data = dict(self.hot)
+        if self.refs:
+            for field, keys in self.refs.items():
+                table = _shared_tables[field]
+                data[field] = [dict(table[key][1]) for key in keys]
+        if self.cold is not None:
+            encoded = zlib.decompress(self.cold) if self.compressed else self.cold
+            data.update(json.loads(encoded))
+        return data
+
+    def release(self) -> None:
+        """Release the shared entities of a record leaving the cache"""
+        if self.refs:
+            for field, keys in self.refs.items():
+                for key in keys:
+                    _release_entity(field, key)
+            self.refs = None
+
+# Cached responses are indexed by the TMDb entities they contain so a change
+# feed can find them: the title or person in the path, plus the people credited.
+_ENTITY_PATH_PATTERN = re.compile(r"^/(movie|tv|person)/(\d+)(?:/|$)")
+
+def entity_refs(endpoint: str, data: Dict) -> set:
+    """(kind, id) pairs a cached response depends on; empty for list endpoints"""
+    match = _ENTITY_PATH_PATTERN.match(endpoint)
+    if match is None:
+        return set()
+    refs = {(match.group(1), int(match.group(2)))}
+    credits = data.get("credits") or {}
+    for person in (credits.get("cast") or []) + (credits.get("crew") or []) + (data.get("created_by") or []):
+        if person.get("id") is not None:
+            refs.add(("person", person["id"]))
+    return refs
+
+def cache_partition(endpoint: str) -> str:
+    """LRU partition of a cached endpoint: long-lived watch-provider data or everything else"""
+    return "watch_providers" if "/watch/providers" in endpoint else "default"
+
+class ResponseCache:
+    """
+    LRU store of the last successful response per endpoint and parameters, kept as compact records.
+
+    Entries are split into partitions (see cache_partition), each evicting
+    independently within its own budget: max_entries for "default", and the
+    sizes given in `reserved` for the others.
+    """
+
+    def __init__(self, max_entries: int, reserved: Optional[Dict[str, int]] = None):
+        self.max_entries = max_entries
+        self._budgets = dict(reserved or {}, default=max_entries)
+        self._partitions: Dict[str, "OrderedDict[tuple, tuple]"] = {name: OrderedDict() for name in self._budgets}
+        self._namespaces: Dict[str, Dict[str, int]] = {}
+        self._refs: Dict[tuple, set] = {}
+        self._by_entity: Dict[tuple, set] = {}
+        # Expired entries are no longer served fresh but stay as last-known-good
+        self._expired: set = set()
+
+    @staticmethod
+    def make_key(endpoint: str, params: Dict) -> tuple:
+        return (endpoint, tuple(sorted((k, str(v)) for k, v in params.items() if k != "api_key")))
+
+    def _partition(self, key: tuple) -> str:
+        name = cache_partition(key[0])
+        return name if name in self._partitions else "default"
+
+    def _account(self, key: tuple, record: CompactRecord, sign: int) -> None:
+        stats = self._namespaces.setdefault(endpoint_class(key[0]),
+                                            {"entries": 0, "raw_bytes": 0, "compact_bytes": 0})
+        stats["entries"] += sign
+        stats["raw_bytes"] += sign * record.raw_bytes
+        stats["compact_bytes"] += sign * record.compact_bytes
+
+    def _index(self, key: tuple, refs: set) -> None:
+        if refs:
+            self._refs[key] = refs
+        for ref in refs:
+            self._by_entity.setdefault(ref, set()).add(key)
+
+    def _unindex(self, key: tuple) -> None:
+        self._expired.discard(key)
+        for ref in self._refs.pop(key, ()):
+            keys = self._by_entity.get(ref)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_entity[ref]
+
+    def get(self, key: tuple, max_age: Optional[float] = None) -> Optional[tuple]:
+        """Return (data, age in seconds) for a key, or None if missing, expired or older than max_age"""
+        entries = self._partitions[self._partition(key)]
+        entry = entries.get(key)
+        if entry is None:
+            return None
+        stored_at, record = entry
+        age = time.monotonic() - stored_at
+        if max_age is not None and (age > max_age or key in self._expired):
+            return None
+        entries.move_to_end(key)
+        return record.to_dict(), age
+
+    def set(self, key: tuple, data: Dict, raw_bytes: Optional[int] = None) -> None:
+        record = CompactRecord(data, raw_bytes)
+        partition = self._partition(key)
+        entries = self._partitions[partition]
+        previous = entries.pop(key, None)
+        if previous is not None:
+            self._account(key, previous[1], -1)
+            self._unindex(key)
+            previous[1].release()
+        entries[key] = (time.monotonic(), record)
+        self._account(key, record, 1)
+        self._index(key, entity_refs(key[0], data))
+        while len(entries) > self._budgets[partition]:
+            evicted_key, (_, evicted) = entries.popitem(last=False)
+            self._account(evicted_key, evicted, -1)
+            self._unindex(evicted_key)
+            evicted.release()
+
+    def keys_for(self, kind: str, entity_ids) -> set:
+        """Cache keys of responses that contain any of the given entities"""
+        keys = set()
+        for entity_id in entity_ids:
+            keys.update(self._by_entity.get((kind, entity_id), ()))
+        return keys
+
+    def keys_of_kind(self, kind: str) -> set:
+        """Cache keys of every response indexed under an entity of this kind"""
+        return {key for ref, keys in self._by_entity.items() if ref[0] == kind for key in keys}
+
+    def expire(self, keys) -> int:
+        """Stop serving entries fresh; they remain available as stale fallbacks. Returns how many were live."""
+        expired = 0
+        for key in keys:
+            if key in self._partitions[self._partition(key)] and key not in self._expired:
+                self._expired.add(key)
+                expired += 1
+        return expired
+
+    def memory_report(self) -> Dict:
+        """Raw vs compact size per namespace, plus the shared entity tables"""
+        namespaces = {}
+        for name, stats in sorted(self._namespaces.items()):
+            if not stats["entries"]:
+                continue
+            raw, compact = stats["raw_bytes"], stats["compact_bytes"]
+            namespaces[name] = dict(stats, saved_bytes=raw - compact,
+                                    compact_ratio=round(compact / raw, 3) if raw else 0.0)
         return {
-            "success": False,
-            "error": "TMDb API key not configured. Please set TMDB_API_KEY environment variable.",
-            "setup_url": "https://www.themoviedb.org/settings/api"
+            "entries": len(self),
+            "partitions": {name: {"entries": len(entries), "max_entries": self._budgets[name]}
+                           for name, entries in self._partitions.items()},
+            "expired_entries": len(self._expired),
+            "indexed_entities": len(self._by_entity),
+            "namespaces": namespaces,
+            "shared_tables": {field: {"entities": len(table), "bytes": deep_sizeof(table)}
+                              for field, table in _shared_tables.items()}
         }
 
-    if params is None:
-        params = {}
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._partitions.values())
 
-    params.update({
-        "api_key": API_KEY,
-        "language": DEFAULT_LANGUAGE,
-        "include_adult": INCLUDE_ADULT
-    })
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one class of TMDb endpoints.
+
+    closed: requests flow normally.
+    open: requests fail fast until CIRCUIT_RESET_SECONDS have passed.
+    half_open: a single probe request is let through; success closes the
+    circuit, failure re-opens it.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_seconds: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.times_opened = 0
+        self.fast_failures = 0
+
+    def retry_after(self) -> float:
+        return max(0.0, self.reset_seconds - (time.monotonic() - self.opened_at))
+
+    def allow_request(self) -> tuple:
+        """
+        (allowed, probe): whether a request may be sent, and whether it is the
+        half-open probe, whose holder must call release_probe() when it ends
+        """
+        if self.state == "open" and self.retry_after() <= 0:
+            self.state = "half_open"
+        if self.state == "closed":
+            return True, False
+        if self.state == "half_open" and not self.probe_in_flight:
+            self.probe_in_flight = True
+            return True, True
+        self.fast_failures += 1
+        return False, False
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                self.times_opened += 1
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def release_probe(self) -> None:
+        """Free the half-open probe slot once the probe request has ended"""
+        self.probe_in_flight = False
+
+    def summary(self) -> Dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "times_opened": self.times_opened,
+            "fast_failures": self.fast_failures,
+            "retry_after_seconds": round(self.retry_after(), 1) if self.state == "open" else 0
+        }
 
+_response_cache = ResponseCache(RESPONSE_CACHE_MAX_ENTRIES, {"watch_providers": WATCH_PROVIDERS_CACHE_MAX_ENTRIES})
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+
+def endpoint_class(endpoint: str) -> str:
+    """Group endpoints by their first path segment (movie, tv, search, discover, ...)"""
+    return endpoint.strip("/").split("/", 1)[0] or "root"
+
+def _get_circuit_breaker(endpoint: str) -> CircuitBreaker:
+    name = endpoint_class(endpoint)
+    breaker = _circuit_breakers.get(name)
+    if breaker is None:
+        breaker = _circuit_breakers[name] = CircuitBreaker(name, CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_SECONDS)
+    return breaker
+
+def _stale_response(data: Dict, age: float) -> Dict:
+    """Mark a cached response as served stale"""
+    stale = dict(data)
+    stale["stale"] = True
+    stale["stale_age_seconds"] = round(age, 1)
+    return stale
+
+def with_freshness(payload: Dict, result: Dict) -> Dict:
+    """Carry the stale or snapshot marker of an upstream result over to a tool response"""
+    if result.get("stale"):
+        payload["stale"] = True
+        payload["stale_age_seconds"] = result.get("stale_age_seconds")
+    if result.get("snapshot_fetched_at"):
+        payload["source"] = "snapshot"
+        payload["snapshot_fetched_at"] = result["snapshot_fetched_at"]
+    return payload
+
+async def _fetch_tmdb(endpoint: str, params: Dict) -> tuple:
+    """
+    Perform the upstream GET and translate the outcome.
+
+    Returns (result dict, upstream_failed, body size in bytes) where
+    upstream_failed is True for timeouts, network errors and 5xx responses -
+    the failures that count towards the endpoint's circuit breaker.
+    """
     try:
         url = f"{TMDB_BASE_URL}{endpoint}"
-        response = await http_client.get(url, params=params)
+        with span("upstream " + endpoint_template(endpoint)):
+            response = await _send_get(endpoint, url, params)
 
         if response.status_code == 401:
             return {
                 "success": False,
                 "error": "Invalid TMDb API key. Please check your API key configuration.",
                 "setup_url": "https://www.themoviedb.org/settings/api"
-            }
+            }, False, 0
         elif response.status_code == 404:
             return {
                 "success": False,
-                "error": "Resource not found. Please check the ID or search parameters."
-            }
+                "error": "Resource not found. Please check the ID or search parameters.",
+                "not_found": True
+            }, False, 0
         elif response.status_code == 422:
             return {
                 "success": False,
                 "error": "Invalid parameters provided to the API."
-            }
+            }, False, 0
         elif response.status_code == 429:
             return {
                 "success": False,
                 "error": "Rate limit exceeded. Please wait before making more requests.",
                 "rate_limit": "40 requests per 10 seconds"
-            }
+            }, False, 0
         elif response.status_code >= 500:
             return {
                 "success": False,
                 "error": "TMDb server error. Please try again later."
-            }
+            }, True, 0
 
         response.raise_for_status()
-        data = response.json()
+        with span("decode"):
+            data = response.json()
         data["success"] = True
-        return data
+        return data, False, len(response.content)
 
     except httpx.TimeoutException:
         return {
             "success": False,
             "error": f"Request timeout after {API_TIMEOUT} seconds. Please try again."
-        }
+        }, True, 0
     except httpx.RequestError as e:
         return {
             "success": False,
             "error": f"Network error: {str(e)}"
-        }
+        }, True, 0
     except Exception as e:
         return {
             "success": False,
             "error": f"Unexpected error: {str(e)}"
+        }, False, 0
+
+def _deadline_response(cache_key: tuple) -> Dict:
+    """Answer a request whose deadline has passed, preferring cached data over an error"""
+    _http_metrics["deadline_exceeded"] += 1
+    cached = _response_cache.get(cache_key)
+    if cached is not None:
+        return _stale_response(*cached)
+    return {
+        "success": False,
+        "error": "Deadline exceeded before TMDb responded.",
+        "deadline_exceeded": True
+    }
+
+async def make_tmdb_request(endpoint: str, params: Dict = None, cache_ttl: Optional[float] = None,
+                            wait_for_budget: bool = False) -> Dict:
+    """
+    Make a request to TMDb API with error handling.
+
+    Requests go through a circuit breaker per endpoint class. While a circuit
+    is open, or when the upstream fails, the last successful response for the
+    same request is served with `stale: true` if one is available. Inside a
+    tool call with `deadline_ms`, the request is bounded by the time left.
+
+    Args:
+        endpoint: API path such as "/movie/603"
+        params: Query parameters (api_key and include_adult are added, language unless given)
+        cache_ttl: Serve a cached response younger than this many seconds instead of calling TMDb
+        wait_for_budget: Sleep until the 40-per-10s window has room before sending (for fan-outs)
+    """
+    if not API_KEY:
+        return {
+            "success": False,
+            "error": "TMDb API key not configured. Please set TMDB_API_KEY environment variable.",
+            "setup_url": "https://www.themoviedb.org/settings/api"
+        }
+
+    if params is None:
+        params = {}
+
+    params.update({
+        "api_key": API_KEY,
+        "include_adult": INCLUDE_ADULT
+    })
+    params.setdefault("language", current_language())
+
+    cache_key = ResponseCache.make_key(endpoint, params)
+    if cache_ttl is not None:
+        cached = _response_cache.get(cache_key, max_age=cache_ttl)
+        if cached is not None:
+            return cached[0]
+
+    remaining = deadline_remaining()
+    if wait_for_budget:
+        try:
+            await asyncio.wait_for(_request_window.wait_for_capacity(), remaining)
+        except asyncio.TimeoutError:
+            return _deadline_response(cache_key)
+        remaining = deadline_remaining()
+
+    if remaining is not None and remaining <= 0:
+        return _deadline_response(cache_key)
+
+    breaker = _get_circuit_breaker(endpoint)
+
+    allowed, probe = breaker.allow_request()
+    if not allowed:
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            return _stale_response(*cached)
+        return {
+            "success": False,
+            "error": "TMDb is temporarily unavailable. Please try again later.",
+            "circuit": "open",
+            "retry_after_seconds": round(breaker.retry_after(), 1)
         }
 
+    try:
+        # Cancellation (client cancel or deadline) propagates into httpx, which
+        # aborts the in-flight request and frees its connection
+        result, upstream_failed, body_bytes = await asyncio.wait_for(_fetch_tmdb(endpoint, params), remaining)
+    except asyncio.TimeoutError:
+        return _deadline_response(cache_key)
+    except asyncio.CancelledError:
+        _http_metrics["cancelled"] += 1
+        raise
+    finally:
+        if probe:
+            breaker.release_probe()
+
+    if upstream_failed:
+        breaker.record_failure()
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            return _stale_response(*cached)
+        return result
+
+    breaker.record_success()
+    if result.get("success"):
+        _response_cache.set(cache_key, result, body_bytes)
+        if params.get("language") == DEFAULT_LANGUAGE:
+            with span("plot_index"):
+                _plot_index.observe(endpoint, result)
+    return result
+
 def construct_image_urls(path: Optional[str], image_type: str = "poster") -> Dict[str, Optional[str]]:
     """Construct image URLs for different sizes"""
     if not path:
@@ -116,24 +1191,42 @@ def construct_image_urls(path: Optional[str], image_type: str = "poster") -> Dic
     return {size: f"{TMDB_IMAGE_BASE_URL}{size}{path}" for size in sizes}
 
 async def get_genres() -> Dict[str, List[Dict]]:
-    """Get and cache genre lists for movies and TV shows"""
-    global _genre_cache
+    """Get and cache genre lists for movies and TV shows in the current language"""
+    cache = _genre_caches.setdefault(current_language(), {"movies": [], "tv": []})
+
+    if cache["movies"] and cache["tv"]:
+        return cache
 
-    if not _genre_cache["movies"]:
+    with span("genre_load"):
+        return await _load_genres(cache)
+
+async def _load_genres(cache: Dict[str, List[Dict]]) -> Dict[str, List[Dict]]:
+    """Fetch whichever genre lists are not cached yet"""
+    if not cache["movies"]:
         movie_genres = await make_tmdb_request("/genre/movie/list")
         if movie_genres.get("success"):
-            _genre_cache["movies"] = movie_genres.get("genres", [])
+            cache["movies"] = movie_genres.get("genres", [])
 
-    if not _genre_cache["tv"]:
+    if not cache["tv"]:
         tv_genres = await make_tmdb_request("/genre/tv/list")
         if tv_genres.get("success"):
-            _genre_cache["tv"] = tv_genres.get("genres", [])
+            cache["tv"] = tv_genres.get("genres", [])
+
+    return cache
 
-    return _genre_cache
+def genre_names(content_type: str = "movie") -> Dict[int, str]:
+    """Genre ID -> name in the current language, falling back to DEFAULT_LANGUAGE names"""
+    key = content_type + "s" if content_type == "movie" else content_type
+    names = {genre["id"]: genre["name"] for genre in _genre_cache.get(key, [])}
+    language = current_language()
+    if language != DEFAULT_LANGUAGE:
+        names.update((genre["id"], genre["name"]) for genre in _genre_caches.get(language, {}).get(key, [])
+                     if genre.get("name"))
+    return names
 
 def map_genre_ids_to_names(genre_ids: List[int], content_type: str = "movie") -> List[str]:
     """Convert genre IDs to genre names"""
-    genre_map = {genre["id"]: genre["name"] for genre in _genre_cache.get(content_type + "s", [])}
+    genre_map = genre_names(content_type)
     return [genre_map.get(gid, f"Unknown ({gid})") for gid in genre_ids]
 
 def format_movie_result(movie: Dict) -> Dict:
@@ -174,8 +1267,320 @@ def format_tv_result(show: Dict) -> Dict:
         "tmdb_url": f"https://www.themoviedb.org/tv/{show.get('id')}"
     }
 
+def format_person_result(person: Dict) -> Dict:
+    """Format person data with profile image URLs and the titles they are known for"""
+    known_for = []
+    for item in person.get("known_for", []):
+        media_type = item.get("media_type")
+        known_for.append({
+            "id": item.get("id"),
+            "media_type": media_type,
+            "title": item.get("title") if media_type == "movie" else item.get("name")
+        })
+
+    return {
+        "id": person.get("id"),
+        "name": person.get("name"),
+        "known_for_department": person.get("known_for_department"),
+        "popularity": person.get("popularity"),
+        "adult": person.get("adult", False),
+        "profile_urls": construct_image_urls(person.get("profile_path"), "profile"),
+        "known_for": known_for,
+        "tmdb_url": f"https://www.themoviedb.org/person/{person.get('id')}"
+    }
+
+# List snapshots for delta polling
+class ListSnapshots:
+    """
+    Recent versions of polled result lists (trending, discover).
+
+    A version is the ordered list of IDs on the page, identified by a token
+    "<list>-<version>". Clients send the token of their previous response
+    and get only what entered, exited or moved since. The last
+    LIST_SNAPSHOT_VERSIONS versions are kept per list, and the least recently
+    polled lists are dropped beyond LIST_SNAPSHOT_MAX_LISTS.
+    """
+
+    def __init__(self, max_lists: int, versions: int):
+        self.max_lists = max_lists
+        self.versions = versions
+        self._lists: "OrderedDict[str, OrderedDict]" = OrderedDict()
+
+    @staticmethod
+    def list_id(endpoint: str, params: Dict) -> str:
+        return hashlib.sha1(repr(ResponseCache.make_key(endpoint, params)).encode()).hexdigest()[:12]
+
+    def record(self, list_id: str, rows: List[Dict]) -> str:
+        """Store the current version of a list and return its token"""
+        ids = tuple(row.get("id") for row in rows)
+        version = hashlib.sha1(repr(ids).encode()).hexdigest()[:12]
+        versions = self._lists.pop(list_id, None) or OrderedDict()
+        self._lists[list_id] = versions
+        versions.pop(version, None)
+        versions[version] = (ids, {row.get("id"): row.get("title") or row.get("name") for row in rows})
+        while len(versions) > self.versions:
+            versions.popitem(last=False)
+        while len(self._lists) > self.max_lists:
+            self._lists.popitem(last=False)
+        return f"{list_id}-{version}"
+
+    def get(self, list_id: str, token: str) -> Optional[tuple]:
+        """(ids, titles) of an earlier version of this list, or None if the token is unknown or expired"""
+        token_list, _, version = token.partition("-")
+        if token_list != list_id:
+            return None
+        return self._lists.get(list_id, {}).get(version)
+
+_list_snapshots = ListSnapshots(LIST_SNAPSHOT_MAX_LISTS, LIST_SNAPSHOT_VERSIONS)
+
+def list_response(payload: Dict, rows: List[Dict], format_row, endpoint: str, params: Dict,
+                  since: Optional[str]) -> Dict:
+    """
+    Complete a list payload with its version token, and with either every row
+    formatted or, when `since` names a known earlier version, only the changes.
+    """
+    list_id = ListSnapshots.list_id(endpoint, params)
+    previous = _list_snapshots.get(list_id, since) if since else None
+    token = _list_snapshots.record(list_id, rows)
+    payload["version"] = token
+
+    if previous is None:
+        if since:
+            payload["delta"] = False
+            payload["delta_unavailable"] = "Unknown or expired version; full results returned."
+        payload["results"] = [format_row(row) for row in rows]
+        return payload
+
+    previous_ids, previous_titles = previous
+    previous_rank = {item_id: rank for rank, item_id in enumerate(previous_ids, 1)}
+    entered, moved = [], []
+    for rank, row in enumerate(rows, 1):
+        item_id = row.get("id")
+        if item_id not in previous_rank:
+            entered.append(dict(format_row(row), rank=rank))
+        elif previous_rank[item_id] != rank:
+            moved.append({"id": item_id, "title": row.get("title") or row.get("name"),
+                          "rank": rank, "previous_rank": previous_rank[item_id]})
+    current = {row.get("id") for row in rows}
+    exited = [{"id": item_id, "title": previous_titles.get(item_id), "previous_rank": rank}
+              for item_id, rank in previous_rank.items() if item_id not in current]
+
+    payload.update({
+        "delta": True,
+        "since": since,
+        "unchanged": not (entered or exited or moved),
+        "entered": entered,
+        "exited": exited,
+        "moved": moved
+    })
+    return payload
+
+# Localized details
+# Only these fields differ between locales; everything else in a details
+# response (IDs, numbers, dates, credits, image paths) is shared.
+LOCALIZED_FIELDS = {"movie": ("title", "overview", "tagline"), "tv": ("name", "overview", "tagline")}
+
+MOVIE_DETAILS_APPEND = "credits,production_companies,production_countries,spoken_languages"
+TV_DETAILS_APPEND = "credits,content_ratings"
+
+async def fetch_details(content_type: str, item_id: int, append_to_response: str) -> Dict:
+    """
+    Fetch a details response, with every locale's translations attached for non-default languages.
+
+    The language-independent details are always requested in DEFAULT_LANGUAGE,
+    so every language shares one cache entry for them. Other languages add the
+    title's /translations request, cached separately under a single key too,
+    which carries the localized text of every locale.
+    With CATALOG_SERVE enabled, a current row of the local snapshot is used first.
+    """
+    localized = current_language() != DEFAULT_LANGUAGE
+    cache_ttl = DETAILS_CACHE_TTL or None
+    details = None
+    if CATALOG_SERVE:
+        snapshot = await asyncio.to_thread(_catalog.get_title, content_type, item_id)
+        if snapshot is not None and (not localized or "translations" in snapshot):
+            return snapshot
+        details = snapshot
+
+    if details is None:
+        details_request = make_tmdb_request(f"/{content_type}/{item_id}",
+                                            {"append_to_response": append_to_response, "language": DEFAULT_LANGUAGE},
+                                            cache_ttl=cache_ttl)
+        if not localized:
+            return await details_request
+    translations_request = make_tmdb_request(f"/{content_type}/{item_id}/translations",
+                                             {"language": DEFAULT_LANGUAGE}, cache_ttl=cache_ttl)
+    if details is None:
+        details, translations = await asyncio.gather(details_request, translations_request)
+    else:
+        translations = await translations_request
+
+    if details.get("success") and translations.get("success"):
+        # Without translations, localize_details serves DEFAULT_LANGUAGE text and reports the fallback
+        details = dict(details, translations={"translations": translations.get("translations", [])})
+    return details
+
+def localize_details(data: Dict, content_type: str, language: str) -> tuple:
+    """
+    Overlay the localized text for a language on a DEFAULT_LANGUAGE details response.
+
+    Returns (localized copy, fields that fell back to DEFAULT_LANGUAGE). A
+    translation for the exact region is preferred over another region of the
+    same language.
+    """
+    code, _, region = language.partition("-")
+    translations = [t for t in (data.get("translations") or {}).get("translations", [])
+                    if t.get("iso_639_1") == code]
+    translations.sort(key=lambda t: t.get("iso_3166_1") != region)
+    text = translations[0].get("data", {}) if translations else {}
+
+    localized = dict(data)
+    fallback = []
+    for field in LOCALIZED_FIELDS[content_type]:
+        if text.get(field):
+            localized[field] = text[field]
+        elif data.get(field):
+            fallback.append(field)
+    return localized, fallback
+
+def with_language_info(payload: Dict, language: str, fallback: List[str]) -> Dict:
+    """Record the response language and any fields served in DEFAULT_LANGUAGE instead"""
+    if language != DEFAULT_LANGUAGE:
+        payload["language"] = language
+        if fallback:
+            payload["translation_fallback"] = fallback
+    return payload
+
+# Credits processing
+# Buckets are checked in order and the first keyword match wins, so a job such
+# as "Story Director" is only ever counted once (as a director).
+MOVIE_CREW_BUCKETS = (
+    ("directors", ("director",)),
+    ("writers", ("writer", "screenplay", "story")),
+    ("producers", ("producer",)),
+)
+TV_CREW_BUCKETS = MOVIE_CREW_BUCKETS
+
+# Role tables: bucket definitions -> {job title -> bucket name or None}.
+# TMDb uses a few hundred distinct job titles, so each table stays small and
+# every crew row costs a single dict lookup after the first sighting of its job.
+_role_tables: Dict[tuple, Dict[str, Optional[str]]] = {}
+
+def _get_role_table(buckets: tuple) -> Dict[str, Optional[str]]:
+    """Get the job -> bucket lookup table for a bucket definition"""
+    table = _role_tables.get(buckets)
+    if table is None:
+        table = _role_tables[buckets] = {}
+    return table
+
+def _classify_job(job: str, buckets: tuple, table: Dict[str, Optional[str]]) -> Optional[str]:
+    """Map a crew job to its bucket, memoizing the result in the role table"""
+    try:
+        return table[job]
+    except KeyError:
+        pass
+
+    lowered = job.lower()
+    bucket = None
+    for name, keywords in buckets:
+        if any(keyword in lowered for keyword in keywords):
+            bucket = name
+            break
+
+    table[job] = bucket
+    return bucket
+
+def process_credits(credits: Optional[Dict], cast_limit: Optional[int] = 10,
+                    crew_buckets: tuple = MOVIE_CREW_BUCKETS,
+                    crew_limit: Optional[int] = None) -> Dict:
+    """
+    Format cast and key crew from a TMDb credits payload in a single pass.
+
+    Crew rows are classified before any output is built, so people outside the
+    requested buckets cost one dict lookup. People credited with several jobs in
+    the same bucket are merged into one entry with a `jobs` list. Cast members
+    playing several characters are merged the same way.
+
+    Args:
+        credits: The `credits` object from a movie or TV details response
+        cast_limit: Maximum number of distinct cast members (None for all)
+        crew_buckets: Ordered (bucket name, job keywords) pairs
+        crew_limit: Maximum number of people per crew bucket (None for all)
+
+    Returns:
+        Dict with `cast` (list) and `crew` (bucket name -> list)
+    """
+    credits = credits or {}
+
+    cast = []
+    cast_by_id = {}
+    for actor in credits.get("cast") or []:
+        person_id = actor.get("id")
+        existing = cast_by_id.get(person_id) if person_id is not None else None
+        if existing is not None:
+            character = actor.get("character")
+            if character and character not in existing["characters"]:
+                existing["characters"].append(character)
+            continue
+
+        if cast_limit is not None and len(cast) >= cast_limit:
+            # Entries are ordered by billing, so later rows can only be merges
+            continue
+
+        character = actor.get("character")
+        entry = {
+            "id": person_id,
+            "name": actor.get("name"),
+            "character": character,
+            "characters": [character] if character else [],
+            "profile_urls": construct_image_urls(actor.get("profile_path"), "profile"),
+            "order": actor.get("order")
+        }
+        cast.append(entry)
+        if person_id is not None:
+            cast_by_id[person_id] = entry
+
+    crew = {name: [] for name, _ in crew_buckets}
+    if crew_buckets:
+        table = _get_role_table(crew_buckets)
+        seen = {name: {} for name, _ in crew_buckets}
+        for person in credits.get("crew") or []:
+            job = person.get("job") or ""
+            bucket = _classify_job(job, crew_buckets, table)
+            if bucket is None:
+                continue
+
+            person_id = person.get("id")
+            members = seen[bucket]
+            existing = members.get(person_id) if person_id is not None else None
+            if existing is not None:
+                if job not in existing["jobs"]:
+                    existing["jobs"].append(job)
+                continue
+
+            if crew_limit is not None and len(crew[bucket]) >= crew_limit:
+                continue
+
+            crew_member = {
+                "id": person_id,
+                "name": person.get("name"),
+                "job": job,
+                "jobs": [job],
+                "profile_urls": construct_image_urls(person.get("profile_path"), "profile")
+            }
+            crew[bucket].append(crew_member)
+            if person_id is not None:
+                members[person_id] = crew_member
+
+    return {"cast": cast, "crew": crew}
+
 @mcp.tool()
-async def search_movies(ctx: Context, query: str, year: Optional[int] = None, page: int = 1) -> str:
+@traced
+@with_deadline
+@with_language
+async def search_movies(ctx: Context, query: str, year: Optional[int] = None, page: int = 1,
+                        language: Optional[str] = None,
+                        deadline_ms: Optional[int] = None) -> str:
     """
     Search for movies by title with optional year filtering.
 
@@ -183,6 +1588,8 @@ async def search_movies(ctx: Context, query: str, year: Optional[int] = None, pa
         query: Movie title to search for (required)
         year: Release year to filter by (optional)
         page: Page number for pagination (default: 1)
+        language: Response language such as "de-DE" (optional)
+        deadline_ms: Time budget in milliseconds; once it runs out, a stale cached copy or a deadline_exceeded error is returned (optional)
 
     Returns:
         JSON string with movie search results including titles, release dates, overviews, ratings, and image URLs
@@ -201,20 +1608,20 @@ async def search_movies(ctx: Context, query: str, year: Optional[int] = None, pa
     result = await make_tmdb_request("/search/movie", params)
 
     if not result.get("success"):
-        return json.dumps(result, indent=2)
+        return respond(result)
 
     if not result.get("results"):
-        return json.dumps({
+        return respond({
             "success": True,
             "message": f"No movies found for '{query}'" + (f" in {year}" if year else ""),
             "suggestion": "Try different keywords or check spelling",
             "total_results": 0,
             "results": []
-        }, indent=2)
+        })
 
     formatted_results = [format_movie_result(movie) for movie in result["results"]]
 
-    return json.dumps({
+    return respond(with_freshness({
         "success": True,
         "query": query,
         "year": year,
@@ -222,10 +1629,15 @@ async def search_movies(ctx: Context, query: str, year: Optional[int] = None, pa
         "total_results": result.get("total_results", 0),
         "total_pages": result.get("total_pages", 0),
         "results": formatted_results
-    }, indent=2)
+    }, result))
 
 @mcp.tool()
-async def search_tv_shows(ctx: Context, query: str, first_air_date_year: Optional[int] = None, page: int = 1) -> str:
+@traced
+@with_deadline
+@with_language
+async def search_tv_shows(ctx: Context, query: str, first_air_date_year: Optional[int] = None, page: int = 1,
+                          language: Optional[str] = None,
+                          deadline_ms: Optional[int] = None) -> str:
     """
     Search for TV shows by name with optional year filtering.
 
@@ -233,6 +1645,8 @@ async def search_tv_shows(ctx: Context, query: str, first_air_date_year: Optiona
         query: TV show name to search for (required)
         first_air_date_year: First air date year to filter by (optional)
         page: Page number for pagination (default: 1)
+        language: Response language such as "de-DE" (optional)
+        deadline_ms: Time budget in milliseconds; once it runs out, a stale cached copy or a deadline_exceeded error is returned (optional)
 
     Returns:
         JSON string with TV show search results including names, air dates, overviews, ratings, and image URLs
@@ -251,20 +1665,20 @@ async def search_tv_shows(ctx: Context, query: str, first_air_date_year: Optiona
     result = await make_tmdb_request("/search/tv", params)
 
     if not result.get("success"):
-        return json.dumps(result, indent=2)
+        return respond(result)
 
     if not result.get("results"):
-        return json.dumps({
+        return respond({
             "success": True,
             "message": f"No TV shows found for '{query}'" + (f" from {first_air_date_year}" if first_air_date_year else ""),
             "suggestion": "Try different keywords or check spelling",
             "total_results": 0,
             "results": []
-        }, indent=2)
+        })
 
     formatted_results = [format_tv_result(show) for show in result["results"]]
 
-    return json.dumps({
+    return respond(with_freshness({
         "success": True,
         "query": query,
         "first_air_date_year": first_air_date_year,
@@ -272,15 +1686,23 @@ async def search_tv_shows(ctx: Context, query: str, first_air_date_year: Optiona
         "total_results": result.get("total_results", 0),
         "total_pages": result.get("total_pages", 0),
         "results": formatted_results
-    }, indent=2)
+    }, result))
 
 @mcp.tool()
-async def get_movie_details(ctx: Context, movie_id: int) -> str:
+@traced
+@with_deadline
+@with_language
+async def get_movie_details(ctx: Context, movie_id: int, crew_limit: Optional[int] = None,
+                            language: Optional[str] = None,
+                            deadline_ms: Optional[int] = None) -> str:
     """
     Get detailed information about a specific movie including cast, crew, and production details.
 
     Args:
         movie_id: TMDb movie ID (required)
+        crew_limit: Maximum number of people per crew role (optional, default: all)
+        language: Response language such as "de-DE"; untranslated text is served in DEFAULT_LANGUAGE and listed in translation_fallback (optional)
+        deadline_ms: Time budget in milliseconds; once it runs out, a stale cached copy or a deadline_exceeded error is returned (optional)
 
     Returns:
         JSON string with complete movie information including cast, crew, genres, runtime, budget, revenue
@@ -289,44 +1711,25 @@ async def get_movie_details(ctx: Context, movie_id: int) -> str:
     await get_genres()
 
     # Get movie details with additional data
-    result = await make_tmdb_request(f"/movie/{movie_id}", {"append_to_response": "credits,production_companies,production_countries,spoken_languages"})
+    result = await fetch_details("movie", movie_id, MOVIE_DETAILS_APPEND)
 
     if not result.get("success"):
-        return json.dumps(result, indent=2)
+        return respond(result)
 
-    # Format cast (top 10)
-    cast = []
-    if result.get("credits", {}).get("cast"):
-        for actor in result["credits"]["cast"][:10]:
-            cast.append({
-                "id": actor.get("id"),
-                "name": actor.get("name"),
-                "character": actor.get("character"),
-                "profile_urls": construct_image_urls(actor.get("profile_path"), "profile"),
-                "order": actor.get("order")
-            })
+    language = current_language()
+    fallback = []
+    if language != DEFAULT_LANGUAGE:
+        result, fallback = localize_details(result, "movie", language)
 
-    # Format crew (key roles)
-    crew = {"directors": [], "writers": [], "producers": []}
-    if result.get("credits", {}).get("crew"):
-        for person in result["credits"]["crew"]:
-            job = person.get("job", "").lower()
-            crew_member = {
-                "id": person.get("id"),
-                "name": person.get("name"),
-                "job": person.get("job"),
-                "profile_urls": construct_image_urls(person.get("profile_path"), "profile")
-            }
-
-            if "director" in job:
-                crew["directors"].append(crew_member)
-            elif any(role in job for role in ["writer", "screenplay", "story"]):
-                crew["writers"].append(crew_member)
-            elif "producer" in job:
-                crew["producers"].append(crew_member)
+    # Format cast (top 10) and crew (key roles)
+    credits = process_credits(result.get("credits"), cast_limit=10,
+                              crew_buckets=MOVIE_CREW_BUCKETS, crew_limit=crew_limit)
+    cast = credits["cast"]
+    crew = credits["crew"]
 
     # Format genres
-    genres = [{"id": g.get("id"), "name": g.get("name")} for g in result.get("genres", [])]
+    names = genre_names("movie")
+    genres = [{"id": g.get("id"), "name": names.get(g.get("id"), g.get("name"))} for g in result.get("genres", [])]
 
     # Format production companies
     production_companies = [{"id": pc.get("id"), "name": pc.get("name"), "origin_country": pc.get("origin_country")}
@@ -360,15 +1763,23 @@ async def get_movie_details(ctx: Context, movie_id: int) -> str:
         "imdb_id": result.get("imdb_id")
     }
 
-    return json.dumps(formatted_result, indent=2)
+    return respond(with_freshness(with_language_info(formatted_result, language, fallback), result))
 
 @mcp.tool()
-async def get_tv_show_details(ctx: Context, tv_id: int) -> str:
+@traced
+@with_deadline
+@with_language
+async def get_tv_show_details(ctx: Context, tv_id: int, crew_limit: Optional[int] = None,
+                              language: Optional[str] = None,
+                              deadline_ms: Optional[int] = None) -> str:
     """
-    Get detailed information about a specific TV show including cast, seasons, and network details.
+    Get detailed information about a specific TV show including cast, crew, seasons, and network details.
 
     Args:
         tv_id: TMDb TV show ID (required)
+        crew_limit: Maximum number of people per crew role (optional, default: all)
+        language: Response language such as "de-DE"; untranslated text is served in DEFAULT_LANGUAGE and listed in translation_fallback (optional)
+        deadline_ms: Time budget in milliseconds; once it runs out, a stale cached copy or a deadline_exceeded error is returned (optional)
 
     Returns:
         JSON string with complete TV show information including cast, seasons, networks, creators
@@ -377,22 +1788,21 @@ async def get_tv_show_details(ctx: Context, tv_id: int) -> str:
     await get_genres()
 
     # Get TV show details with additional data
-    result = await make_tmdb_request(f"/tv/{tv_id}", {"append_to_response": "credits,content_ratings"})
+    result = await fetch_details("tv", tv_id, TV_DETAILS_APPEND)
 
     if not result.get("success"):
-        return json.dumps(result, indent=2)
+        return respond(result)
 
-    # Format cast (main cast)
-    cast = []
-    if result.get("credits", {}).get("cast"):
-        for actor in result["credits"]["cast"][:15]:
-            cast.append({
-                "id": actor.get("id"),
-                "name": actor.get("name"),
-                "character": actor.get("character"),
-                "profile_urls": construct_image_urls(actor.get("profile_path"), "profile"),
-                "order": actor.get("order")
-            })
+    language = current_language()
+    fallback = []
+    if language != DEFAULT_LANGUAGE:
+        result, fallback = localize_details(result, "tv", language)
+
+    # Format cast (main cast) and crew (key roles)
+    credits = process_credits(result.get("credits"), cast_limit=15,
+                              crew_buckets=TV_CREW_BUCKETS, crew_limit=crew_limit)
+    cast = credits["cast"]
+    crew = credits["crew"]
 
     # Format creators
     creators = []
@@ -423,7 +1833,8 @@ async def get_tv_show_details(ctx: Context, tv_id: int) -> str:
                for n in result.get("networks", [])]
 
     # Format genres
-    genres = [{"id": g.get("id"), "name": g.get("name")} for g in result.get("genres", [])]
+    names = genre_names("tv")
+    genres = [{"id": g.get("id"), "name": names.get(g.get("id"), g.get("name"))} for g in result.get("genres", [])]
 
     formatted_result = {
         "success": True,
@@ -451,21 +1862,31 @@ async def get_tv_show_details(ctx: Context, tv_id: int) -> str:
         "poster_urls": construct_image_urls(result.get("poster_path"), "poster"),
         "backdrop_urls": construct_image_urls(result.get("backdrop_path"), "backdrop"),
         "cast": cast,
+        "crew": crew,
         "creators": creators,
         "seasons": seasons,
         "tmdb_url": f"https://www.themoviedb.org/tv/{tv_id}"
     }
 
-    return json.dumps(formatted_result, indent=2)
+    return respond(with_freshness(with_language_info(formatted_result, language, fallback), result))
 
 @mcp.tool()
-async def get_trending(ctx: Context, media_type: str, time_window: str = "day") -> str:
+@traced
+@with_deadline
+@with_language
+async def get_trending(ctx: Context, media_type: str, time_window: str = "day",
+                       since: Optional[str] = None,
+                       language: Optional[str] = None,
+                       deadline_ms: Optional[int] = None) -> str:
     """
     Get trending movies or TV shows.
 
     Args:
         media_type: Type of media - "movie" or "tv" (required)
         time_window: Time window - "day" or "week" (default: "day")
+        since: Version token of a previous response; only entered, exited and moved items are returned (optional)
+        language: Response language such as "de-DE" (optional)
+        deadline_ms: Time budget in milliseconds; once it runs out, a stale cached copy or a deadline_exceeded error is returned (optional)
 
     Returns:
         JSON string with trending content including popularity scores and rankings
@@ -474,46 +1895,66 @@ async def get_trending(ctx: Context, media_type: str, time_window: str = "day")
     await get_genres()
 
     if media_type not in ["movie", "tv"]:
-        return json.dumps({
+        return respond({
             "success": False,
             "error": "Invalid media_type. Must be 'movie' or 'tv'."
-        }, indent=2)
+        })
 
     if time_window not in ["day", "week"]:
-        return json.dumps({
+        return respond({
             "success": False,
             "error": "Invalid time_window. Must be 'day' or 'week'."
-        }, indent=2)
+        })
 
-    result = await make_tmdb_request(f"/trending/{media_type}/{time_window}")
+    endpoint = f"/trending/{media_type}/{time_window}"
+    params = {}
+    result = await make_tmdb_request(endpoint, params)
 
     if not result.get("success"):
-        return json.dumps(result, indent=2)
+        return respond(result)
 
-    if not result.get("results"):
-        return json.dumps({
+    if not result.get("results") and since is None:
+        return respond({
             "success": True,
             "message": f"No trending {media_type} found for {time_window}",
             "total_results": 0,
             "results": []
-        }, indent=2)
+        })
 
-    if media_type == "movie":
-        formatted_results = [format_movie_result(item) for item in result["results"]]
-    else:
-        formatted_results = [format_tv_result(item) for item in result["results"]]
+    format_row = format_movie_result if media_type == "movie" else format_tv_result
 
-    return json.dumps({
+    return respond(with_freshness(list_response({
         "success": True,
         "media_type": media_type,
         "time_window": time_window,
-        "total_results": result.get("total_results", 0),
-        "results": formatted_results
-    }, indent=2)
+        "total_results": result.get("total_results", 0)
+    }, result.get("results", []), format_row, endpoint, params, since), result))
+
+def _discover_params(content_type: str, genre_id: Optional[int], year: Optional[int], sort_by: str) -> Dict:
+    params = {
+        "sort_by": sort_by
+    }
+
+    if genre_id:
+        params["with_genres"] = genre_id
+
+    if year:
+        if content_type == "movie":
+            params["year"] = year
+        else:
+            params["first_air_date_year"] = year
+
+    return params
 
 @mcp.tool()
+@traced
+@with_deadline
+@with_language
 async def discover_content(ctx: Context, content_type: str, genre_id: Optional[int] = None,
-                          year: Optional[int] = None, sort_by: str = "popularity.desc") -> str:
+                          year: Optional[int] = None, sort_by: str = "popularity.desc",
+                           since: Optional[str] = None,
+                           language: Optional[str] = None,
+                           deadline_ms: Optional[int] = None) -> str:
     """
     Discover movies or TV shows based on filters.
 
@@ -522,6 +1963,9 @@ async def discover_content(ctx: Context, content_type: str, genre_id: Optional[i
         genre_id: Genre ID to filter by (optional)
         year: Year to filter by (optional) - release year for movies, first air date year for TV
         sort_by: Sort order (default: "popularity.desc")
+        since: Version token of a previous response; only entered, exited and moved items are returned (optional)
+        language: Response language such as "de-DE" (optional)
+        deadline_ms: Time budget in milliseconds; once it runs out, a stale cached copy or a deadline_exceeded error is returned (optional)
 
     Returns:
         JSON string with curated content based on filters
@@ -530,51 +1974,1233 @@ async def discover_content(ctx: Context, content_type: str, genre_id: Optional[i
     await get_genres()
 
     if content_type not in ["movie", "tv"]:
-        return json.dumps({
+        return respond({
             "success": False,
             "error": "Invalid content_type. Must be 'movie' or 'tv'."
-        }, indent=2)
-
-    params = {
-        "sort_by": sort_by
-    }
+        })
 
-    if genre_id:
-        params["with_genres"] = genre_id
+    endpoint = f"/discover/{content_type}"
+    params = _discover_params(content_type, genre_id, year, sort_by)
 
-    if year:
-        if content_type == "movie":
-            params["year"] = year
-        else:
-            params["first_air_date_year"] = year
-
-    result = await make_tmdb_request(f"/discover/{content_type}", params)
+    result = await make_tmdb_request(endpoint, params)
 
     if not result.get("success"):
-        return json.dumps(result, indent=2)
+        return respond(result)
 
-    if not result.get("results"):
-        return json.dumps({
+    if not result.get("results") and since is None:
+        return respond({
             "success": True,
             "message": f"No {content_type} found with the specified filters",
             "filters": {"genre_id": genre_id, "year": year, "sort_by": sort_by},
             "total_results": 0,
             "results": []
-        }, indent=2)
+        })
 
-    if content_type == "movie":
-        formatted_results = [format_movie_result(item) for item in result["results"]]
-    else:
-        formatted_results = [format_tv_result(item) for item in result["results"]]
+    format_row = format_movie_result if content_type == "movie" else format_tv_result
 
-    return json.dumps({
+    return respond(with_freshness(list_response({
         "success": True,
         "content_type": content_type,
         "filters": {"genre_id": genre_id, "year": year, "sort_by": sort_by},
         "total_results": result.get("total_results", 0),
-        "total_pages": result.get("total_pages", 0),
-        "results": formatted_results
-    }, indent=2)
+        "total_pages": result.get("total_pages", 0)
+    }, result.get("results", []), format_row, endpoint, params, since), result))
+
+# Batch search
+async def _search_one(query: str, year: Optional[int], page: int, semaphore: asyncio.Semaphore) -> Dict:
+    params = {"query": query, "page": page}
+    if year:
+        params["year"] = year
+    async with semaphore:
+        return await make_tmdb_request("/search/movie", params, wait_for_budget=True)
+
+@mcp.tool()
+@traced
+@with_deadline
+@with_language
+async def search_movies_batch(ctx: Context, queries: List[str], years: Optional[List[Optional[int]]] = None,
+                              page: int = 1,
+                              language: Optional[str] = None,
+                              deadline_ms: Optional[int] = None) -> str:
+    """
+    Run several movie searches at once, e.g. variants of one title, and merge the results.
+
+    Args:
+        queries: Movie titles to search for, up to 10 (required)
+        years: Release year per query, aligned with queries; use null for no filter (optional)
+        page: Page number requested for every query (default: 1)
+        language: Response language such as "de-DE" (optional)
+        deadline_ms: Time budget in milliseconds; queries that finished in time are returned with partial: true (optional)
+
+    Returns:
+        JSON string with the matching IDs per query and one merged, deduplicated entry per movie
+    """
+    if not queries:
+        return respond({
+            "success": False,
+            "error": "At least one query is required."
+        })
+
+    if len(queries) > BATCH_SEARCH_MAX_QUERIES:
+        return respond({
+            "success": False,
+            "error": f"Too many queries. At most {BATCH_SEARCH_MAX_QUERIES} per call."
+        })
+
+    years = list(years or [])
+    if len(years) > len(queries):
+        return respond({
+            "success": False,
+            "error": "years must not be longer than queries."
+        })
+    years += [None] * (len(queries) - len(years))
+
+    # Ensure genres are loaded
+    await get_genres()
+
+    # Identical query/year pairs are only sent once
+    unique = list(dict.fromkeys((q.strip(), y) for q, y in zip(queries, years)))
+    semaphore = asyncio.Semaphore(FANOUT_CONCURRENCY)
+    responses = await asyncio.gather(*(_search_one(q, y, page, semaphore) for q, y in unique))
+    by_search = dict(zip(unique, responses))
+
+    groups = []
+    merged = {}
+    stale = None
+    partial = False
+    for index, (query, year) in enumerate(zip(queries, years)):
+        result = by_search[(query.strip(), year)]
+        group = {"query": query, "year": year}
+        if not result.get("success"):
+            group["error"] = result.get("error")
+            partial = partial or bool(result.get("deadline_exceeded"))
+            groups.append(group)
+            continue
+
+        if result.get("stale"):
+            stale = result
+
+        ids = []
+        for movie in result.get("results", []):
+            movie_id = movie.get("id")
+            ids.append(movie_id)
+            entry = merged.get(movie_id)
+            if entry is None:
+                # Formatting happens once per unique title however many queries match it
+                entry = merged[movie_id] = format_movie_result(movie)
+                entry["matched_queries"] = []
+            if index not in entry["matched_queries"]:
+                entry["matched_queries"].append(index)
+
+        group["total_results"] = result.get("total_results", 0)
+        group["ids"] = ids
+        groups.append(group)
+
+    response = {
+        "success": any("error" not in g for g in groups),
+        "page": page,
+        "groups": groups,
+        "unique_results": len(merged),
+        "results": {str(movie_id): entry for movie_id, entry in merged.items()}
+    }
+    if partial:
+        response["partial"] = True
+    return respond(with_freshness(response, stale or {}))
+
+# Unified search
+# /search/multi media_type -> (response group, formatter)
+SEARCH_ALL_TYPES = {
+    "movie": ("movies", format_movie_result),
+    "tv": ("tv_shows", format_tv_result),
+    "person": ("people", format_person_result)
+}
+
+async def _search_multi_page(query: str, page: int, semaphore: asyncio.Semaphore) -> Dict:
+    async with semaphore:
+        return await make_tmdb_request("/search/multi", {"query": query, "page": page}, wait_for_budget=True)
+
+@mcp.tool()
+@traced
+@with_deadline
+@with_language
+async def search_all(ctx: Context, query: str, pages: int = 1, max_movies: Optional[int] = None,
+                     max_tv_shows: Optional[int] = None, max_people: Optional[int] = None,
+                     language: Optional[str] = None,
+                     deadline_ms: Optional[int] = None) -> str:
+    """
+    Search movies, TV shows and people at once with a single TMDb request per page.
+
+    Args:
+        query: Title or name to search for (required)
+        pages: Number of result pages to read, up to 5 (default: 1)
+        max_movies: Maximum number of movies to return (optional, 0 to exclude movies)
+        max_tv_shows: Maximum number of TV shows to return (optional, 0 to exclude TV shows)
+        max_people: Maximum number of people to return (optional, 0 to exclude people)
+        language: Response language such as "de-DE" (optional)
+        deadline_ms: Time budget in milliseconds; pages that miss it are listed in failed_pages with partial: true, or the call fails if page 1 does (optional)
+
+    Returns:
+        JSON string with movies, TV shows and people grouped by type, plus their combined relevance order
+    """
+    if not query or not query.strip():
+        return respond({
+            "success": False,
+            "error": "A query is required."
+        })
+
+    pages = max(1, min(pages, SEARCH_ALL_MAX_PAGES))
+    caps = {"movies": max_movies, "tv_shows": max_tv_shows, "people": max_people}
+
+    # Ensure genres are loaded
+    await get_genres()
+
+    semaphore = asyncio.Semaphore(FANOUT_CONCURRENCY)
+    first = await _search_multi_page(query, 1, semaphore)
+    if not first.get("success"):
+        return respond(first)
+
+    groups = {"movies": [], "tv_shows": [], "people": []}
+    ranking = []
+    seen = set()
+
+    def full() -> bool:
+        return all(cap is not None and len(groups[name]) >= cap for name, cap in caps.items())
+
+    def collect(result: Dict) -> None:
+        for item in result.get("results", []):
+            media_type = item.get("media_type")
+            if media_type not in SEARCH_ALL_TYPES or (media_type, item.get("id")) in seen:
+                continue
+            name, formatter = SEARCH_ALL_TYPES[media_type]
+            cap = caps[name]
+            if cap is not None and len(groups[name]) >= cap:
+                continue
+            seen.add((media_type, item.get("id")))
+            groups[name].append(formatter(item))
+            ranking.append({"media_type": media_type, "id": item.get("id")})
+
+    collect(first)
+
+    # Later pages are only requested once page 1 shows they exist and the caps still have room
+    last_page = min(pages, first.get("total_pages") or 1)
+    results = [first]
+    failed_pages = []
+
+    def take(page: int, result: Dict) -> None:
+        if result.get("success"):
+            results.append(result)
+            collect(result)
+        else:
+            failed_pages.append(page)
+
+    later_pages = range(2, last_page + 1)
+    if later_pages and not full():
+        if all(cap is not None for cap in caps.values()):
+            # Every type is capped, so any page may fill the caps: fetch in order and stop once they are
+            for page in later_pages:
+                take(page, await _search_multi_page(query, page, semaphore))
+                if full():
+                    break
+        else:
+            later = await asyncio.gather(*(_search_multi_page(query, page, semaphore) for page in later_pages))
+            for page, result in zip(later_pages, later):
+                take(page, result)
+
+    response = {
+        "success": True,
+        "query": query,
+        "pages_fetched": len(results),
+        "total_results": first.get("total_results", 0),
+        "total_pages": first.get("total_pages", 0),
+        "counts": {name: len(items) for name, items in groups.items()},
+        **groups,
+        "ranking": ranking
+    }
+    if failed_pages:
+        response["partial"] = True
+        response["failed_pages"] = failed_pages
+    return respond(with_freshness(response, next((r for r in results if r.get("stale")), first)))
+
+# Merged discover
+# sort_by option -> field of a discover result row, per content type
+DISCOVER_SORT_FIELDS = {
+    "movie": {"popularity": "popularity", "vote_average": "vote_average", "vote_count": "vote_count",
+              "primary_release_date": "release_date", "release_date": "release_date",
+              "title": "title", "original_title": "original_title"},
+    "tv": {"popularity": "popularity", "vote_average": "vote_average", "vote_count": "vote_count",
+           "first_air_date": "first_air_date", "name": "name", "original_name": "original_name"}
+}
+
+class _Descending:
+    """Inverts comparisons so heapq, a min-heap, pops the largest value first"""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other: "_Descending") -> bool:
+        return other.value < self.value
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, _Descending) and self.value == other.value
+
+def discover_sort_key(content_type: str, sort_by: str):
+    """
+    Build the merge key for a sort_by option, or return None if rows cannot be ordered by it.
+    Rows missing the field sort after all others, in either direction.
+    """
+    field_name, _, direction = sort_by.partition(".")
+    field = DISCOVER_SORT_FIELDS[content_type].get(field_name)
+    if field is None or direction not in ("asc", "desc"):
+        return None
+
+    def key(row: Dict) -> tuple:
+        value = row.get(field)
+        if value is None or value == "":
+            return (1, 0)
+        return (0, value if direction == "asc" else _Descending(value))
+
+    return key
+
+class DiscoverStream:
+    """One filter combination of a merged discover, read page by page on demand"""
+
+    def __init__(self, content_type: str, genre_id: Optional[int], year: Optional[int], sort_by: str):
+        self.content_type = content_type
+        self.genre_id = genre_id
+        self.year = year
+        self.params = _discover_params(content_type, genre_id, year, sort_by)
+        self.rows: deque = deque()
+        self.next_page = 1
+        self.total_pages = 1
+        self.error: Optional[Dict] = None
+        self.stale: Optional[Dict] = None
+
+    @property
+    def exhausted(self) -> bool:
+        return not self.rows and (self.error is not None or self.next_page > min(self.total_pages, TMDB_MAX_PAGES))
+
+    async def fill(self, semaphore: asyncio.Semaphore) -> None:
+        """Fetch the next page if the buffer is empty and more pages exist"""
+        if self.rows or self.exhausted:
+            return
+        async with semaphore:
+            result = await make_tmdb_request(f"/discover/{self.content_type}",
+                                             dict(self.params, page=self.next_page), wait_for_budget=True)
+        if not result.get("success"):
+            self.error = result
+            return
+        if result.get("stale"):
+            self.stale = result
+        self.next_page += 1
+        self.total_pages = result.get("total_pages") or 0
+        self.rows.extend(result.get("results", []))
+
+async def merge_discover_streams(streams: List[DiscoverStream], key, semaphore: asyncio.Semaphore):
+    """
+    K-way merge of sorted discover streams, yielding (row, stream) in global order.
+
+    A row is only yielded once every stream that could still hold a smaller
+    key has a page buffered, so pages are fetched lazily: a stream's next page
+    is requested when its buffer runs dry, and nothing more is fetched once
+    the consumer stops iterating.
+    """
+    await asyncio.gather(*(stream.fill(semaphore) for stream in streams))
+    heap = []
+    for index, stream in enumerate(streams):
+        if stream.rows:
+            heapq.heappush(heap, (key(stream.rows[0]), index, stream.rows.popleft()))
+
+    while heap:
+        _, index, row = heapq.heappop(heap)
+        yield row, streams[index]
+        stream = streams[index]
+        await stream.fill(semaphore)
+        if stream.rows:
+            heapq.heappush(heap, (key(stream.rows[0]), index, stream.rows.popleft()))
+
+@mcp.tool()
+@traced
+@with_deadline
+@with_language
+async def discover_merged(ctx: Context, content_type: str, genre_ids: Optional[List[int]] = None,
+                          year_from: Optional[int] = None, year_to: Optional[int] = None,
+                          sort_by: str = "popularity.desc", limit: int = 20,
+                          language: Optional[str] = None,
+                          deadline_ms: Optional[int] = None) -> str:
+    """
+    Discover across several genres and a range of years in one call, merged into a single ranking.
+
+    Args:
+        content_type: Type of content - "movie" or "tv" (required)
+        genre_ids: Genre IDs; every genre is queried separately and results are combined (optional)
+        year_from: First year of the range, inclusive (optional)
+        year_to: Last year of the range, inclusive (optional, default: year_from)
+        sort_by: Sort order applied across all combinations, e.g. "vote_average.desc" (default: "popularity.desc")
+        limit: Number of unique results to return, up to 100 (default: 20)
+        language: Response language such as "de-DE" (optional)
+        deadline_ms: Time budget in milliseconds; rows merged in time are returned, with the cut-off combinations in errors and partial: true (optional)
+
+    Returns:
+        JSON string with the top results across all genre/year combinations, each listing the combinations it matched
+    """
+    if content_type not in ["movie", "tv"]:
+        return respond({
+            "success": False,
+            "error": "Invalid content_type. Must be 'movie' or 'tv'."
+        })
+
+    key = discover_sort_key(content_type, sort_by)
+    if key is None:
+        return respond({
+            "success": False,
+            "error": f"Unsupported sort_by for merging. Use one of: "
+                     f"{', '.join(sorted(DISCOVER_SORT_FIELDS[content_type]))} with .asc or .desc"
+        })
+
+    if year_to is not None and year_from is None:
+        year_from = year_to
+    if year_from is not None and year_to is None:
+        year_to = year_from
+    if year_from is not None and year_to < year_from:
+        return respond({
+            "success": False,
+            "error": "year_to must not be before year_from."
+        })
+
+    genres = list(dict.fromkeys(genre_ids or [])) or [None]
+    years = list(range(year_from, year_to + 1)) if year_from is not None else [None]
+    if len(genres) * len(years) > DISCOVER_MAX_STREAMS:
+        return respond({
+            "success": False,
+            "error": f"Too many combinations ({len(genres) * len(years)}). "
+                     f"At most {DISCOVER_MAX_STREAMS} genre/year pairs per call."
+        })
+
+    limit = max(1, min(limit, DISCOVER_MAX_LIMIT))
+
+    # Ensure genres are loaded
+    await get_genres()
+
+    streams = [DiscoverStream(content_type, genre_id, year, sort_by) for genre_id in genres for year in years]
+    semaphore = asyncio.Semaphore(FANOUT_CONCURRENCY)
+    format_result = format_movie_result if content_type == "movie" else format_tv_result
+
+    results = []
+    by_id = {}
+    merged = merge_discover_streams(streams, key, semaphore)
+    try:
+        async for row, stream in merged:
+            entry = by_id.get(row.get("id"))
+            if entry is None:
+                entry = by_id[row.get("id")] = format_result(row)
+                entry["matched"] = []
+                results.append(entry)
+            entry["matched"].append({"genre_id": stream.genre_id, "year": stream.year})
+            # The top results are settled once yielded, so no further pages are needed
+            if len(results) == limit:
+                break
+    finally:
+        await merged.aclose()
+
+    failed = [s for s in streams if s.error is not None]
+    stale = next((s.stale for s in streams if s.stale is not None), None)
+    response = {
+        "success": bool(results) or len(failed) < len(streams),
+        "content_type": content_type,
+        "filters": {"genre_ids": genre_ids, "year_from": year_from, "year_to": year_to, "sort_by": sort_by},
+        "combinations": len(streams),
+        "pages_fetched": sum(s.next_page - 1 for s in streams),
+        "returned": len(results),
+        "results": results
+    }
+    if failed:
+        response["partial"] = True
+        response["errors"] = [{"genre_id": s.genre_id, "year": s.year, "error": s.error.get("error")}
+                              for s in failed]
+    return respond(with_freshness(response, stale or {}))
+
+# Watch providers
+async def get_provider_catalog(content_type: str) -> List[Dict]:
+    """Get the list of streaming providers TMDb knows for a content type (cached for WATCH_PROVIDERS_TTL)"""
+    result = await make_tmdb_request(f"/watch/providers/{content_type}", cache_ttl=WATCH_PROVIDERS_TTL)
+    return result.get("results", []) if result.get("success") else []
+
+def _match_provider(provider: str, catalog: List[Dict]) -> Optional[Dict]:
+    """Resolve a provider ID or case-insensitive name against the provider catalog"""
+    wanted = provider.strip().lower()
+    for entry in catalog:
+        if str(entry.get("provider_id")) == wanted or (entry.get("provider_name") or "").lower() == wanted:
+            return entry
+    return None
+
+def format_region_providers(region_data: Dict) -> Dict:
+    """Reduce a region's provider payload to provider names/IDs per monetization type"""
+    formatted = {"link": region_data.get("link")}
+    for monetization in WATCH_MONETIZATION_TYPES:
+        formatted[monetization] = [
+            {"provider_id": p.get("provider_id"), "provider_name": p.get("provider_name")}
+            for p in region_data.get(monetization, [])
+        ]
+    return formatted
+
+async def _fetch_title_providers(content_type: str, title_id: int, semaphore: asyncio.Semaphore) -> Dict:
+    # One request returns every region, so the cached payload answers any region filter
+    async with semaphore:
+        return await make_tmdb_request(f"/{content_type}/{title_id}/watch/providers",
+                                       cache_ttl=WATCH_PROVIDERS_TTL, wait_for_budget=True)
+
+@mcp.tool()
+@traced
+@with_deadline
+async def get_watch_providers(ctx: Context, content_type: str, ids: List[int],
+                              regions: Optional[List[str]] = None,
+                              provider: Optional[Union[str, int]] = None,
+                              deadline_ms: Optional[int] = None) -> str:
+    """
+    Find where movies or TV shows can be streamed, rented or bought, for many titles at once.
+
+    Args:
+        content_type: Type of content - "movie" or "tv" (required)
+        ids: TMDb IDs to look up, up to 50 (required)
+        regions: ISO 3166-1 country codes such as ["US", "GB"] (optional, default: all regions)
+        provider: Provider name or ID, e.g. "Netflix" or 8 (optional) - reports which titles it offers
+        deadline_ms: Time budget in milliseconds; titles that finished in time are returned, the rest are listed in errors with partial: true (optional)
+
+    Returns:
+        JSON string with providers per title and region, plus the titles matching the provider if given
+    """
+    if content_type not in ["movie", "tv"]:
+        return respond({
+            "success": False,
+            "error": "Invalid content_type. Must be 'movie' or 'tv'."
+        })
+
+    ids = list(dict.fromkeys(ids))
+    if not ids:
+        return respond({
+            "success": False,
+            "error": "At least one ID is required."
+        })
+
+    if len(ids) > WATCH_PROVIDERS_MAX_IDS:
+        return respond({
+            "success": False,
+            "error": f"Too many IDs. At most {WATCH_PROVIDERS_MAX_IDS} titles per call."
+        })
+
+    wanted_regions = [r.upper() for r in regions] if regions else None
+
+    provider_entry = None
+    if provider is not None:
+        provider_entry = _match_provider(str(provider), await get_provider_catalog(content_type))
+        if provider_entry is None:
+            return respond({
+                "success": False,
+                "error": f"Unknown provider '{provider}' for {content_type}.",
+                "suggestion": "Use a provider name such as 'Netflix' or a numeric provider ID"
+            })
+
+    semaphore = asyncio.Semaphore(FANOUT_CONCURRENCY)
+    results = await asyncio.gather(*(_fetch_title_providers(content_type, title_id, semaphore) for title_id in ids))
+
+    titles = []
+    errors = []
+    matches = []
+    partial = False
+    for title_id, result in zip(ids, results):
+        if not result.get("success"):
+            errors.append({"id": title_id, "error": result.get("error")})
+            partial = partial or bool(result.get("deadline_exceeded"))
+            continue
+
+        all_regions = result.get("results", {})
+        selected = wanted_regions if wanted_regions is not None else sorted(all_regions)
+        title_regions = {region: format_region_providers(all_regions[region])
+                         for region in selected if region in all_regions}
+        entry = {"id": title_id, "regions": title_regions}
+
+        if provider_entry is not None:
+            wanted_id = provider_entry.get("provider_id")
+            available_in = {}
+            for region, data in title_regions.items():
+                kinds = [m for m in WATCH_MONETIZATION_TYPES
+                         if any(p["provider_id"] == wanted_id for p in data[m])]
+                if kinds:
+                    available_in[region] = kinds
+            entry["on_provider"] = available_in
+            if available_in:
+                matches.append(title_id)
+
+        titles.append(entry)
+
+    response = {
+        "success": True,
+        "content_type": content_type,
+        "regions": wanted_regions or "all",
+        "results": titles,
+        "errors": errors
+    }
+    if partial:
+        response["partial"] = True
+    if provider_entry is not None:
+        response["provider"] = {"provider_id": provider_entry.get("provider_id"),
+                                "provider_name": provider_entry.get("provider_name")}
+        response["matching_ids"] = matches
+
+    return respond(response)
+
+# Image cache
+_IMAGE_PATH_PATTERN = re.compile(r"^/[A-Za-z0-9_.-]+\.(jpg|jpeg|png|webp)$")
+_IMAGE_FORMATS = {"jpg": "jpeg", "jpeg": "jpeg", "png": "png", "webp": "webp"}
+
+class ImageCache:
+    """
+    Content-addressed on-disk cache for TMDb images and their thumbnails.
+
+    Blobs are stored under their SHA-256 and read back through mmap. An index
+    maps "<variant>:<path>" to a blob so identical bytes are stored once.
+    When the cache grows past max_bytes, the least recently used blobs are
+    evicted. Disk reads and writes run in worker threads, serialised by a lock.
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._index_path = os.path.join(directory, "index.json")
+        self._index: Optional[Dict] = None
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _load_index(self) -> Dict:
+        if self._index is None:
+            self._index = {"keys": {}, "blobs": {}}
+            if os.path.exists(self._index_path):
+                with open(self._index_path, "r", encoding="utf-8") as f:
+                    self._index = json.load(f)
+        return self._index
+
+    def _save_index(self) -> None:
+        tmp_path = self._index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, self._index_path)
+
+    def _blob_path(self, digest: str) -> str:
+        return os.path.join(self.directory, "blobs", digest[:2], digest)
+
+    def read(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            return self._read(key)
+
+    def _read(self, key: str) -> Optional[bytes]:
+        index = self._load_index()
+        digest = index["keys"].get(key)
+        if digest is None:
+            return None
+        path = self._blob_path(digest)
+        try:
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                data = mapped[:]
+        except (OSError, ValueError):
+            # Blob removed behind our back; forget the key
+            del index["keys"][key]
+            return None
+        index["blobs"][digest]["last_used"] = time.time()
+        return data
+
+    def write(self, key: str, data: bytes) -> None:
+        with self._lock:
+            self._write(key, data)
+
+    def _write(self, key: str, data: bytes) -> None:
+        index = self._load_index()
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(digest)
+        if digest not in index["blobs"]:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path + ".tmp", "wb") as f:
+                f.write(data)
+            os.replace(path + ".tmp", path)
+            index["blobs"][digest] = {"size": len(data), "last_used": time.time()}
+        index["keys"][key] = digest
+        self._evict()
+        self._save_index()
+
+    def _evict(self) -> None:
+        index = self._index
+        total = sum(blob["size"] for blob in index["blobs"].values())
+        if total <= self.max_bytes:
+            return
+        for digest, blob in sorted(index["blobs"].items(), key=lambda item: item[1]["last_used"]):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(self._blob_path(digest))
+            except OSError:
+                pass
+            del index["blobs"][digest]
+            total -= blob["size"]
+            self.evictions += 1
+        index["keys"] = {k: d for k, d in index["keys"].items() if d in index["blobs"]}
+
+    async def get_or_create(self, key: str, produce) -> bytes:
+        """Return cached bytes for key, calling `produce()` once (even under concurrency) on a miss"""
+        data = await asyncio.to_thread(self.read, key)
+        if data is not None:
+            self.hits += 1
+            return data
+
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            data = await produce()
+            await asyncio.to_thread(self.write, key, data)
+            future.set_result(data)
+            return data
+        except BaseException as e:
+            future.set_exception(e)
+            # Nobody may be waiting on the future; don't warn about an unretrieved exception
+            future.exception()
+            raise
+        finally:
+            del self._in_flight[key]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            index = self._load_index()
+            blobs, keys = len(index["blobs"]), len(index["keys"])
+            total = sum(blob["size"] for blob in index["blobs"].values())
+        return {
+            "directory": os.path.abspath(self.directory),
+            "blobs": blobs,
+            "keys": keys,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
+
+_image_cache = ImageCache(IMAGE_CACHE_DIR, IMAGE_CACHE_MAX_BYTES)
+
+async def fetch_image_bytes(size: str, path: str) -> bytes:
+    """Download an image rendition from the TMDb image CDN (or TMDB_IMAGE_BASE_URL)"""
+    response = await http_client.get(f"{TMDB_IMAGE_BASE_URL}{size}{path}")
+    response.raise_for_status()
+    return response.content
+
+def sniff_image_format(data: bytes, default: str) -> str:
+    """Detect JPEG/PNG/WebP from magic bytes, falling back to the file extension's format"""
+    if data.startswith(b"\xff\xd8"):
+        return "jpeg"
+    if data.startswith(b"\x89PNG"):
+        return "png"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "webp"
+    return default
+
+def make_thumbnail(data: bytes, max_size: int, image_format: str) -> bytes:
+    """Shrink an image so its longest side is at most max_size pixels"""
+    image_format = sniff_image_format(data, image_format)
+    with PILImage.open(io.BytesIO(data)) as img:
+        img.thumbnail((max_size, max_size))
+        if image_format == "jpeg" and img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        out = io.BytesIO()
+        img.save(out, format=image_format.upper(), quality=85)
+        return out.getvalue()
+
+@mcp.tool()
+@traced
+async def get_image(ctx: Context, path: str, image_type: str = "poster", thumbnail: bool = True):
+    """
+    Get a poster, backdrop or profile image as image content, cached locally after the first request.
+
+    Args:
+        path: Image path from TMDb such as "/f89U3ADr1oiB1s9GkdPOEpXUk5H.jpg" (required) - the part after the size in poster_urls
+        image_type: "poster", "backdrop" or "profile" (default: "poster")
+        thumbnail: Return a small thumbnail instead of the full image (default: true)
+
+    Returns:
+        Image content, or a JSON error string
+    """
+    if image_type not in IMAGE_SOURCE_SIZES:
+        return respond({
+            "success": False,
+            "error": "Invalid image_type. Must be 'poster', 'backdrop' or 'profile'."
+        })
+
+    match = _IMAGE_PATH_PATTERN.match(path or "")
+    if not match:
+        return respond({
+            "success": False,
+            "error": "Invalid image path. Use the file path from TMDb, e.g. '/abc123.jpg'."
+        })
+    image_format = _IMAGE_FORMATS[match.group(1)]
+
+    source_size = IMAGE_SOURCE_SIZES[image_type]
+
+    async def fetch_source() -> bytes:
+        return await fetch_image_bytes(source_size, path)
+
+    try:
+        if not thumbnail:
+            data = await _image_cache.get_or_create(f"{source_size}:{path}", fetch_source)
+        elif PILImage is not None:
+            async def build_thumbnail() -> bytes:
+                source = await _image_cache.get_or_create(f"{source_size}:{path}", fetch_source)
+                # Decoding and resizing are CPU-bound; keep them off the event loop
+                return await asyncio.to_thread(make_thumbnail, source, THUMBNAIL_SIZE, image_format)
+
+            data = await _image_cache.get_or_create(f"thumb{THUMBNAIL_SIZE}:{path}", build_thumbnail)
+        else:
+            fallback_size = IMAGE_FALLBACK_SIZES[image_type]
+
+            async def fetch_fallback() -> bytes:
+                return await fetch_image_bytes(fallback_size, path)
+
+            data = await _image_cache.get_or_create(f"{fallback_size}:{path}", fetch_fallback)
+    except httpx.HTTPStatusError as e:
+        return respond({
+            "success": False,
+            "error": f"Image not available (HTTP {e.response.status_code})."
+        })
+    except httpx.RequestError as e:
+        return respond({
+            "success": False,
+            "error": f"Network error: {str(e)}"
+        })
+
+    return Image(data=data, format=sniff_image_format(data, image_format))
+
+# Bulk export
+_EXPORT_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+def _export_paths(export_id: str) -> tuple:
+    """Return (data file, checkpoint file) paths for an export"""
+    return (os.path.join(EXPORT_DIR, f"{export_id}.ndjson.gz"),
+            os.path.join(EXPORT_DIR, f"{export_id}.checkpoint.json"))
+
+def _load_checkpoint(export_id: str) -> Optional[Dict]:
+    _, checkpoint_path = _export_paths(export_id)
+    if not os.path.exists(checkpoint_path):
+        return None
+    with open(checkpoint_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def _save_checkpoint(checkpoint: Dict) -> None:
+    _, checkpoint_path = _export_paths(checkpoint["export_id"])
+    tmp_path = checkpoint_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(checkpoint, f, indent=2)
+    os.replace(tmp_path, checkpoint_path)
+
+async def _fetch_export_page(endpoint: str, params: Dict, page: int) -> Dict:
+    """Fetch one page for an export, waiting for room in the rate budget first"""
+    return await make_tmdb_request(endpoint, dict(params, page=page), wait_for_budget=True)
+
+async def iter_result_pages(endpoint: str, params: Dict, start_page: int, end_page: int,
+                            concurrency: int = EXPORT_CONCURRENCY):
+    """
+    Yield (page number, response) for pages start_page..end_page in order.
+
+    At most `concurrency` pages are in flight or buffered at any time, so
+    memory stays bounded no matter how many pages are requested. Iteration
+    stops at the first failed page, which is yielded so the caller can report it.
+    """
+    in_flight = deque()
+    next_page = start_page
+    try:
+        while in_flight or next_page <= end_page:
+            while next_page <= end_page and len(in_flight) < concurrency:
+                in_flight.append((next_page, asyncio.ensure_future(
+                    _fetch_export_page(endpoint, params, next_page))))
+                next_page += 1
+
+            page, task = in_flight.popleft()
+            result = await task
+            yield page, result
+            if not result.get("success"):
+                return
+    finally:
+        for _, task in in_flight:
+            task.cancel()
+        # Wait for the cancellations so no fetch outlives the caller
+        await asyncio.gather(*(task for _, task in in_flight), return_exceptions=True)
+
+@mcp.tool()
+@traced
+@with_deadline
+@with_language
+async def export_content(ctx: Context, content_type: str, source: str = "discover",
+                         query: Optional[str] = None, genre_id: Optional[int] = None,
+                         year_from: Optional[int] = None, year_to: Optional[int] = None,
+                         sort_by: str = "popularity.desc", max_pages: int = 100,
+                         export_id: Optional[str] = None,
+                         language: Optional[str] = None,
+                         deadline_ms: Optional[int] = None) -> str:
+    """
+    Export a large movie or TV result set to a gzip-compressed NDJSON file.
+
+    Pages are streamed straight to disk instead of being returned, with a
+    checkpoint after every page. Calling again with the same filters (or the
+    same export_id) resumes where the previous call stopped.
+
+    Args:
+        content_type: Type of content - "movie" or "tv" (required)
+        source: "discover" (filters below) or "search" (uses query) (default: "discover")
+        query: Search text, required when source is "search"
+        genre_id: Genre ID to filter by (optional, discover only)
+        year_from: First release / first air year to include (optional, discover only)
+        year_to: Last release / first air year to include (optional, discover only)
+        sort_by: Sort order (default: "popularity.desc", discover only)
+        max_pages: Maximum number of pages to fetch in this call (default: 100)
+        export_id: Identifier of the export to create or resume (optional, derived from filters)
+        language: Response language such as "de-DE" (optional)
+        deadline_ms: Time budget in milliseconds; the export stops after the last completed page and resumes on the next call (optional)
+
+    Returns:
+        JSON string with export progress, the output file path and its resource URI
+    """
+    if content_type not in ["movie", "tv"]:
+        return respond({
+            "success": False,
+            "error": "Invalid content_type. Must be 'movie' or 'tv'."
+        })
+
+    if source not in ["discover", "search"]:
+        return respond({
+            "success": False,
+            "error": "Invalid source. Must be 'discover' or 'search'."
+        })
+
+    if source == "search" and not query:
+        return respond({
+            "success": False,
+            "error": "A query is required when source is 'search'."
+        })
+
+    if source == "discover":
+        endpoint = f"/discover/{content_type}"
+        date_field = "primary_release_date" if content_type == "movie" else "first_air_date"
+        params = {"sort_by": sort_by}
+        if genre_id:
+            params["with_genres"] = genre_id
+        if year_from:
+            params[f"{date_field}.gte"] = f"{year_from}-01-01"
+        if year_to:
+            params[f"{date_field}.lte"] = f"{year_to}-12-31"
+    else:
+        endpoint = f"/search/{content_type}"
+        params = {"query": query}
+
+    # Part of the export's identity, so resuming keeps the original language
+    if current_language() != DEFAULT_LANGUAGE:
+        params["language"] = current_language()
+
+    if export_id is None:
+        fingerprint = json.dumps([endpoint, sorted(params.items())], default=str)
+        export_id = f"{content_type}-{source}-{hashlib.sha1(fingerprint.encode()).hexdigest()[:12]}"
+    elif not _EXPORT_ID_PATTERN.match(export_id):
+        return respond({
+            "success": False,
+            "error": "Invalid export_id. Use letters, digits, '-' and '_' only."
+        })
+
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    data_path, _ = _export_paths(export_id)
+
+    checkpoint = _load_checkpoint(export_id)
+    if checkpoint is None:
+        checkpoint = {
+            "export_id": export_id,
+            "endpoint": endpoint,
+            "params": params,
+            "next_page": 1,
+            "total_pages": None,
+            "total_results": None,
+            "rows_written": 0,
+            "bytes_written": 0,
+            "completed": False
+        }
+    elif checkpoint["endpoint"] != endpoint or checkpoint["params"] != params:
+        return respond({
+            "success": False,
+            "error": f"Export '{export_id}' already exists with different filters.",
+            "existing_filters": {"endpoint": checkpoint["endpoint"], "params": checkpoint["params"]}
+        })
+
+    error = None
+    if not checkpoint["completed"]:
+        # Drop anything written after the last checkpoint (e.g. an interrupted page)
+        with open(data_path, "ab") as f:
+            f.truncate(checkpoint["bytes_written"])
+
+        budget = max(1, max_pages)
+        while budget > 0 and error is None:
+            # Until the first page has told us how many pages exist, fetch just one
+            start_page = checkpoint["next_page"]
+            if checkpoint["total_pages"] is None:
+                end_page = start_page
+            else:
+                end_page = min(checkpoint["total_pages"], start_page + budget - 1)
+            if start_page > end_page:
+                break
+
+            pages = iter_result_pages(endpoint, params, start_page, end_page)
+            try:
+                async for page, result in pages:
+                    if not result.get("success"):
+                        error = result
+                        break
+
+                    if checkpoint["total_pages"] is None:
+                        checkpoint["total_pages"] = min(result.get("total_pages", 0), TMDB_MAX_PAGES)
+                        checkpoint["total_results"] = result.get("total_results", 0)
+
+                    # One gzip member per page keeps the file appendable and truncatable
+                    rows = result.get("results", [])
+                    lines = "".join(json.dumps(row, separators=(",", ":")) + "\n" for row in rows)
+                    block = gzip.compress(lines.encode("utf-8"))
+                    with open(data_path, "ab") as f:
+                        f.write(block)
+
+                    checkpoint["rows_written"] += len(rows)
+                    checkpoint["bytes_written"] += len(block)
+                    checkpoint["next_page"] = page + 1
+                    _save_checkpoint(checkpoint)
+                    budget -= 1
+
+                    if ctx is not None:
+                        await ctx.report_progress(page, checkpoint["total_pages"])
+            finally:
+                await pages.aclose()
+
+        if error is None and checkpoint["next_page"] > (checkpoint["total_pages"] or 0):
+            checkpoint["completed"] = True
+            _save_checkpoint(checkpoint)
+
+    # Running out of time is not a failure: the checkpoint lets the next call resume
+    deadline_hit = error is not None and bool(error.get("deadline_exceeded"))
+
+    response = {
+        "success": error is None or deadline_hit,
+        "export_id": export_id,
+        "resource_uri": f"export://{export_id}",
+        "file": os.path.abspath(data_path),
+        "format": "ndjson+gzip",
+        "completed": checkpoint["completed"],
+        "pages_written": checkpoint["next_page"] - 1,
+        "total_pages": checkpoint["total_pages"],
+        "total_results": checkpoint["total_results"],
+        "rows_written": checkpoint["rows_written"]
+    }
+    if deadline_hit:
+        response["partial"] = True
+    elif error is not None:
+        response["error"] = error.get("error")
+    if not checkpoint["completed"]:
+        response["resume"] = {"export_id": export_id, "next_page": checkpoint["next_page"]}
+
+    return respond(response)
+
+# Catalog snapshot
+_catalog = CatalogStore(CATALOG_DB)
+
+# Plot search
+_plot_index = PlotIndex(PLOT_INDEX_DIR, enabled=PLOT_INDEX_ENABLED)
+
+@mcp.tool()
+@traced
+async def search_plots(ctx: Context, query: str, content_type: Optional[str] = None,
+                       genre_ids: Optional[List[int]] = None, year_from: Optional[int] = None,
+                       year_to: Optional[int] = None, limit: int = 10) -> str:
+    """
+    Find movies or TV shows by describing their plot, e.g. "a heist on a train".
+    Searches the overviews of every title the server has seen or ingested, locally and without TMDb requests.
+
+    Args:
+        query: Plot description (required)
+        content_type: "movie" or "tv" to restrict results (optional, default: both)
+        genre_ids: Genre IDs every result must have (optional)
+        year_from: Earliest release / first air year (optional)
+        year_to: Latest release / first air year (optional)
+        limit: Number of results, up to 50 (default: 10)
+
+    Returns:
+        JSON string with the best matching titles and their similarity scores
+    """
+    if content_type not in (None, "movie", "tv"):
+        return respond({
+            "success": False,
+            "error": "Invalid content_type. Must be 'movie', 'tv' or omitted."
+        })
+
+    if not PLOT_INDEX_ENABLED:
+        return respond({
+            "success": False,
+            "error": "Plot search is disabled. Set PLOT_INDEX_ENABLED=true to enable it."
+        })
+
+    with span("plot_index_sync"):
+        await asyncio.to_thread(_plot_index.sync_catalog, _catalog)
+
+    with span("plot_search"):
+        hits = await asyncio.to_thread(_plot_index.search, query,
+                                       (content_type,) if content_type else ("movie", "tv"), genre_ids,
+                                       year_from, year_to, max(1, min(limit, PLOT_SEARCH_MAX_LIMIT)))
+
+    await get_genres()
+    results = []
+    for score, (kind, title_id, title, year, genres) in hits:
+        results.append({
+            "id": title_id,
+            "media_type": kind,
+            "title": title,
+            "year": year,
+            "genre_ids": list(genres),
+            "genres": map_genre_ids_to_names(list(genres), kind),
+            "score": round(score, 4),
+            "tmdb_url": f"https://www.themoviedb.org/{kind}/{title_id}"
+        })
+
+    response = {
+        "success": True,
+        "query": query,
+        "indexed_titles": len(_plot_index.latest),
+        "results": results
+    }
+    if not results:
+        response["suggestion"] = ("No indexed overview matches. The index grows as titles are searched, "
+                                  "browsed or ingested with ingest.py.")
+    return respond(response)
+
+# Change sync
+_change_sync_stats = {"polls": 0, "errors": 0, "changed_ids": 0, "invalidated": 0, "refreshed": 0,
+                      "full_resyncs": 0, "snapshot_marked_stale": 0, "last_poll": None, "last_error": None}
+
+def _load_change_watermarks() -> Dict[str, str]:
+    if not os.path.exists(CHANGE_SYNC_STATE):
+        return {}
+    try:
+        with open(CHANGE_SYNC_STATE, "r", encoding="utf-8") as f:
+            return json.load(f).get("watermarks", {})
+    except (OSError, ValueError):
+        return {}
+
+def _save_change_watermarks(watermarks: Dict[str, str]) -> None:
+    tmp_path = CHANGE_SYNC_STATE + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"watermarks": watermarks}, f, indent=2)
+    os.replace(tmp_path, CHANGE_SYNC_STATE)
+
+async def fetch_changed_ids(kind: str, start_date: str) -> Optional[set]:
+    """IDs TMDb reports as changed since start_date, or None if any page failed"""
+    changed = set()
+    page, total_pages = 1, 1
+    while page <= total_pages:
+        result = await make_tmdb_request(f"/{kind}/changes", {"start_date": start_date, "page": page},
+                                         wait_for_budget=True)
+        if not result.get("success") or result.get("stale"):
+            return None
+        changed.update(item["id"] for item in result.get("results", []) if item.get("id") is not None)
+        total_pages = min(result.get("total_pages") or 1, TMDB_MAX_PAGES)
+        page += 1
+    return changed
+
+async def _refresh_entries(keys: set) -> int:
+    """Refetch expired entries with their original parameters"""
+    semaphore = asyncio.Semaphore(FANOUT_CONCURRENCY)
+
+    async def refresh(key: tuple) -> bool:
+        async with semaphore:
+            result = await make_tmdb_request(key[0], dict(key[1]), wait_for_budget=True)
+        return bool(result.get("success")) and not result.get("stale")
+
+    outcomes = await asyncio.gather(*(refresh(key) for key in keys))
+    return sum(outcomes)
+
+async def sync_changes() -> Dict:
+    """
+    Poll the movie, TV and person change lists once and act on cached entries.
+
+    Each kind keeps a watermark (the UTC date of its last complete poll) in
+    CHANGE_SYNC_STATE. Change lists have day granularity, so titles changed
+    today are reported again until the date moves on. A watermark older than
+    TMDb's 14-day window cannot be caught up, so every entry of that kind is
+    expired instead. Snapshot rows fetched before the window are marked stale,
+    and later ones are checked against the full 14 days of changes.
+    """
+    watermarks = _load_change_watermarks()
+    today = datetime.now(timezone.utc).date()
+    summary = {}
+
+    for kind in CHANGE_SYNC_KINDS:
+        watermark = watermarks.get(kind)
+        if watermark is None or date.fromisoformat(watermark) < today - timedelta(days=CHANGE_FEED_MAX_DAYS):
+            keys = _response_cache.keys_of_kind(kind)
+            if watermark is not None:
+                _change_sync_stats["full_resyncs"] += 1
+            changed_count = None
+            if CATALOG_SERVE:
+                window_start = today - timedelta(days=CHANGE_FEED_MAX_DAYS)
+                changed = await fetch_changed_ids(kind, window_start.isoformat())
+                if changed is None:
+                    # Without the change list nothing in the snapshot can be trusted
+                    cutoff = time.time()
+                else:
+                    cutoff = datetime.combine(window_start, datetime.min.time(), timezone.utc).timestamp()
+                    _change_sync_stats["snapshot_marked_stale"] += await asyncio.to_thread(
+                        _catalog.mark_stale, kind, changed)
+                _change_sync_stats["snapshot_marked_stale"] += await asyncio.to_thread(
+                    _catalog.mark_stale_before, kind, cutoff)
+        else:
+            changed = await fetch_changed_ids(kind, watermark)
+            if changed is None:
+                _change_sync_stats["errors"] += 1
+                _change_sync_stats["last_error"] = f"{kind} change list unavailable"
+                summary[kind] = {"success": False, "watermark": watermark}
+                continue
+            keys = _response_cache.keys_for(kind, changed)
+            changed_count = len(changed)
+            if CATALOG_SERVE:
+                _change_sync_stats["snapshot_marked_stale"] += await asyncio.to_thread(_catalog.mark_stale, kind, changed)
+            _change_sync_stats["changed_ids"] += changed_count
+
+        expired = _response_cache.expire(keys)
+        refreshed = await _refresh_entries(keys) if CHANGE_SYNC_MODE == "refresh" and keys else 0
+        _change_sync_stats["invalidated"] += expired
+        _change_sync_stats["refreshed"] += refreshed
+        watermarks[kind] = today.isoformat()
+        summary[kind] = {"success": True, "changed_ids": changed_count, "invalidated": expired,
+                         "refreshed": refreshed, "watermark": watermarks[kind]}
+
+    _save_change_watermarks(watermarks)
+    _change_sync_stats["polls"] += 1
+    _change_sync_stats["last_poll"] = datetime.now(timezone.utc).isoformat()
+    return summary
+
+async def run_change_sync(interval: float) -> None:
+    """Background loop started by the server lifespan"""
+    while True:
+        try:
+            await sync_changes()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            _change_sync_stats["errors"] += 1
+            _change_sync_stats["last_error"] = str(e)
+        await asyncio.sleep(interval)
 
 # Resources
 @mcp.resource("config://movie-api")
@@ -605,19 +3231,131 @@ async def get_api_config() -> str:
         "environment_variables": {
             "TMDB_API_KEY": "Your TMDb API key (required)",
             "INCLUDE_ADULT": "Include adult content (default: false)",
-            "DEFAULT_LANGUAGE": "Default language (default: en-US)",
-            "API_TIMEOUT": "Request timeout in seconds (default: 10)"
+            "DEFAULT_LANGUAGE": "Default language; tools accept a per-call language parameter (default: en-US)",
+            "API_TIMEOUT": "Request timeout in seconds (default: 10)",
+            "HEDGE_REQUESTS": "Send one duplicate request when a GET is slower than usual (default: false)",
+            "HEDGE_MAX_PERCENT": "Maximum hedged requests as a percentage of traffic (default: 5)",
+            "HEDGE_PERCENTILE": "Latency percentile used as the hedge threshold (default: 95)",
+            "HEDGE_DEFAULT_DELAY_MS": "Hedge threshold before enough latency samples exist (default: 1000)",
+            "HEDGE_MIN_DELAY_MS": "Lower bound for the hedge threshold (default: 50)",
+            "CIRCUIT_FAILURE_THRESHOLD": "Consecutive upstream failures before a circuit opens (default: 5)",
+            "CIRCUIT_RESET_SECONDS": "Seconds an open circuit waits before a probe request (default: 30)",
+            "RESPONSE_CACHE_MAX_ENTRIES": "Last-known-good responses kept for degraded mode (default: 2000)",
+            "FANOUT_CONCURRENCY": "Concurrent upstream requests per multi-title tool call (default: 8)",
+            "WATCH_PROVIDERS_TTL": "Seconds watch-provider data is cached (default: 86400)",
+            "WATCH_PROVIDERS_CACHE_MAX_ENTRIES": "Watch-provider responses cached apart from other responses (default: 2000)",
+            "LIST_SNAPSHOT_MAX_LISTS": "Trending and discover lists whose recent versions are kept for delta polling (default: 500)",
+            "DETAILS_CACHE_TTL": "Seconds movie and TV details are served from cache; 0 disables (default: 3600)",
+            "CHANGE_SYNC_INTERVAL": "Seconds between polls of TMDb's change lists (default: 0, disabled)",
+            "CHANGE_SYNC_MODE": "invalidate or refresh cached entries of changed titles and people (default: invalidate)",
+            "CHANGE_SYNC_STATE": "File holding the change-sync watermarks (default: change_sync.json)",
+            "PLOT_INDEX_ENABLED": "Index cached and ingested overviews for search_plots (default: false)",
+            "PLOT_INDEX_DIR": "Directory of the plot search index (default: plot_index)",
+            "CATALOG_DB": "SQLite snapshot written by ingest.py (default: catalog.db)",
+            "CATALOG_SERVE": "Answer movie and TV details from the snapshot first (default: false)",
+            "TMDB_IMAGE_BASE_URL": "TMDb image CDN base URL (default: https://image.tmdb.org/t/p/)",
+            "IMAGE_CACHE_DIR": "Directory of the local image cache (default: image_cache)",
+            "IMAGE_CACHE_MAX_BYTES": "Image cache size before least recently used images are evicted (default: 200 MiB)",
+            "THUMBNAIL_SIZE": "Longest side of generated thumbnails in pixels (default: 185)",
+            "EXPORT_DIR": "Directory for bulk export files (default: exports)",
+            "EXPORT_CONCURRENCY": "Pages fetched concurrently by bulk exports (default: 4)",
+            "DEBUG": "Enable debug output and per-call trace spans in a debug field (default: false)",
+            "PROFILE_SAMPLE_CALLS": "Profile this many tool calls after startup (default: 0)",
+            "PROFILE_DIR": "Directory for collapsed-stack profile files (default: profiles)",
+            "PROFILE_INTERVAL_MS": "Sampling interval of the profiler (default: 1)",
+            "TMDB_BASE_URL": "TMDb API base URL, e.g. a local fake for testing (default: https://api.themoviedb.org/3)",
+            "TMDB_TRANSPORT": "live, record (capture to a cassette) or replay (serve from a cassette offline) (default: live)",
+            "TMDB_CASSETTE": "Cassette file used by record and replay (default: cassettes/tmdb.jsonl.gz)",
+            "REPLAY_LATENCY_MS": "Latency added to every replayed response (default: 0)",
+            "REPLAY_LATENCY_JITTER_MS": "Random extra latency up to this value (default: 0)",
+            "REPLAY_ERROR_RATE": "Fraction of replayed requests answered with a 503 (default: 0)",
+            "REPLAY_SEED": "Seed for replay latency jitter and error injection (optional)"
         },
         "current_config": {
             "api_key_configured": bool(API_KEY),
             "include_adult": INCLUDE_ADULT,
             "default_language": DEFAULT_LANGUAGE,
-            "api_timeout": API_TIMEOUT
+            "api_timeout": API_TIMEOUT,
+            "hedge_requests": HEDGE_REQUESTS,
+            "transport": TMDB_TRANSPORT
         }
     }
 
     return json.dumps(config, indent=2)
 
+@mcp.resource("metrics://http")
+async def get_http_metrics() -> str:
+    """Get upstream request counts, latency percentiles, hedging, circuit breaker and process statistics"""
+    requests = _http_metrics["requests"]
+    hedges = _http_metrics["hedges"]
+
+    metrics = {
+        "requests": requests,
+        "requests_in_rate_window": _request_window.count(),
+        "cancelled": _http_metrics["cancelled"],
+        "deadline_exceeded": _http_metrics["deadline_exceeded"],
+        "rate_limit": f"{RATE_LIMIT_REQUESTS} requests per {int(RATE_LIMIT_WINDOW)} seconds",
+        "hedging": {
+            "enabled": HEDGE_REQUESTS,
+            "max_percent": HEDGE_MAX_PERCENT,
+            "hedges": hedges,
+            "hedge_wins": _http_metrics["hedge_wins"],
+            "hedge_rate": round(hedges / requests, 4) if requests else 0.0,
+            "win_rate": round(_http_metrics["hedge_wins"] / hedges, 4) if hedges else 0.0,
+            "skipped_for_cap": _http_metrics["hedges_skipped_cap"],
+            "skipped_for_rate_budget": _http_metrics["hedges_skipped_budget"]
+        },
+        "latency": _latency_tracker.summary(),
+        "circuit_breakers": {name: breaker.summary() for name, breaker in _circuit_breakers.items()},
+        "response_cache_entries": len(_response_cache),
+        "process": {"rss_bytes": current_rss_bytes()}
+    }
+
+    return json.dumps(metrics, indent=2)
+
+@mcp.resource("export://{export_id}")
+async def get_export_status(export_id: str) -> str:
+    """Get the checkpoint and output file of a bulk export"""
+    if not _EXPORT_ID_PATTERN.match(export_id):
+        return json.dumps({"success": False, "error": "Invalid export_id."}, indent=2)
+
+    checkpoint = _load_checkpoint(export_id)
+    if checkpoint is None:
+        return json.dumps({"success": False, "error": f"Export '{export_id}' not found."}, indent=2)
+
+    data_path, _ = _export_paths(export_id)
+    return json.dumps(dict(checkpoint, success=True, file=os.path.abspath(data_path)), indent=2)
+
+@mcp.resource("metrics://cache")
+async def get_cache_metrics() -> str:
+    """Get memory accounting for cached TMDb responses per namespace, image cache usage and change sync state"""
+    report = _response_cache.memory_report()
+    report["images"] = _image_cache.stats()
+    report["plot_index"] = _plot_index.stats()
+    if CATALOG_SERVE:
+        report["catalog"] = await asyncio.to_thread(_catalog.stats)
+    report["change_sync"] = dict(_change_sync_stats, enabled=CHANGE_SYNC_INTERVAL > 0,
+                                 interval_seconds=CHANGE_SYNC_INTERVAL, mode=CHANGE_SYNC_MODE,
+                                 watermarks=_load_change_watermarks())
+    return json.dumps(report, indent=2)
+
+@mcp.resource("debug://profile/{calls}")
+async def arm_profiler(calls: str) -> str:
+    """Profile the next N tool calls, writing collapsed-stack files to PROFILE_DIR"""
+    try:
+        count = int(calls)
+    except ValueError:
+        return json.dumps({"success": False, "error": "calls must be an integer"}, indent=2)
+
+    _profile_state["remaining"] = max(0, count)
+    return json.dumps({
+        "success": True,
+        "profiling_next_calls": _profile_state["remaining"],
+        "profile_dir": os.path.abspath(PROFILE_DIR),
+        "interval_ms": PROFILE_INTERVAL_MS,
+        "recent_profiles": _profile_state["written"]
+    }, indent=2)
+
 @mcp.resource("data://popular-genres")
 async def get_popular_genres() -> str:
     """Get list of movie and TV show genres with IDs"""
@@ -688,6 +3426,10 @@ async def get_usage_examples() -> str:
                 {
                     "request": {"movie_id": 550},
                     "description": "Get details for Fight Club (ID: 550)"
+                },
+                {
+                    "request": {"movie_id": 603, "language": "de-DE"},
+                    "description": "The Matrix with German title, overview and tagline; other fields are shared across languages"
                 }
             ]
         },
@@ -714,6 +3456,10 @@ async def get_usage_examples() -> str:
                 {
                     "request": {"media_type": "tv", "time_window": "day"},
                     "description": "Get trending TV shows today"
+                },
+                {
+                    "request": {"media_type": "movie", "time_window": "day", "since": "<version from the previous response>"},
+                    "description": "Poll for movies that entered, left or moved in today's trending list"
                 }
             ]
         },
@@ -730,6 +3476,82 @@ async def get_usage_examples() -> str:
                 }
             ]
         },
+        "search_movies_batch": {
+            "description": "Run several movie searches concurrently and merge the results by TMDb ID",
+            "examples": [
+                {
+                    "request": {"queries": ["Dune", "Dune Part Two", "Dune"], "years": [2021, None, 1984]},
+                    "description": "Find every Dune film in one call"
+                }
+            ]
+        },
+        "search_all": {
+            "description": "Search movies, TV shows and people with one request per page",
+            "examples": [
+                {
+                    "request": {"query": "Sherlock"},
+                    "description": "Find Sherlock films, series and people named Sherlock"
+                },
+                {
+                    "request": {"query": "Nolan", "pages": 2, "max_people": 3, "max_tv_shows": 0},
+                    "description": "Up to 3 people plus movies, skipping TV shows"
+                }
+            ]
+        },
+        "discover_merged": {
+            "description": "Discover across several genres and years, merged into one ranking",
+            "examples": [
+                {
+                    "request": {"content_type": "movie", "genre_ids": [28, 12, 878], "year_from": 2019,
+                                "year_to": 2023, "sort_by": "vote_average.desc"},
+                    "description": "Top-rated action, adventure and sci-fi movies from 2019 to 2023"
+                }
+            ]
+        },
+        "search_plots": {
+            "description": "Find titles by plot description in the local overview index",
+            "examples": [
+                {
+                    "request": {"query": "a heist on a train", "content_type": "movie", "year_from": 1990},
+                    "description": "Train heist movies since 1990 among the titles seen so far"
+                }
+            ]
+        },
+        "get_image": {
+            "description": "Get a poster, backdrop or profile image (thumbnail by default) from the local image cache",
+            "examples": [
+                {
+                    "request": {"path": "/f89U3ADr1oiB1s9GkdPOEpXUk5H.jpg", "image_type": "poster"},
+                    "description": "Poster thumbnail for The Matrix"
+                }
+            ]
+        },
+        "get_watch_providers": {
+            "description": "Find where titles can be streamed, rented or bought, for many titles at once",
+            "examples": [
+                {
+                    "request": {"content_type": "movie", "ids": [603, 550], "regions": ["US", "GB"]},
+                    "description": "Where to watch The Matrix and Fight Club in the US and UK"
+                },
+                {
+                    "request": {"content_type": "tv", "ids": [1396, 1399, 66732], "regions": ["US"], "provider": "Netflix"},
+                    "description": "Which of these shows are on Netflix in the US"
+                }
+            ]
+        },
+        "export_content": {
+            "description": "Export a large result set to a gzip-compressed NDJSON file with resumable checkpoints",
+            "examples": [
+                {
+                    "request": {"content_type": "movie", "genre_id": 28, "year_from": 2019, "year_to": 2023},
+                    "description": "Export every action movie released 2019-2023"
+                },
+                {
+                    "request": {"content_type": "tv", "source": "search", "query": "star trek", "max_pages": 5},
+                    "description": "Export up to 5 pages of TV search results; call again to resume"
+                }
+            ]
+        },
         "common_sort_options": [
             "popularity.desc", "popularity.asc",
             "vote_average.desc", "vote_average.asc",
@@ -760,8 +3582,6 @@ discover_content("movie", genre_id=28, sort_by="vote_average.desc")
 
 if __name__ == "__main__":
     # Minimal startup for STDIO compatibility
-    import sys
-
     # Debug information (only if DEBUG is enabled)
     if DEBUG:
         print("🎬 Movie & TV MCP Server Starting...", file=sys.stderr)
@@ -771,6 +3591,7 @@ if __name__ == "__main__":
         print(f"   Language: {DEFAULT_LANGUAGE}", file=sys.stderr)
         print(f"   Include adult: {INCLUDE_ADULT}", file=sys.stderr)
         print(f"   Timeout: {API_TIMEOUT}s", file=sys.stderr)
+        print(f"   Transport: {TMDB_TRANSPORT}", file=sys.stderr)
 
     # Check API key on startup
     if not API_KEY:
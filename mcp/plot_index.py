@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+Plot search index for the Movie & TV MCP Server
+Incremental TF-IDF index of title overviews, stored as mmap segments
+"""
+
+import asyncio
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import struct
+import threading
+import zlib
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict, deque
+from typing import Dict, List, Optional
+
+from catalog import CatalogStore
+
+# Overviews are embedded with a hashing vectorizer: every token maps to one of
+# 2^20 buckets through CRC32, so no vocabulary has to be kept or grown.
+PLOT_HASH_BITS = 20
+PLOT_SEGMENT_DOCS = 2000
+PLOT_MAX_SEGMENTS = 8
+PLOT_STOPWORDS = frozenset("""
+    a about after all an and are as at be been but by for from has have he her his in into is it its of on
+    one or she that the their them they this to was were what when where which while who will with
+""".split())
+_PLOT_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_PLOT_SEGMENT_MAGIC = b"PLT1"
+# Titles waiting for the background indexer, and how many it indexes per batch
+PLOT_INDEX_QUEUE_MAX = 20000
+PLOT_INDEX_BATCH = 500
+
+def plot_terms(text: str) -> Dict[int, float]:
+    """L2-normalized sublinear term weights of a text, keyed by hash bucket"""
+    counts = Counter()
+    for token in _PLOT_TOKEN_PATTERN.findall(text.lower()):
+        if len(token) < 2 or token in PLOT_STOPWORDS:
+            continue
+        # Crude plural folding so "heists" finds "heist"
+        if len(token) > 4 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        counts[zlib.crc32(token.encode()) & ((1 << PLOT_HASH_BITS) - 1)] += 1
+    weights = {term: 1 + math.log(count) for term, count in counts.items()}
+    norm = math.sqrt(sum(w * w for w in weights.values()))
+    return {term: w / norm for term, w in weights.items()} if norm else {}
+
+class PlotSegment:
+    """
+    Immutable term-major sparse matrix read through mmap.
+
+    Layout: magic, term count, posting count, then the sorted term buckets,
+    posting offsets per term, document numbers and float32 weights, so the
+    postings of a term are found by binary search without loading the file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.size = len(self._mmap)
+        n_terms, n_postings = struct.unpack_from("=II", self._mmap, 4)
+        view = memoryview(self._mmap)
+        position = 12
+        self.terms = view[position:position + 4 * n_terms].cast("I")
+        position += 4 * n_terms
+        self.offsets = view[position:position + 4 * (n_terms + 1)].cast("I")
+        position += 4 * (n_terms + 1)
+        self.docs = view[position:position + 4 * n_postings].cast("I")
+        position += 4 * n_postings
+        self.weights = view[position:position + 4 * n_postings].cast("f")
+        self._views = (view, self.terms, self.offsets, self.docs, self.weights)
+
+    def postings(self, term: int) -> Optional[tuple]:
+        """(document numbers, weights) of a term, or None if no document has it"""
+        index = bisect_left(self.terms, term)
+        if index == len(self.terms) or self.terms[index] != term:
+            return None
+        start, end = self.offsets[index], self.offsets[index + 1]
+        # Copied out so no view into the mmap outlives a merge that closes it
+        return self.docs[start:end].tolist(), self.weights[start:end].tolist()
+
+    def document_frequencies(self):
+        for index, term in enumerate(self.terms):
+            yield term, self.offsets[index + 1] - self.offsets[index]
+
+    def close(self) -> None:
+        for view in reversed(self._views):
+            view.release()
+        self._mmap.close()
+        self._file.close()
+
+    @staticmethod
+    def write(path: str, postings: Dict[int, List[tuple]]) -> None:
+        terms = array("I", sorted(postings))
+        offsets, docs, weights = array("I", [0]), array("I"), array("f")
+        for term in terms:
+            for doc, weight in postings[term]:
+                docs.append(doc)
+                weights.append(weight)
+            offsets.append(len(docs))
+        with open(path + ".tmp", "wb") as f:
+            f.write(_PLOT_SEGMENT_MAGIC + struct.pack("=II", len(terms), len(docs)))
+            for part in (terms, offsets, docs, weights):
+                part.tofile(f)
+        os.replace(path + ".tmp", path)
+
+class PlotIndex:
+    """
+    Incrementally updated TF-IDF index of title overviews.
+
+    New documents go to an in-memory tail, which is also appended to
+    tail.ndjson so it survives restarts. Every PLOT_SEGMENT_DOCS documents
+    the tail is written out as an immutable mmap segment, and segments are
+    merged once there are more than PLOT_MAX_SEGMENTS. A title whose overview
+    changes is added again under a new document number; only its latest
+    document counts, and older ones are dropped by the next merge.
+
+    Document weights are stored without IDF, which keeps segments valid as
+    document frequencies change; IDF is applied to both sides at query time.
+
+    Responses are only queued by observe(); a background task indexes them
+    in a worker thread, so tokenizing, file writes and merges never block the
+    event loop. The lock serialises that thread with searches.
+    """
+
+    def __init__(self, directory: str, enabled: bool = True):
+        self.directory = directory
+        self.enabled = enabled
+        self._loaded = False
+        self._lock = threading.RLock()
+        self._queue: deque = deque()
+        self._worker: Optional[asyncio.Future] = None
+        self.errors = 0
+        self.dropped = 0
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def _load(self) -> None:
+        with self._lock:
+            if not self._loaded:
+                self._load_files()
+                self._loaded = True
+
+    def _load_files(self) -> None:
+        self.segments: List[PlotSegment] = []
+        self.docs: List[tuple] = []  # document number -> (kind, id, title, year, genre_ids)
+        self.latest: Dict[tuple, tuple] = {}  # (kind, id) -> (document number, fingerprint)
+        self.df = Counter()
+        self.tail: Dict[int, List[tuple]] = defaultdict(list)  # term -> [(document, weight)]
+        self.tail_docs = 0
+        self.state = {"segments": [], "catalog_watermark": 0}
+
+        if os.path.exists(self._path("state.json")):
+            with open(self._path("state.json"), "r", encoding="utf-8") as f:
+                self.state = json.load(f)
+        for name in self.state["segments"]:
+            segment = PlotSegment(self._path(name))
+            self.segments.append(segment)
+            self.df.update(dict(segment.document_frequencies()))
+
+        # A line cut short by a crash is skipped; its document simply has no terms
+        for name, apply in (("docs.ndjson", self._load_doc), ("tail.ndjson", self._load_tail)):
+            if os.path.exists(self._path(name)):
+                with open(self._path(name), "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            apply(json.loads(line))
+                        except (ValueError, KeyError, TypeError):
+                            continue
+
+    def _load_doc(self, record: Dict) -> None:
+        self.docs.append((record["kind"], record["id"], record["title"], record["year"], tuple(record["genres"])))
+        self.latest[(record["kind"], record["id"])] = (len(self.docs) - 1, record["fp"])
+
+    def _load_tail(self, record: Dict) -> None:
+        for term, weight in record["terms"]:
+            self.tail[term].append((record["doc"], weight))
+            self.df[term] += 1
+        self.tail_docs += 1
+
+    def _append(self, name: str, records: List[Dict]) -> None:
+        with open(self._path(name), "a", encoding="utf-8") as f:
+            f.writelines(json.dumps(record, separators=(",", ":")) + "\n" for record in records)
+
+    def _save_state(self) -> None:
+        with open(self._path("state.json.tmp"), "w", encoding="utf-8") as f:
+            json.dump(self.state, f)
+        os.replace(self._path("state.json.tmp"), self._path("state.json"))
+
+    def __len__(self) -> int:
+        self._load()
+        with self._lock:
+            return len(self.latest)
+
+    def add(self, kind: str, item: Dict) -> bool:
+        """Index one title row or details response; returns False when it is unchanged or has no overview"""
+        return self.add_many([(kind, item)]) == 1
+
+    def add_many(self, items: List[tuple]) -> int:
+        """Index (kind, title) pairs, appending them to disk in one write per file; returns how many were new"""
+        with self._lock:
+            self._load()
+            return self._add_many(items)
+
+    def _add_many(self, items: List[tuple]) -> int:
+        doc_records, tail_records = [], []
+        for kind, item in items:
+            overview = item.get("overview")
+            if not overview or item.get("id") is None:
+                continue
+            title = item.get("title") or item.get("name")
+            date_text = (item.get("release_date") or item.get("first_air_date") or "")[:4]
+            year = int(date_text) if date_text.isdigit() else None
+            genres = sorted(item.get("genre_ids") or [g["id"] for g in item.get("genres", []) if g.get("id") is not None])
+            fingerprint = zlib.crc32(json.dumps([title, overview, year, genres]).encode())
+
+            key = (kind, item["id"])
+            previous = self.latest.get(key)
+            if previous is not None and previous[1] == fingerprint:
+                continue
+
+            doc = len(self.docs)
+            terms = plot_terms(overview)
+            doc_records.append({"kind": kind, "id": item["id"], "title": title, "year": year,
+                                "genres": genres, "fp": fingerprint})
+            tail_records.append({"doc": doc, "terms": [[t, round(w, 5)] for t, w in terms.items()]})
+            self.docs.append((kind, item["id"], title, year, tuple(genres)))
+            self.latest[key] = (doc, fingerprint)
+            for term, weight in terms.items():
+                self.tail[term].append((doc, weight))
+                self.df[term] += 1
+            self.tail_docs += 1
+
+        if doc_records:
+            os.makedirs(self.directory, exist_ok=True)
+            self._append("docs.ndjson", doc_records)
+            self._append("tail.ndjson", tail_records)
+            if self.tail_docs >= PLOT_SEGMENT_DOCS:
+                self._flush()
+        return len(doc_records)
+
+    def observe(self, endpoint: str, data: Dict) -> None:
+        """Queue the titles of a successful TMDb response (details or any result list) for indexing"""
+        if not self.enabled:
+            return
+        parts = endpoint.strip("/").split("/")
+        if len(parts) == 2 and parts[0] in ("movie", "tv") and parts[1].isdigit():
+            items = [(parts[0], data)]
+        elif isinstance(data.get("results"), list):
+            default_kind = next((p for p in parts[:2] if p in ("movie", "tv")), None)
+            rows = ((row.get("media_type") or default_kind, row) for row in data["results"])
+            items = [(kind, row) for kind, row in rows if kind in ("movie", "tv") and row.get("overview")]
+        else:
+            return
+        if len(self._queue) + len(items) > PLOT_INDEX_QUEUE_MAX:
+            # Indexing fell behind; these titles are picked up the next time they are seen
+            self.dropped += len(items)
+            return
+        self._queue.extend(items)
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.ensure_future(self._index_queued())
+
+    async def _index_queued(self) -> None:
+        while self._queue:
+            batch = [self._queue.popleft() for _ in range(min(len(self._queue), PLOT_INDEX_BATCH))]
+            try:
+                await asyncio.to_thread(self.add_many, batch)
+            except OSError:
+                # The index is an optimisation; a full disk must not fail requests
+                self.errors += 1
+
+    async def drain(self) -> None:
+        """Wait until every queued title is indexed"""
+        while self._worker is not None and not self._worker.done():
+            await asyncio.shield(self._worker)
+
+    def sync_catalog(self, catalog: CatalogStore) -> int:
+        """Index snapshot titles ingested since the last sync"""
+        with self._lock:
+            self._load()
+            return self._sync_catalog(catalog)
+
+    def _sync_catalog(self, catalog: CatalogStore) -> int:
+        if not os.path.exists(catalog.path):
+            return 0
+        watermark = self.state.get("catalog_watermark", 0)
+        rows = catalog.db.execute(
+            "SELECT t.kind, t.id, t.title, t.overview, t.release_date, t.fetched_at, GROUP_CONCAT(g.genre_id) "
+            "FROM titles t LEFT JOIN title_genres g ON g.kind = t.kind AND g.title_id = t.id "
+            "WHERE t.fetched_at > ? GROUP BY t.kind, t.id ORDER BY t.fetched_at", (watermark,)).fetchall()
+        items = []
+        for kind, title_id, title, overview, release_date, fetched_at, genre_ids in rows:
+            genres = [int(g) for g in genre_ids.split(",")] if genre_ids else []
+            items.append((kind, {"id": title_id, "title": title, "overview": overview,
+                                 "release_date": release_date, "genre_ids": genres}))
+            watermark = max(watermark, fetched_at)
+        added = self._add_many(items)
+        if rows:
+            os.makedirs(self.directory, exist_ok=True)
+            self.state["catalog_watermark"] = watermark
+            self._save_state()
+        return added
+
+    def flush(self) -> None:
+        """Write the tail out as a new segment"""
+        with self._lock:
+            self._load()
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self.tail_docs:
+            return
+        name = f"seg-{len(self.docs):09d}.bin"
+        PlotSegment.write(self._path(name), self.tail)
+        self.segments.append(PlotSegment(self._path(name)))
+        self.state["segments"].append(name)
+        self._save_state()
+        open(self._path("tail.ndjson"), "w").close()
+        self.tail = defaultdict(list)
+        self.tail_docs = 0
+        if len(self.segments) > PLOT_MAX_SEGMENTS:
+            self._merge()
+
+    def _is_live(self, doc: int) -> bool:
+        kind, title_id = self.docs[doc][:2]
+        return self.latest[(kind, title_id)][0] == doc
+
+    def _merge(self) -> None:
+        """Combine all segments into one, dropping superseded documents"""
+        postings = defaultdict(list)
+        for segment in self.segments:
+            for term in segment.terms:
+                docs, weights = segment.postings(term)
+                postings[term].extend((d, w) for d, w in zip(docs, weights) if self._is_live(d))
+        postings = {term: entries for term, entries in postings.items() if entries}
+        name = f"seg-{len(self.docs):09d}-merged.bin"
+        PlotSegment.write(self._path(name), postings)
+
+        old = self.segments
+        self.segments = [PlotSegment(self._path(name))]
+        self.state["segments"] = [name]
+        self._save_state()
+        for segment in old:
+            segment.close()
+            os.remove(segment.path)
+
+        self.df = Counter({term: len(entries) for term, entries in postings.items()})
+        for term, entries in self.tail.items():
+            self.df[term] += len(entries)
+
+    def search(self, query: str, kinds: tuple = ("movie", "tv"), genre_ids: Optional[List[int]] = None,
+               year_from: Optional[int] = None, year_to: Optional[int] = None, limit: int = 10) -> List[tuple]:
+        """
+        Top (score, (kind, id, title, year, genre_ids)) pairs for a query,
+        filtered by kind, genres (all required) and year range
+        """
+        with self._lock:
+            self._load()
+            hits = self._search(query, kinds, genre_ids, year_from, year_to, limit)
+            return [(score, self.docs[doc]) for score, doc in hits]
+
+    def _search(self, query: str, kinds: tuple, genre_ids: Optional[List[int]],
+                year_from: Optional[int], year_to: Optional[int], limit: int) -> List[tuple]:
+        total = len(self.docs)
+        scores = defaultdict(float)
+        for term, query_weight in plot_terms(query).items():
+            df = self.df.get(term)
+            if not df:
+                continue
+            idf = math.log((1 + total) / (1 + df)) + 1
+            weight = query_weight * idf * idf
+            for segment in self.segments:
+                found = segment.postings(term)
+                if found is not None:
+                    for doc, doc_weight in zip(*found):
+                        scores[doc] += weight * doc_weight
+            for doc, doc_weight in self.tail.get(term, ()):
+                scores[doc] += weight * doc_weight
+
+        required = set(genre_ids or [])
+
+        def matches(doc: int) -> bool:
+            kind, _, _, year, genres = self.docs[doc]
+            if kind not in kinds or not self._is_live(doc):
+                return False
+            if required and not required.issubset(genres):
+                return False
+            if year_from is not None and (year is None or year < year_from):
+                return False
+            if year_to is not None and (year is None or year > year_to):
+                return False
+            return True
+
+        return heapq.nlargest(limit, ((score, doc) for doc, score in scores.items() if matches(doc)))
+
+    def stats(self) -> Dict:
+        if not self._loaded:
+            # Counts are only reported once the index is in use; loading it here would block the event loop
+            return {"enabled": self.enabled, "loaded": False, "queued": len(self._queue)}
+        segments = list(self.segments)
+        return {
+            "enabled": self.enabled,
+            "loaded": True,
+            "titles": len(self.latest),
+            "documents": len(self.docs),
+            "segments": len(segments),
+            "tail_documents": self.tail_docs,
+            "segment_bytes": sum(s.size for s in segments),
+            "queued": len(self._queue),
+            "dropped": self.dropped,
+            "errors": self.errors
+        }
@@ -21,13 +21,16 @@ async def test_basic_functionality():
     print("Movie & TV MCP Server Test Suite")
     print("=" * 50)
 
-    # Check if API key is configured
+    # Check if API key is configured (not needed when replaying a cassette)
     api_key = os.getenv("TMDB_API_KEY")
-    if not api_key:
+    transport = os.getenv("TMDB_TRANSPORT", "live").lower()
+    if transport == "replay":
+        print(f"SUCCESS: Replaying recorded responses from {os.getenv('TMDB_CASSETTE', 'cassettes/tmdb.jsonl.gz')}")
+    elif not api_key:
         print("ERROR: TMDB_API_KEY not set. Please check your .env file.")
         return False
-
-    print(f"SUCCESS: API Key configured: {api_key[:8]}...")
+    else:
+        print(f"SUCCESS: API Key configured: {api_key[:8]}...")
     print()
 
     # Import the server functions
@@ -0,0 +1,52 @@
+"""
+Shared fixtures: a freshly loaded server module per test, wired to the fake TMDb
+"""
+
+import importlib
+import os
+import sys
+
+import httpx
+import pytest
+
+MCP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, MCP_DIR)
+
+from fake_tmdb import FakeTMDb
+
+@pytest.fixture
+def fake():
+    return FakeTMDb()
+
+@pytest.fixture
+def load_server(monkeypatch, tmp_path, fake):
+    """
+    Return a loader that re-imports movie_server with the given environment.
+
+    Configuration is read at import time, so every call reloads the module;
+    this also gives each test its own caches, breaker and locks. State files
+    go under tmp_path, requests go to the fake in-process, and the rate
+    window is widened so tests never wait on TMDb's budget.
+    """
+    def load(**env):
+        settings = {
+            "TMDB_API_KEY": "test",
+            "TMDB_TRANSPORT": "live",
+            "CATALOG_DB": tmp_path / "catalog.db",
+            "CHANGE_SYNC_STATE": tmp_path / "change_sync.json",
+            "EXPORT_DIR": tmp_path / "exports",
+            "IMAGE_CACHE_DIR": tmp_path / "image_cache",
+            "PLOT_INDEX_DIR": tmp_path / "plot_index",
+            "PROFILE_DIR": tmp_path / "profiles",
+        }
+        settings.update(env)
+        for name, value in settings.items():
+            monkeypatch.setenv(name, str(value))
+
+        import movie_server
+        server = importlib.reload(movie_server)
+        server._request_window = server.RequestWindow(100000, server.RATE_LIMIT_WINDOW)
+        server.http_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=fake.app))
+        return server
+
+    return load
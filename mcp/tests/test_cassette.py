@@ -0,0 +1,64 @@
+"""
+Record and replay TMDb exchanges through cassettes
+"""
+
+import asyncio
+import json
+import os
+
+import httpx
+
+CASSETTE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "cassettes", "tmdb.jsonl.gz")
+PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
+
+async def exercise(server):
+    search = json.loads(await server.search_movies(None, "The Matrix", 1999))
+    details = json.loads(await server.get_movie_details(None, 603))
+    image = await server.get_image(None, "/poster603.png", thumbnail=False)
+    return search, details, image.data
+
+def test_recorded_round_trip_replays_offline(load_server, fake, tmp_path):
+    cassette = tmp_path / "tmdb.jsonl.gz"
+    server = load_server()
+    server.http_client = httpx.AsyncClient(
+        transport=server.RecordingTransport(str(cassette), httpx.ASGITransport(app=fake.app)))
+    recorded = asyncio.run(exercise(server))
+    upstream = fake.total_requests()
+
+    # A new image cache, so the image really comes from the cassette
+    server = load_server(TMDB_TRANSPORT="replay", TMDB_CASSETTE=cassette,
+                         IMAGE_CACHE_DIR=tmp_path / "replay_images")
+    server.http_client = httpx.AsyncClient(transport=server.build_transport())
+    replayed = asyncio.run(exercise(server))
+
+    assert fake.total_requests() == upstream
+    assert [r["id"] for r in replayed[0]["results"]] == [r["id"] for r in recorded[0]["results"]]
+    assert replayed[1]["title"] == recorded[1]["title"]
+    # Binary bodies are stored base64-encoded and must come back byte for byte
+    assert recorded[2].startswith(PNG_MAGIC)
+    assert replayed[2] == recorded[2]
+
+def test_missing_request_is_a_404(load_server, tmp_path):
+    server = load_server(TMDB_TRANSPORT="replay", TMDB_CASSETTE=tmp_path / "empty.jsonl.gz")
+    server.http_client = httpx.AsyncClient(transport=server.build_transport())
+    result = json.loads(asyncio.run(server.get_movie_details(None, 603)))
+    assert result["success"] is False
+
+def test_committed_cassette_serves_test_server_calls(load_server):
+    server = load_server(TMDB_TRANSPORT="replay", TMDB_CASSETTE=CASSETTE)
+    server.http_client = httpx.AsyncClient(transport=server.build_transport())
+
+    async def run():
+        return [json.loads(await call) for call in (
+            server.search_movies(None, "The Matrix", 1999),
+            server.search_tv_shows(None, "Breaking Bad"),
+            server.get_movie_details(None, 603),
+            server.get_trending(None, "movie", "week"),
+        )] + [json.loads(await server.get_popular_genres())]
+
+    search, tv, details, trending, genres = asyncio.run(run())
+    assert search["success"] and search["results"]
+    assert tv["success"] and tv["results"]
+    assert details["success"] and details["title"]
+    assert trending["success"] and trending["results"]
+    assert genres["movies"] and genres["tv"]
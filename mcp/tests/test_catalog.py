@@ -0,0 +1,74 @@
+"""
+Serving details from the catalog snapshot, and marking snapshot rows stale
+"""
+
+import asyncio
+import json
+import time
+
+DAY = 86400
+
+def snapshot(server, ids_and_ages) -> None:
+    """Store fake details for each (id, age in days) pair, as ingest.py would"""
+    async def fetch_all():
+        return [await server.make_tmdb_request(f"/movie/{title_id}", {"append_to_response": "credits"})
+                for title_id, _ in ids_and_ages]
+
+    for (title_id, age), data in zip(ids_and_ages, asyncio.run(fetch_all())):
+        server._catalog.upsert_title("movie", data, fetched_at=time.time() - age * DAY)
+
+def stale_flags(server) -> dict:
+    return dict(server._catalog.db.execute("SELECT id, stale FROM titles").fetchall())
+
+def test_details_are_served_from_the_snapshot_first(load_server, fake):
+    server = load_server(CATALOG_SERVE="true")
+    snapshot(server, [(603, 0)])
+    upstream = fake.requests["/3/movie/603"]
+
+    details = json.loads(asyncio.run(server.get_movie_details(None, 603)))
+    assert details["success"] and details["title"] == "Movie 603"
+    assert "snapshot_fetched_at" in details
+    assert fake.requests["/3/movie/603"] == upstream
+
+    # A title the snapshot lacks is fetched live
+    details = json.loads(asyncio.run(server.get_movie_details(None, 604)))
+    assert details["success"] and "snapshot_fetched_at" not in details
+    assert fake.requests["/3/movie/604"] == 1
+
+def test_snapshot_is_ignored_without_catalog_serve(load_server, fake):
+    server = load_server()
+    snapshot(server, [(603, 0)])
+    upstream = fake.requests["/3/movie/603"]
+
+    details = json.loads(asyncio.run(server.get_movie_details(None, 603)))
+    assert "snapshot_fetched_at" not in details
+    assert fake.requests["/3/movie/603"] == upstream + 1
+
+def test_full_resync_marks_old_and_changed_rows_stale(load_server, fake):
+    server = load_server(CATALOG_SERVE="true")
+    # 1 was fetched before the change list's 14-day window, 2 changed within it, 3 is current
+    snapshot(server, [(1, 30), (2, 1), (3, 1)])
+    fake.mark_changed("movie", [2])
+
+    summary = asyncio.run(server.sync_changes())
+    assert summary["movie"]["success"]
+
+    assert stale_flags(server) == {1: 1, 2: 1, 3: 0}
+    assert server._change_sync_stats["snapshot_marked_stale"] == 2
+
+    # Stale rows are fetched live again; current ones still come from the snapshot
+    before = {title_id: fake.requests[f"/3/movie/{title_id}"] for title_id in (1, 2, 3)}
+    for title_id in (1, 2, 3):
+        asyncio.run(server.get_movie_details(None, title_id))
+    assert {title_id: fake.requests[f"/3/movie/{title_id}"] - count for title_id, count in before.items()} == \
+        {1: 1, 2: 1, 3: 0}
+
+def test_incremental_sync_marks_only_changed_rows_stale(load_server, fake):
+    server = load_server(CATALOG_SERVE="true")
+    snapshot(server, [(1, 1), (2, 1)])
+    asyncio.run(server.sync_changes())
+
+    fake.mark_changed("movie", [1])
+    asyncio.run(server.sync_changes())
+
+    assert stale_flags(server) == {1: 1, 2: 0}
@@ -0,0 +1,83 @@
+"""
+Invalidating and refreshing cached responses from TMDb's change lists
+"""
+
+import asyncio
+import json
+
+def details_requests(fake, *paths) -> dict:
+    return {path: fake.requests[path] for path in paths}
+
+async def warm(server) -> dict:
+    """Cache details for movies 5 and 6 and TV show 7; return movie 6's details"""
+    await server.get_movie_details(None, 5)
+    movie = json.loads(await server.get_movie_details(None, 6))
+    await server.get_tv_show_details(None, 7)
+    return movie
+
+async def refetch(server) -> None:
+    await server.get_movie_details(None, 5)
+    await server.get_movie_details(None, 6)
+    await server.get_tv_show_details(None, 7)
+
+PATHS = ("/3/movie/5", "/3/movie/6", "/3/tv/7")
+
+def test_changed_titles_and_people_invalidate_only_their_entries(load_server, fake):
+    server = load_server()
+
+    async def run():
+        # The first poll has no watermark and only records one
+        await server.sync_changes()
+        movie = await warm(server)
+        cached = details_requests(fake, *PATHS)
+        await refetch(server)
+        assert details_requests(fake, *PATHS) == cached
+
+        fake.mark_changed("movie", [5])
+        summary = await server.sync_changes()
+        assert summary["movie"]["changed_ids"] == 1
+        assert summary["movie"]["invalidated"] == 1
+        await refetch(server)
+        assert details_requests(fake, *PATHS) == dict(cached, **{"/3/movie/5": cached["/3/movie/5"] + 1})
+
+        # A changed person expires the titles that credit them
+        cached = details_requests(fake, *PATHS)
+        fake.mark_changed("person", [movie["cast"][0]["id"]])
+        summary = await server.sync_changes()
+        assert summary["person"]["invalidated"] >= 1
+        await server.get_movie_details(None, 6)
+        assert fake.requests["/3/movie/6"] == cached["/3/movie/6"] + 1
+
+    asyncio.run(run())
+
+def test_refresh_mode_refetches_changed_entries_during_the_poll(load_server, fake):
+    server = load_server(CHANGE_SYNC_MODE="refresh")
+
+    async def run():
+        await server.sync_changes()
+        await warm(server)
+        fake.mark_changed("movie", [6])
+        summary = await server.sync_changes()
+        assert summary["movie"]["refreshed"] == 1
+
+        refreshed = fake.requests["/3/movie/6"]
+        await server.get_movie_details(None, 6)
+        assert fake.requests["/3/movie/6"] == refreshed
+
+    asyncio.run(run())
+
+def test_watermark_older_than_the_change_window_expires_everything(load_server, fake, tmp_path):
+    server = load_server()
+    (tmp_path / "change_sync.json").write_text(json.dumps({"watermarks": {"movie": "2000-01-01"}}))
+
+    async def run():
+        await warm(server)
+        cached = details_requests(fake, *PATHS)
+        summary = await server.sync_changes()
+        assert summary["movie"]["changed_ids"] is None
+        assert server._change_sync_stats["full_resyncs"] == 1
+        await refetch(server)
+        assert details_requests(fake, *PATHS)["/3/movie/5"] == cached["/3/movie/5"] + 1
+        assert details_requests(fake, *PATHS)["/3/movie/6"] == cached["/3/movie/6"] + 1
+
+    asyncio.run(run())
@@ -0,0 +1,89 @@
+"""
+Circuit breaker: opening on upstream failures, serving stale data, and the half-open probe
+"""
+
+import asyncio
+import json
+
+import httpx
+
+class Outage(httpx.AsyncBaseTransport):
+    """Forward to the fake, or answer 503 while `down` is set"""
+
+    def __init__(self, app):
+        self.upstream = httpx.ASGITransport(app=app)
+        self.down = False
+        self.failed = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.down:
+            self.failed += 1
+            return httpx.Response(503, request=request)
+        return await self.upstream.handle_async_request(request)
+
+def test_breaker_opens_serves_stale_and_recovers_through_one_probe(load_server, fake):
+    server = load_server(CIRCUIT_FAILURE_THRESHOLD=3, CIRCUIT_RESET_SECONDS=0.2, DETAILS_CACHE_TTL=0)
+    outage = Outage(fake.app)
+    server.http_client = httpx.AsyncClient(transport=outage)
+
+    async def details(movie_id: int) -> dict:
+        return json.loads(await server.get_movie_details(None, movie_id))
+
+    async def run():
+        fresh = await details(603)
+        assert fresh["success"] and not fresh.get("stale")
+        breaker = server._circuit_breakers["movie"]
+
+        # Failures below the threshold fall back to the last good response
+        outage.down = True
+        for _ in range(3):
+            served = await details(603)
+            assert served["stale"] and served["title"] == fresh["title"]
+        assert breaker.state == "open"
+        assert outage.failed == 3
+
+        # While open, requests fail fast without reaching TMDb
+        served = await details(603)
+        assert served["stale"]
+        uncached = await details(604)
+        assert uncached["success"] is False and uncached["circuit"] == "open"
+        assert outage.failed == 3
+        assert breaker.fast_failures == 2
+
+        # After the reset period one probe is let through; its failure re-opens the circuit
+        await asyncio.sleep(0.25)
+        served = await details(603)
+        assert served["stale"]
+        assert outage.failed == 4
+        assert breaker.state == "open" and breaker.times_opened == 2
+
+        # A successful probe closes it again
+        await asyncio.sleep(0.25)
+        outage.down = False
+        recovered = await details(603)
+        assert recovered["success"] and not recovered.get("stale")
+        assert breaker.state == "closed"
+
+    asyncio.run(run())
+
+def test_only_one_half_open_probe_is_in_flight(load_server, fake):
+    server = load_server(CIRCUIT_FAILURE_THRESHOLD=1, CIRCUIT_RESET_SECONDS=0.1)
+    fake.latency_ms = 100
+
+    async def run():
+        breaker = server._get_circuit_breaker("/movie/1")
+        breaker.record_failure()
+        assert breaker.state == "open"
+        await asyncio.sleep(0.15)
+
+        probe = asyncio.ensure_future(server.make_tmdb_request("/movie/1"))
+        await asyncio.sleep(0.02)
+        assert breaker.state == "half_open" and breaker.probe_in_flight
+        concurrent = await server.make_tmdb_request("/movie/2")
+        assert concurrent["success"] is False and concurrent["circuit"] == "open"
+
+        assert (await probe)["success"]
+        assert breaker.state == "closed" and not breaker.probe_in_flight
+        assert fake.requests["/3/movie/2"] == 0
+
+    asyncio.run(run())
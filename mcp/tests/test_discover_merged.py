@@ -0,0 +1,63 @@
+"""
+Merged discover: k-way merge order across genre/year combinations and lazy paging
+"""
+
+import asyncio
+import json
+import math
+
+def discover_requests(fake, kind: str = "movie") -> int:
+    return fake.requests[f"/3/discover/{kind}"]
+
+def test_merge_returns_the_global_top_rows_in_order(load_server, fake):
+    server = load_server()
+    genres, years, limit = [28, 12, 878], [2019, 2020], 50
+
+    async def run():
+        merged = json.loads(await server.discover_merged(None, "movie", genre_ids=genres, year_from=2019,
+                                                         year_to=2020, sort_by="vote_average.desc", limit=limit))
+        # Every combination is sorted, so the top rows overall lie within each one's first pages
+        pages = math.ceil(limit / 20)
+        rows = {}
+        for genre_id in genres:
+            for year in years:
+                params = server._discover_params("movie", genre_id, year, "vote_average.desc")
+                for page in range(1, pages + 1):
+                    result = await server.make_tmdb_request("/discover/movie", dict(params, page=page))
+                    for row in result["results"]:
+                        rows.setdefault(row["id"], row)
+        return merged, sorted((row["vote_average"] for row in rows.values()), reverse=True)[:limit]
+
+    merged, expected = asyncio.run(run())
+    assert merged["success"] and merged["combinations"] == 6
+    assert [row["vote_average"] for row in merged["results"]] == expected
+    assert len({row["id"] for row in merged["results"]}) == limit
+    for row in merged["results"]:
+        assert {(m["genre_id"], m["year"]) for m in row["matched"]} <= {(g, y) for g in genres for y in years}
+
+def test_ascending_order_is_merged_too(load_server):
+    server = load_server()
+    merged = json.loads(asyncio.run(server.discover_merged(None, "tv", genre_ids=[18, 35],
+                                                           sort_by="first_air_date.asc", limit=30)))
+    dates = [row["first_air_date"] for row in merged["results"] if row.get("first_air_date")]
+    assert dates == sorted(dates)
+
+def test_paging_stops_once_the_limit_is_settled(load_server, fake):
+    server = load_server()
+
+    def pages_for(limit: int, genre_ids) -> tuple:
+        before = discover_requests(fake)
+        merged = json.loads(asyncio.run(server.discover_merged(None, "movie", genre_ids=genre_ids, limit=limit)))
+        return merged["pages_fetched"], discover_requests(fake) - before
+
+    # One combination: 20 rows per page
+    assert pages_for(40, [28]) == (2, 2)
+    assert pages_for(41, [28]) == (3, 3)
+    # Three combinations: the first page of each already settles the top five
+    assert pages_for(5, [28, 12, 878]) == (3, 3)
+
+def test_unsupported_sort_is_rejected_before_any_request(load_server, fake):
+    server = load_server()
+    result = json.loads(asyncio.run(server.discover_merged(None, "movie", sort_by="revenue.desc")))
+    assert result["success"] is False
+    assert fake.total_requests() == 0
@@ -0,0 +1,74 @@
+"""
+get_image: on-disk image cache, single-flight downloads, thumbnails and eviction
+"""
+
+import asyncio
+import io
+import json
+
+import pytest
+
+def image_requests(fake, size: str = None) -> int:
+    return sum(count for path, count in fake.requests.items()
+               if path.startswith(f"/t/p/{size}/" if size else "/t/p/"))
+
+def test_concurrent_thumbnails_download_the_source_once(load_server, fake):
+    PIL = pytest.importorskip("PIL.Image")
+    server = load_server()
+
+    async def run():
+        return await asyncio.gather(*(server.get_image(None, "/poster1.png") for _ in range(3)))
+
+    images = asyncio.run(run())
+    assert image_requests(fake) == image_requests(fake, "w500") == 1
+    assert len({image.data for image in images}) == 1
+    with PIL.open(io.BytesIO(images[0].data)) as thumbnail:
+        assert max(thumbnail.size) == server.THUMBNAIL_SIZE
+
+    # The full image comes from the cached source; a later call hits the disk cache
+    full = asyncio.run(server.get_image(None, "/poster1.png", thumbnail=False))
+    with PIL.open(io.BytesIO(full.data)) as source:
+        assert source.size == (500, 750)
+    asyncio.run(server.get_image(None, "/poster1.png"))
+    assert image_requests(fake) == 1
+    assert server._image_cache.stats()["hits"] >= 2
+
+def test_cache_survives_a_restart(load_server, fake):
+    server = load_server()
+    first = asyncio.run(server.get_image(None, "/poster2.png", thumbnail=False))
+
+    server = load_server()
+    again = asyncio.run(server.get_image(None, "/poster2.png", thumbnail=False))
+    assert again.data == first.data
+    assert image_requests(fake) == 1
+
+def test_without_pillow_thumbnails_use_a_small_rendition(load_server, fake):
+    server = load_server()
+    server.PILImage = None
+    asyncio.run(server.get_image(None, "/profile3.png", image_type="profile"))
+    assert image_requests(fake, "w185") == 1
+    assert image_requests(fake) == 1
+
+def test_least_recently_used_images_are_evicted(load_server, fake):
+    server = load_server(IMAGE_CACHE_MAX_BYTES=8000)
+
+    async def run():
+        for i in range(1, 8):
+            await server.get_image(None, f"/poster{i}.png", thumbnail=False)
+
+    asyncio.run(run())
+    stats = server._image_cache.stats()
+    assert stats["evictions"] > 0
+    assert stats["bytes"] <= stats["max_bytes"]
+
+    # The most recent image is still cached; the first was evicted and is downloaded again
+    asyncio.run(server.get_image(None, "/poster7.png", thumbnail=False))
+    assert fake.requests["/t/p/w500/poster7.png"] == 1
+    asyncio.run(server.get_image(None, "/poster1.png", thumbnail=False))
+    assert fake.requests["/t/p/w500/poster1.png"] == 2
+
+def test_invalid_paths_are_rejected_without_a_request(load_server, fake):
+    server = load_server()
+    result = json.loads(asyncio.run(server.get_image(None, "../etc/passwd")))
+    assert result["success"] is False
+    assert image_requests(fake) == 0
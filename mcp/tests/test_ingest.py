@@ -0,0 +1,71 @@
+"""
+Bulk ingest into the catalog snapshot, including resuming an interrupted job
+"""
+
+import argparse
+import asyncio
+
+from catalog import CatalogStore
+import ingest
+
+def ingest_args(db, **overrides) -> argparse.Namespace:
+    args = dict(kind="movie", ids_file=None, refresh_stale=False, genre_id=None, year_from=None, year_to=None,
+                sort_by="popularity.desc", pages=1, max_pages=100, job_id="discover-test", db=str(db),
+                concurrency=2, limit=None, retry_failed=False, verbose=False)
+    args.update(overrides)
+    return argparse.Namespace(**args)
+
+def detail_requests(fake) -> int:
+    return sum(count for path, count in fake.requests.items()
+               if path.startswith("/3/movie/") and path.count("/") == 3)
+
+def test_interrupted_ingest_resumes_from_pending_ids(load_server, fake, tmp_path):
+    db = tmp_path / "catalog.db"
+    args = ingest_args(db)
+    fake.latency_ms = 5
+    load_server()
+
+    async def interrupt_after(done: int) -> int:
+        run = asyncio.ensure_future(ingest.run_ingest(args))
+        watcher = CatalogStore(str(db))
+        while (watcher.job(args.job_id) or {}).get("queue", {}).get("done", 0) < done:
+            await asyncio.sleep(0.005)
+        run.cancel()
+        try:
+            await run
+        except asyncio.CancelledError:
+            pass
+        stored = watcher.job(args.job_id)["queue"]["done"]
+        watcher.close()
+        return stored
+
+    done_first = asyncio.run(interrupt_after(5))
+    assert 5 <= done_first < 20
+    requests_first = detail_requests(fake)
+
+    load_server()
+    summary = asyncio.run(ingest.run_ingest(args))
+
+    assert summary["queue"] == {"done": 20}
+    assert summary["this_run"]["done"] == 20 - done_first
+    # Titles stored before the interruption are not fetched again, nor is the discover page
+    assert detail_requests(fake) - requests_first == 20 - done_first
+    assert fake.requests["/3/discover/movie"] == 1
+    assert summary["catalog"]["titles"]["movie"] == {"total": 20, "stale": 0}
+
+def test_ids_file_job_ingests_listed_titles_once(load_server, fake, tmp_path):
+    ids_file = tmp_path / "ids.txt"
+    ids_file.write_text("11\n12\n13\n")
+    args = ingest_args(tmp_path / "catalog.db", ids_file=str(ids_file), pages=None, job_id="file-test")
+    load_server()
+    summary = asyncio.run(ingest.run_ingest(args))
+
+    assert summary["queue"] == {"done": 3}
+    assert summary["sweep_done"] is True
+    assert detail_requests(fake) == 3
+
+    # Running a finished job again has nothing left to fetch
+    load_server()
+    summary = asyncio.run(ingest.run_ingest(args))
+    assert summary["this_run"]["done"] == 0
+    assert detail_requests(fake) == 3
@@ -0,0 +1,44 @@
+"""
+search_all: one /search/multi request per page, per-type caps and early stopping
+"""
+
+import asyncio
+import json
+
+def search(server, query: str, **kwargs) -> dict:
+    return json.loads(asyncio.run(server.search_all(None, query, **kwargs)))
+
+def test_each_page_is_one_multi_request(load_server, fake):
+    server = load_server()
+    result = search(server, "sherlock", pages=3)
+
+    assert result["pages_fetched"] == 3
+    assert fake.requests["/3/search/multi"] == 3
+    assert not any(path.startswith(("/3/search/movie", "/3/search/tv", "/3/search/person")) for path in fake.requests)
+    assert sum(result["counts"].values()) == len(result["ranking"])
+
+def test_caps_limit_each_type_and_zero_excludes_it(load_server):
+    server = load_server()
+    result = search(server, "nolan", pages=3, max_people=2, max_tv_shows=0)
+
+    assert result["counts"]["people"] <= 2
+    assert result["counts"]["tv_shows"] == 0 and result["tv_shows"] == []
+    assert result["counts"]["movies"] > 20
+    assert {entry["media_type"] for entry in result["ranking"]} <= {"movie", "person"}
+
+def test_stops_paging_once_every_capped_type_is_full(load_server, fake):
+    server = load_server()
+    result = search(server, "x", pages=5, max_movies=1, max_tv_shows=1, max_people=1)
+
+    assert result["counts"] == {"movies": 1, "tv_shows": 1, "people": 1}
+    assert result["pages_fetched"] == 1
+    assert fake.requests["/3/search/multi"] == 1
+
+def test_capped_types_keep_reading_pages_until_filled(load_server, fake):
+    server = load_server()
+    # Pages hold a few people each, so ten take several pages, but fewer than the five allowed
+    result = search(server, "watson", pages=5, max_movies=3, max_tv_shows=3, max_people=10)
+
+    assert result["counts"] == {"movies": 3, "tv_shows": 3, "people": 10}
+    assert result["pages_fetched"] == 3
+    assert fake.requests["/3/search/multi"] == 3